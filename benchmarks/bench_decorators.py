@@ -0,0 +1,268 @@
+"""Per-call overhead of workflow_entry / workflow_lifecycle.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/bench_decorators.py             # print results
+    PYTHONPATH=src python benchmarks/bench_decorators.py --save      # store as baseline
+    PYTHONPATH=src python benchmarks/bench_decorators.py --compare   # fail on regressions
+
+Modes:
+    disabled  WORKFLOW_MONITORING_ENABLED=false, decorators are pass-through
+    stub      events are shipped in bulk to a local backend that answers immediately; the buffer
+              is flushed before every timed run, so no run sheds events
+    slow      events are shipped to a local backend that answers after --slow-delay seconds; the
+              buffer sheds what the backend cannot take, which the dropped column shows
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from aiohttp import web
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+TRACE_DATA = {
+    "enable": True,
+    "traceId": "592225192fb1ac17022e80c85fb8a749",
+    "prevSpanId": "3f7decc34dc8d03a",
+    "userId": "202505125600020250512145500563QSLVDGS96F",
+    "projectId": "benchmark",
+}
+MODES = ("disabled", "stub", "slow")
+
+
+class StubBackend:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+        self.port = 0
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/event"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        await request.read()
+        self.received += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return web.Response(status=200)
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_post("/event", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self._ready.set()
+        self._loop.run_forever()
+
+
+def _configure(mode: str, backends: Dict[str, StubBackend], slow_delay: float) -> None:
+    from setsail_workflow_py import reload_settings
+
+    env = dict(os.environ, ENV="local", WORKFLOW_MONITORING_API_KEY="benchmark")
+    if mode == "disabled":
+        env["WORKFLOW_MONITORING_ENABLED"] = "false"
+    else:
+        if mode not in backends:
+            backends[mode] = StubBackend(slow_delay if mode == "slow" else 0.0)
+        env["WORKFLOW_MONITORING_ENABLED"] = "true"
+        env["WORKFLOW_MONITORING_URL"] = backends[mode].url
+        if mode == "stub":
+            # One request per batch, so the backend keeps up with the decorators.
+            env["WORKFLOW_MONITORING_TRANSPORT"] = "bulk"
+    reload_settings(env)
+
+
+def _build_cases() -> Dict[str, Dict[str, Callable[..., Any]]]:
+    from setsail_workflow_py import workflow_entry, workflow_lifecycle
+
+    def sync_step(x: int, workflow_trace_data: dict) -> int:
+        return x + 1
+
+    async def async_step(x: int, workflow_trace_data: dict) -> int:
+        return x + 1
+
+    async def gen_step(x: int, workflow_trace_data: dict):
+        for i in range(3):
+            yield x + i
+
+    # workflow_lifecycle names spans after the receiver's class, so it is measured on methods,
+    # the way llm-graph uses it.
+    class Step:
+        def sync_step(self, x: int, workflow_trace_data: dict) -> int:
+            return x + 1
+
+        async def async_step(self, x: int, workflow_trace_data: dict) -> int:
+            return x + 1
+
+        async def gen_step(self, x: int, workflow_trace_data: dict):
+            for i in range(3):
+                yield x + i
+
+    class LifecycleStep:
+        sync_step = workflow_lifecycle()(Step.sync_step)
+        async_step = workflow_lifecycle()(Step.async_step)
+        gen_step = workflow_lifecycle()(Step.gen_step)
+
+    step, lifecycle_step = Step(), LifecycleStep()
+    return {
+        "function": {"sync": sync_step, "async": async_step, "asyncgen": gen_step},
+        "method": {"sync": step.sync_step, "async": step.async_step, "asyncgen": step.gen_step},
+        "workflow_entry": {
+            "sync": workflow_entry(name="bench")(sync_step),
+            "async": workflow_entry(name="bench")(async_step),
+            "asyncgen": workflow_entry(name="bench")(gen_step),
+        },
+        "workflow_lifecycle": {
+            "sync": lifecycle_step.sync_step,
+            "async": lifecycle_step.async_step,
+            "asyncgen": lifecycle_step.gen_step,
+        },
+    }
+
+
+def _runner(kind: str, func: Callable[..., Any]) -> Callable[[int], None]:
+    if kind == "sync":
+        def run(n: int) -> None:
+            for i in range(n):
+                func(i, workflow_trace_data=dict(TRACE_DATA))
+        return run
+
+    if kind == "async":
+        async def arun(n: int) -> None:
+            for i in range(n):
+                await func(i, workflow_trace_data=dict(TRACE_DATA))
+        return lambda n: asyncio.run(arun(n))
+
+    async def grun(n: int) -> None:
+        for i in range(n):
+            async for _ in func(i, workflow_trace_data=dict(TRACE_DATA)):
+                pass
+    return lambda n: asyncio.run(grun(n))
+
+
+def _measure(run: Callable[[int], None], iterations: int, repeats: int, settle: Callable[[], Any] = lambda: None) -> Dict[str, float]:
+    from setsail_workflow_py import stats
+
+    dropped_before = stats()["events"]["dropped"]
+    run(min(iterations, 200))  # warm-up: caches, pooled sessions, background threads
+
+    best = float("inf")
+    for _ in range(repeats):
+        settle()
+        gc.collect()
+        start = time.perf_counter_ns()
+        run(iterations)
+        best = min(best, (time.perf_counter_ns() - start) / iterations)
+
+    settle()
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    run(iterations)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    retained = sys.getallocatedblocks() - blocks_before
+    settle()
+    return {
+        "ns_per_call": round(best, 1),
+        "peak_bytes_per_call": round(peak / iterations, 1),
+        "retained_blocks_per_call": round(retained / iterations, 3),
+        "dropped_events": stats()["events"]["dropped"] - dropped_before,
+    }
+
+
+def run_benchmarks(iterations: int, repeats: int, modes: List[str], slow_delay: float) -> Dict[str, Dict[str, Any]]:
+    from setsail_workflow_py import flush
+
+    cases = _build_cases()
+    backends: Dict[str, StubBackend] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    for mode in modes:
+        _configure(mode, backends, slow_delay)
+        settle = (lambda: flush(timeout=60)) if mode == "stub" else (lambda: None)
+        baselines = {
+            name: {kind: _measure(_runner(kind, func), iterations, repeats) for kind, func in cases[name].items()}
+            for name in ("function", "method")
+        }
+        for decorator, baseline_name in (("workflow_entry", "function"), ("workflow_lifecycle", "method")):
+            for kind, func in cases[decorator].items():
+                stats = _measure(_runner(kind, func), iterations, repeats, settle)
+                stats["overhead_ns_per_call"] = round(stats["ns_per_call"] - baselines[baseline_name][kind]["ns_per_call"], 1)
+                results[f"{mode}/{decorator}/{kind}"] = stats
+        if mode != "disabled":
+            flush(timeout=60)
+    return results
+
+
+def _print(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'case':<36}{'ns/call':>12}{'overhead ns':>14}{'peak B/call':>14}{'retained/call':>15}{'dropped':>10}")
+    for name, stats in results.items():
+        print(f"{name:<36}{stats['ns_per_call']:>12.1f}{stats['overhead_ns_per_call']:>14.1f}"
+              f"{stats['peak_bytes_per_call']:>14.1f}{stats['retained_blocks_per_call']:>15.3f}{stats['dropped_events']:>10}")
+
+
+def _compare(results: Dict[str, Dict[str, Any]], tolerance: float) -> int:
+    if not BASELINE_PATH.exists():
+        print(f"no baseline at {BASELINE_PATH}, run with --save first")
+        return 1
+    baselines = json.loads(BASELINE_PATH.read_text())["results"]
+    regressions = []
+    for name, stats in results.items():
+        base = baselines.get(name)
+        if base is None:
+            continue
+        # Compare decorated call cost, not the noisy difference against the baseline function.
+        if stats["ns_per_call"] > base["ns_per_call"] * tolerance:
+            regressions.append(f"{name}: {stats['ns_per_call']:.0f} ns/call vs baseline {base['ns_per_call']:.0f} ns/call")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--slow-delay", type=float, default=0.2)
+    parser.add_argument("--save", action="store_true", help=f"write results to {BASELINE_PATH.name}")
+    parser.add_argument("--compare", action="store_true", help="exit non-zero if a case is slower than baseline * tolerance")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    options = parser.parse_args()
+
+    results = run_benchmarks(options.iterations, options.repeats, options.modes, options.slow_delay)
+    _print(results)
+
+    if options.save:
+        BASELINE_PATH.write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "iterations": options.iterations,
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"saved baseline to {BASELINE_PATH}")
+    if options.compare:
+        return _compare(results, options.tolerance)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,17 @@
 from .application.decorators.workflow_entry import workflow_entry
 from .application.decorators.workflow_lifecycle import workflow_lifecycle
+from .shared.settings import reload_settings
+from .shared.span_context import submit, with_span_context
 
 
-__all__ = ["workflow_entry", "workflow_lifecycle"]
\ No newline at end of file
+__all__ = ["workflow_entry", "workflow_lifecycle", "drain", "flush", "shutdown", "set_exporter", "stats", "start_metrics_server", "reload_settings", "submit", "with_span_context"]
+
+_CONTROL_FUNCTIONS = ("drain", "flush", "shutdown", "set_exporter", "stats", "start_metrics_server")
+
+
+def __getattr__(name: str):
+    # The delivery controls pull in the exporter stack; only import it when they are actually used.
+    if name in _CONTROL_FUNCTIONS:
+        from .application.services import monitoring_control
+        return getattr(monitoring_control, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,78 +1,90 @@
-from typing import Callable, Any, Coroutine, Optional, TypeVar
+from typing import TYPE_CHECKING, Callable, Any, Coroutine, Optional, TypeVar
 import functools
-import asyncio
-import inspect
-from setsail_workflow_py.domain.services.config_factory import ConfigFactory, WorkflowMonitoringConfig
-from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
-from loguru import logger
+import sys
+from setsail_workflow_py.application.services.call_plan import CallPlan
+from setsail_workflow_py.shared.clock import get_clock
+from setsail_workflow_py.shared.lazy_logger import logger
+from setsail_workflow_py.shared.settings import get_settings
+
+if TYPE_CHECKING:
+    from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
 
 T = TypeVar("T")
 STATUS_SUCCESS = "SUCCESS"
 
-def workflow_entry(name: str, log_enabled: bool = False) -> Callable[[Callable[..., Coroutine[Any, Any, T]]], Callable[..., Any]]:
+def workflow_entry(name: str, log_enabled: bool = False, aggregate: bool = False, capture_input: bool = True, capture_output: bool = True) -> Callable[[Callable[..., Coroutine[Any, Any, T]]], Callable[..., Any]]:
     if not isinstance(name, str):
         raise TypeError(f"name must be str, got {type(name).__name__}")
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         if not callable(func):
             raise TypeError(f"object must Callable, got {type(func).__name__}")
+        plan = CallPlan(func, log_enabled, aggregate, operation_name=name, capture_input=capture_input, capture_output=capture_output)
 
         @functools.wraps(func)
         async def async_wrapper(
                 *args: Any,
-                config: Optional[WorkflowMonitoringConfig] = None,
+                config: Optional["WorkflowMonitoringConfig"] = None,
                 **kwargs: Any
         ) -> Any:
+            entered_ns = get_clock().monotonic_ns()
             if config:
                 try:
-                    await WorkflowMonitoringService.send_start_event(config, kwargs)
+                    await _service().send_start_event(config, plan.input_of(kwargs))
                 except Exception as e:
                     if config.log_enabled:
                         logger.exception(f"send start event failed: {e}")
 
+            started_ns = get_clock().monotonic_ns()
             result = await func(*args, **kwargs)  # type: ignore
+            duration_ns = get_clock().monotonic_ns() - started_ns
 
             if config:
                 try:
-                    await WorkflowMonitoringService.send_end_event(
-                        config, result, STATUS_SUCCESS, {}
+                    await _service().send_end_event(
+                        config, plan.output_of(result), STATUS_SUCCESS, {}, duration_ns=duration_ns
                     )
                 except Exception as e:
                     if config.log_enabled:
                         logger.exception(f"send end event failed: {e}")
+                _service().record_overhead(entered_ns, duration_ns)
 
             return result
 
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            config: Optional[WorkflowMonitoringConfig] = None
+            config: Optional["WorkflowMonitoringConfig"] = None
             trace_data = kwargs.get("workflow_trace_data")
-            if isinstance(trace_data, dict) and trace_data.get("enable", False):
+            if isinstance(trace_data, dict) and trace_data.get("enable", False) and get_settings().active:
+                entered_ns = get_clock().monotonic_ns()
+                service = _service()
+                if service.should_aggregate(plan, plan.operation_name):
+                    if plan.is_async_gen:
+                        return service.aggregate_stream(plan, args, kwargs, trace_data, plan.operation_name)
+                    if plan.is_async:
+                        coro = service.aggregate_call(plan, args, kwargs, trace_data, plan.operation_name)
+                        return coro if _has_running_loop() else _run(coro)
+                    return service.aggregate_call_sync(plan, args, kwargs, trace_data, plan.operation_name)
+                from setsail_workflow_py.domain.services.config_factory import ConfigFactory
                 config = ConfigFactory.create_from_trace_data(trace_data, name, log_enabled)
-                trace_data["prevSpanId"] = config.prevSpanId
-
-            loop = asyncio.get_event_loop()
 
-            if inspect.iscoroutinefunction(func):
-                if loop.is_running():
+            if plan.is_async:
+                if _has_running_loop():
                     return async_wrapper(*args, config=config, **kwargs)
                 else:
-                    return asyncio.run(async_wrapper(*args, config=config, **kwargs))
+                    return _run(async_wrapper(*args, config=config, **kwargs))
 
+            # Sync entry points never wait on the backend; events are handed off to the exporter.
             if config:
-                if loop.is_running():
-                    asyncio.create_task(_send_start_event(config, kwargs))
-                else:
-                    asyncio.run(_send_start_event(config, kwargs))
+                _service().emit_start_event(config, plan.input_of(kwargs))
 
+            started_ns = get_clock().monotonic_ns()
             result = func(*args, **kwargs)
+            duration_ns = get_clock().monotonic_ns() - started_ns
 
-            # 再送 end event
             if config:
-                if loop.is_running():
-                    asyncio.create_task(_send_end_event(config, result))
-                else:
-                    asyncio.run(_send_end_event(config, result))
+                _service().emit_end_event(config, plan.output_of(result), STATUS_SUCCESS, {}, duration_ns)
+                _service().record_overhead(entered_ns, duration_ns)
 
             return result
 
@@ -80,16 +92,30 @@ def workflow_entry(name: str, log_enabled: bool = False) -> Callable[[Callable[.
 
     return decorator
 
-async def _send_start_event(config: WorkflowMonitoringConfig, context: dict[str, Any]) -> None:
-    try:
-        await WorkflowMonitoringService.send_start_event(config, context)
-    except Exception as e:
-        logger.exception("send start event failed: %s", e)
+_monitoring_service = None
+
+
+def _service():
+    # Deferred until the first enabled call; see workflow_lifecycle._service.
+    global _monitoring_service
+    if _monitoring_service is None:
+        from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
+        _monitoring_service = WorkflowMonitoringService
+    return _monitoring_service
+
+
+def _run(coro: Coroutine[Any, Any, Any]) -> Any:
+    import asyncio
+    return asyncio.run(coro)
+
 
-async def _send_end_event(config: WorkflowMonitoringConfig, result: Any) -> None:
+def _has_running_loop() -> bool:
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        # Nothing has imported asyncio, so no event loop can be running.
+        return False
     try:
-        print("send end event")
-        await WorkflowMonitoringService.send_end_event(config, result, STATUS_SUCCESS, {})
-        print("send end event success")
-    except Exception as e:
-        logger.exception("send end event failed: %s", e)
\ No newline at end of file
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
@@ -1,68 +1,89 @@
-import asyncio
 from functools import wraps
-import inspect
-import concurrent.futures
-from typing import Callable, Any, Union, Awaitable
-from loguru import logger
-from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
+from typing import TYPE_CHECKING, Callable, Any, Union, Awaitable
+from setsail_workflow_py.application.services.call_plan import CallPlan
+from setsail_workflow_py.application.services.trace_data import is_disabled
+from setsail_workflow_py.shared.lazy_logger import logger
 from setsail_workflow_py.shared.utils import get_class_name
 
+if TYPE_CHECKING:
+    from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
+
+_monitoring_service = None
 
-def workflow_lifecycle(log_enabled: bool = False) -> Callable:
-    def decorator(func: Callable[..., Union[Any, Awaitable[Any]]]) -> Callable:
-        is_async_gen_func = inspect.isasyncgenfunction(func)
-        is_async_func = inspect.iscoroutinefunction(func)
 
-        async def handle_logic(args, kwargs, operation_name) -> Union[Any, Awaitable[Any]]:
-            result = await WorkflowMonitoringService.monitor_execution(func, args, kwargs, operation_name, log_enabled)
-            return result
+def _service() -> "type[WorkflowMonitoringService]":
+    # Imported on the first enabled call: it pulls in pydantic, aiohttp and the exporter machinery,
+    # which processes with monitoring disabled never need.
+    global _monitoring_service
+    if _monitoring_service is None:
+        from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
+        _monitoring_service = WorkflowMonitoringService
+    return _monitoring_service
 
-        if is_async_gen_func:
+
+def workflow_lifecycle(log_enabled: bool = False, aggregate: bool = False, capture_input: bool = True, capture_output: bool = True) -> Callable:
+    def decorator(func: Callable[..., Union[Any, Awaitable[Any]]]) -> Callable:
+        plan = CallPlan(func, log_enabled, aggregate, capture_input=capture_input, capture_output=capture_output)
+
+        if plan.is_async_gen:
             @wraps(func)
             async def async_gen_wrapper(*args, **kwargs):
-                operation_name = get_class_name(func)
-                result_gen = await handle_logic(args, kwargs, operation_name)
-                async for item in result_gen:
-                    yield item
+                trace_data = plan.find_trace_data(kwargs)
+                if is_disabled(trace_data):
+                    async for item in func(*args, **kwargs):
+                        yield item
+                    return
+
+                operation_name = get_class_name(func, args)
+                service = _service()
+                if service.should_aggregate(plan, operation_name):
+                    async for item in service.aggregate_stream(plan, args, kwargs, trace_data, operation_name):
+                        yield item
+                    return
+
+                result_gen = await service.monitor_stream(plan, args, kwargs, trace_data, operation_name)
+                try:
+                    async for item in result_gen:
+                        yield item
+                finally:
+                    await result_gen.aclose()
 
             return async_gen_wrapper
 
-        elif is_async_func:
+        elif plan.is_async:
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                operation_name = get_class_name(func)
-                return await handle_logic(args, kwargs, operation_name)
+                trace_data = plan.find_trace_data(kwargs)
+                if is_disabled(trace_data):
+                    return await func(*args, **kwargs)
+
+                operation_name = get_class_name(func, args)
+                service = _service()
+                if service.should_aggregate(plan, operation_name):
+                    return await service.aggregate_call(plan, args, kwargs, trace_data, operation_name)
+                return await service.monitor_call(plan, args, kwargs, trace_data, operation_name)
 
             return async_wrapper
 
         else:
             @wraps(func)
             def wrapper_sync(*args: Any, **kwargs: Any) -> Any:
-                operation_name = get_class_name(func)
+                trace_data = plan.find_trace_data(kwargs)
+                if is_disabled(trace_data):
+                    return func(*args, **kwargs)
 
-                def _run_in_thread() -> Any:
-                    return asyncio.run(handle_logic(args, kwargs, operation_name))
+                operation_name = get_class_name(func, args)
+                service = _service()
+                if service.should_aggregate(plan, operation_name):
+                    return service.aggregate_call_sync(plan, args, kwargs, trace_data, operation_name)
 
                 try:
-                    loop = asyncio.get_running_loop()
-                    if loop.is_running():
-                        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                            future = executor.submit(_run_in_thread)
-                            return future.result()
-                except RuntimeError:
-                    return asyncio.run(handle_logic(args, kwargs, operation_name))
+                    return service.monitor_call_sync(plan, args, kwargs, trace_data, operation_name)
                 except Exception as e:
                     if log_enabled:
                         logger.error(f"[{operation_name}] Execution failed in sync: {e}")
                     raise e # Re-raise the exception to propagate it, because this decorator should not handle it.
 
-                try:
-                    return asyncio.run(handle_logic(args, kwargs, operation_name))
-                except Exception as e:
-                    if log_enabled:
-                        logger.error(f"[{operation_name}] Execution failed in sync: {e}")
-                    return None
-
         return wrapper_sync
 
     return decorator
@@ -1,37 +1,110 @@
-import asyncio
-import traceback
 from typing import AsyncGenerator, Callable, Optional, Any, Awaitable
+from setsail_workflow_py.application.services.error_reporter import ErrorReporter
 from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.shared.clock import get_clock
+from setsail_workflow_py.shared.histogram import LogHistogram
 from loguru import logger
 
+NS_PER_MS = 1_000_000
+
+
+class StreamMetrics:
+    __slots__ = ("started_ns", "first_item_ns", "last_item_ns", "item_count", "total_bytes", "inter_item_ms", "completed")
+
+    def __init__(self) -> None:
+        self.started_ns = get_clock().monotonic_ns()
+        self.first_item_ns: Optional[int] = None
+        self.last_item_ns: Optional[int] = None
+        self.item_count = 0
+        self.total_bytes = 0
+        self.inter_item_ms = LogHistogram()
+        self.completed = False
+
+    def record(self, item: Any) -> None:
+        now = get_clock().monotonic_ns()
+        if self.first_item_ns is None:
+            self.first_item_ns = now
+        else:
+            self.inter_item_ms.record((now - self.last_item_ns) / NS_PER_MS)  # type: ignore[operator]
+        self.last_item_ns = now
+        self.item_count += 1
+        self.total_bytes += _item_size(item)
+
+    def to_dict(self) -> dict:
+        elapsed_ns = (self.last_item_ns or get_clock().monotonic_ns()) - self.started_ns
+        return {
+            "itemCount": self.item_count,
+            "totalBytes": self.total_bytes,
+            "timeToFirstItemMs": None if self.first_item_ns is None else round((self.first_item_ns - self.started_ns) / NS_PER_MS, 3),
+            "streamDurationMs": round(elapsed_ns / NS_PER_MS, 3),
+            "interItemLatencyMs": self.inter_item_ms.summary(),
+            "completed": self.completed,
+        }
+
+
+def _item_size(item: Any) -> int:
+    if isinstance(item, (bytes, bytearray)):
+        return len(item)
+    if isinstance(item, str):
+        return len(item.encode("utf-8"))
+    # LLM stream chunks usually carry their text in .content
+    content = getattr(item, "content", None)
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    return 0
+
+
 class MonitoredAsyncGenerator:
-    def __init__(self, gen: AsyncGenerator, config: WorkflowMonitoringConfig | None, on_close: Callable[[Any, Any, str, Optional[dict]], Awaitable[None]] | None = None):
+    def __init__(self, gen: AsyncGenerator, config: WorkflowMonitoringConfig | None, on_close: Callable[..., Awaitable[None]] | None = None):
         self.gen = gen
         self.config = config
         self.on_close = on_close
         self.status = "SUCCESS"
         self.error_details = None
         self.last_value = None
+        self.metrics = StreamMetrics()
+        self._finalized = False
+
+    def __aiter__(self):
+        return self
 
-    async def __aiter__(self):
+    async def __anext__(self):
         try:
-            async for item in self.gen:
-                self.last_value = item
-                yield item
+            item = await self.gen.__anext__()
+        except StopAsyncIteration:
+            self.metrics.completed = True
+            await self._finalize()
+            raise
         except Exception as ex:
             self.status = "FAILURE"
-            self.error_details = {
-                "message": str(ex),
-                "stack": traceback.format_exc(),
-                "errorCode": type(ex).__name__
-            }
+            self.error_details = ErrorReporter.get().describe(ex)
             if self.config and self.config.log_enabled:
                 logger.error(f"Error in async generator: {self.error_details['message']}")
-                logger.debug(f"Stack trace: {self.error_details['stack']}")
+                if "stack" in self.error_details:
+                    logger.debug(f"Stack trace: {self.error_details['stack']}")
+            await self._finalize()
+            raise
+        except BaseException:
+            await self._finalize()
             raise
+
+        self.last_value = item
+        self.metrics.record(item)
+        return item
+
+    async def aclose(self) -> None:
+        # Consumer stopped early (break / cancellation): close the source and still report the span.
+        try:
+            await self.gen.aclose()
         finally:
-            if self.config and self.config.log_enabled:
-                logger.info(f"Closing async generator for {self.config.operationName}, traceId: {self.config.traceId}, spanId: {self.config.spanId}")
-            if self.on_close:
-                await self.on_close(self.config, self.last_value, self.status, self.error_details)
+            await self._finalize()
 
+    async def _finalize(self) -> None:
+        if self._finalized:
+            return
+        self._finalized = True
+        if self.config and self.config.log_enabled:
+            logger.info(f"Closing async generator for {self.config.operationName}, traceId: {self.config.traceId}, spanId: {self.config.spanId}")
+        if self.on_close:
+            duration_ns = get_clock().monotonic_ns() - self.metrics.started_ns
+            await self.on_close(self.config, self.last_value, self.status, self.error_details, stream_metrics=self.metrics.to_dict(), duration_ns=duration_ns)
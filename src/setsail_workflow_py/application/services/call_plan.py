@@ -0,0 +1,70 @@
+import inspect
+from typing import Any, Callable, Optional
+from setsail_workflow_py.application.services.trace_data import find_trace_data
+
+KIND_SYNC = "sync"
+KIND_ASYNC = "async"
+KIND_ASYNC_GEN = "async_gen"
+
+
+class CallPlan:
+    # What the decorators know about a step at decoration time, so the per-call path only branches on it.
+    __slots__ = ("func", "kind", "operation_name", "log_enabled", "aggregate", "capture_input", "capture_output", "_trace_in_state")
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        log_enabled: bool = False,
+        aggregate: bool = False,
+        operation_name: Optional[str] = None,
+        capture_input: bool = True,
+        capture_output: bool = True,
+    ):
+        self.func = func
+        self.kind = _kind_of(func)
+        self.operation_name = operation_name
+        self.log_enabled = log_enabled
+        self.aggregate = aggregate
+        self.capture_input = capture_input
+        self.capture_output = capture_output
+        self._trace_in_state = _accepts_keyword(func, "state")
+
+    @property
+    def is_async(self) -> bool:
+        return self.kind == KIND_ASYNC
+
+    @property
+    def is_async_gen(self) -> bool:
+        return self.kind == KIND_ASYNC_GEN
+
+    def find_trace_data(self, kwargs: dict) -> dict:
+        # A step that cannot take `state` can only be given trace data as a keyword of its own.
+        if self._trace_in_state:
+            return find_trace_data(kwargs)
+        return kwargs.get("workflow_trace_data") or {}
+
+    def input_of(self, kwargs: dict) -> Optional[dict]:
+        return kwargs if self.capture_input else None
+
+    def output_of(self, result: Any) -> Any:
+        return result if self.capture_output else None
+
+
+def _kind_of(func: Callable[..., Any]) -> str:
+    if inspect.isasyncgenfunction(func):
+        return KIND_ASYNC_GEN
+    if inspect.iscoroutinefunction(func):
+        return KIND_ASYNC
+    return KIND_SYNC
+
+
+def _accepts_keyword(func: Callable[..., Any], name: str) -> bool:
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        or (parameter.name == name and parameter.kind != inspect.Parameter.POSITIONAL_ONLY)
+        for parameter in parameters
+    )
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+from setsail_workflow_py.domain.services.error_fingerprint import ErrorFingerprint
+from setsail_workflow_py.shared.settings import get_settings
+
+MAX_FINGERPRINTS = 1024
+
+
+class ErrorReporter:
+    # Identical failures (an upstream outage) would otherwise format and ship the same stack thousands
+    # of times a minute; only the first one per fingerprint and window carries it.
+    _instance: Optional["ErrorReporter"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, window: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self._window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        # fingerprint -> [window start, occurrences in the window]
+        self._seen: Dict[str, List[float]] = {}
+
+    @classmethod
+    def get(cls) -> "ErrorReporter":
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def initialized(cls) -> bool:
+        return cls._instance is not None
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    @property
+    def window(self) -> float:
+        return get_settings().error_stack_window if self._window is None else self._window
+
+    def describe(self, ex: BaseException) -> dict:
+        fingerprint = ErrorFingerprint.of(ex)
+        occurrences = self._occurrence(fingerprint)
+        error_details = {
+            "message": str(ex),
+            "errorCode": type(ex).__name__,
+            "fingerprint": fingerprint,
+            "occurrences": occurrences,
+        }
+        if occurrences == 1:
+            error_details["stack"] = "".join(traceback.format_exception(type(ex), ex, ex.__traceback__))
+        return error_details
+
+    def _occurrence(self, fingerprint: str) -> int:
+        window = self.window
+        if window <= 0:
+            return 1
+        now = self._clock()
+        with self._lock:
+            entry = self._seen.get(fingerprint)
+            if entry is None or now - entry[0] >= window:
+                if entry is None and len(self._seen) >= MAX_FINGERPRINTS:
+                    self._evict(now, window)
+                self._seen[fingerprint] = [now, 1]
+                return 1
+            entry[1] += 1
+            return int(entry[1])
+
+    def _evict(self, now: float, window: float) -> None:
+        expired = [fingerprint for fingerprint, (started, _) in self._seen.items() if now - started >= window]
+        for fingerprint in expired:
+            del self._seen[fingerprint]
+        if len(self._seen) >= MAX_FINGERPRINTS:
+            self._seen.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ErrorReporter._reset_after_fork)
@@ -0,0 +1,57 @@
+import concurrent.futures
+import threading
+import time
+from typing import Any, Coroutine, Optional, Set
+from loguru import logger
+from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+from setsail_workflow_py.shared.event_loss import EMITTER_FULL, EventLoss
+from setsail_workflow_py.shared.settings import get_settings
+
+
+class EventEmitter:
+    _lock = threading.Lock()
+    # Strong references to in-flight sends so they cannot be garbage-collected before they finish.
+    _pending: Set[concurrent.futures.Future] = set()
+
+    @classmethod
+    def emit(cls, coro: Coroutine[Any, Any, Any], log_enabled: bool = False) -> concurrent.futures.Future:
+        if len(cls._pending) >= get_settings().buffer_max_events:
+            # The monitoring loop is not keeping up; shed the event rather than queue another coroutine.
+            coro.close()
+            EventLoss.record(EMITTER_FULL)
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_result(None)
+            return future
+        future = EventLoopThread.get().submit(coro)
+        with cls._lock:
+            cls._pending.add(future)
+        future.add_done_callback(cls._on_done if log_enabled else cls._discard)
+        return future
+
+    @classmethod
+    def pending(cls) -> int:
+        return len(cls._pending)
+
+    @classmethod
+    def drain(cls, timeout: Optional[float] = 5.0) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with cls._lock:
+                pending = list(cls._pending)
+            if not pending:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            concurrent.futures.wait(pending, timeout=remaining)
+
+    @classmethod
+    def _discard(cls, future: concurrent.futures.Future) -> None:
+        with cls._lock:
+            cls._pending.discard(future)
+
+    @classmethod
+    def _on_done(cls, future: concurrent.futures.Future) -> None:
+        cls._discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Emitting workflow event failed: {future.exception()}")
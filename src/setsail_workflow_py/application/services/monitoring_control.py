@@ -0,0 +1,109 @@
+import atexit
+import time
+from typing import Any, Dict, Optional
+from setsail_workflow_py.application.services.event_emitter import EventEmitter
+from setsail_workflow_py.application.services.operation_rollups import OperationRollups
+from setsail_workflow_py.infrastructure.exporters.batch_event_exporter import BatchEventExporter
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, get_batch_exporter, uses_thread_exporter
+from setsail_workflow_py.infrastructure.exporters.threaded_batch_exporter import ThreadedBatchExporter
+from setsail_workflow_py.infrastructure.monitoring.metrics_server import MetricsServer
+from setsail_workflow_py.infrastructure.spool.event_spool import EventSpool
+from setsail_workflow_py.shared.event_loss import EventLoss
+from setsail_workflow_py.shared.settings import get_settings
+from setsail_workflow_py.shared.self_metrics import (
+    DECORATOR_OVERHEAD_US, EVENTS_EMITTED, EVENTS_EXPORTED, EVENTS_FAILED, POST_LATENCY_MS, SelfMetrics,
+)
+
+
+def drain(timeout: Optional[float] = 5.0) -> bool:
+    return EventEmitter.drain(timeout)
+
+
+def flush(timeout: Optional[float] = 5.0) -> bool:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    drained = EventEmitter.drain(timeout)
+    _flush_rollups()
+    return get_batch_exporter().flush(_remaining(deadline)) and drained
+
+
+def shutdown(timeout: Optional[float] = 5.0) -> bool:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    drained = EventEmitter.drain(timeout)
+    _flush_rollups()
+    exported = get_batch_exporter().shutdown(_remaining(deadline))
+    if EventSpool.initialized():
+        # Make events spooled by this process durable and replayable by the next one.
+        EventSpool.get().seal()  # type: ignore[union-attr]
+    return exported and drained
+
+
+def set_exporter(exporter: Optional[EventExporter], timeout: Optional[float] = 5.0) -> bool:
+    if exporter is not None and uses_thread_exporter():
+        # Exporters are coroutines run on the monitoring loop, which thread mode never starts.
+        raise RuntimeError("set_exporter() is not supported with WORKFLOW_MONITORING_EXPORTER=thread")
+    # Events already queued go out through the previous exporter before it is replaced.
+    drained = EventEmitter.drain(timeout)
+    return BatchEventExporter.install(exporter, timeout) and drained
+
+
+def stats() -> Dict[str, Any]:
+    counters = SelfMetrics.counters()
+    histograms = SelfMetrics.histograms()
+    dropped = EventLoss.snapshot()
+    buffered, buffered_bytes = 0, 0
+    for exporter_type in (BatchEventExporter, ThreadedBatchExporter):
+        # Only look at exporters that exist; stats() must not start one.
+        if exporter_type.initialized():
+            exporter = exporter_type.get()
+            buffered += exporter.pending
+            buffered_bytes += exporter.pending_bytes
+    return {
+        "events": {
+            "emitted": counters.get(EVENTS_EMITTED, 0),
+            "exported": counters.get(EVENTS_EXPORTED, 0),
+            "failed": counters.get(EVENTS_FAILED, 0),
+            "dropped": sum(dropped.values()),
+            "dropped_by_reason": dropped,
+        },
+        "pending": {
+            "sends": EventEmitter.pending(),
+            "buffered": buffered,
+            "buffered_bytes": buffered_bytes,
+        },
+        "post_latency_ms": _summary(histograms, POST_LATENCY_MS),
+        "decorator_overhead_us": _summary(histograms, DECORATOR_OVERHEAD_US),
+    }
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[int]:
+    # Defaults to WORKFLOW_MONITORING_METRICS_PORT / _HOST; returns the bound port, or None if not serving.
+    server = MetricsServer.start(stats, port, host)
+    return None if server is None else server.port
+
+
+def _summary(histograms: Dict[str, Any], name: str) -> Dict[str, Optional[float]]:
+    histogram = histograms.get(name)
+    if histogram is None:
+        return {"count": 0, "min": None, "max": None, "mean": None, "p50": None, "p90": None, "p99": None}
+    return histogram.summary()
+
+
+def _flush_rollups() -> None:
+    # Partial rollup windows are shipped rather than lost.
+    if OperationRollups.initialized():
+        OperationRollups.get().flush()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _shutdown_at_exit() -> None:
+    if EventEmitter.pending() or BatchEventExporter.initialized() or ThreadedBatchExporter.initialized() or OperationRollups.initialized():
+        shutdown()
+
+
+atexit.register(_shutdown_at_exit)
+
+if get_settings().metrics_port is not None:
+    start_metrics_server()
@@ -0,0 +1,159 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.domain.services.config_factory import ConfigFactory
+from setsail_workflow_py.infrastructure.exporters.event_exporter import get_batch_exporter, get_timer
+from setsail_workflow_py.shared.histogram import LogHistogram
+from setsail_workflow_py.shared.settings import get_settings
+from setsail_workflow_py.shared.utils import current_timestamp, generate_span_id, generate_trace_id
+
+if TYPE_CHECKING:
+    from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+    from setsail_workflow_py.infrastructure.monitoring.thread_timer import ThreadTimer
+
+# (operationName, userId, projectId, post_url, api key): one rollup per operation and destination.
+RollupKey = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+ROLLUP_EVENT_TYPE = "LOG"
+AGGREGATE_ALL = "*"
+
+
+class _Rollup:
+    __slots__ = ("config", "started_ms", "count", "errors", "error_codes", "duration_ms")
+
+    def __init__(self, config: WorkflowMonitoringConfig) -> None:
+        self.config = config
+        self.started_ms = current_timestamp()
+        self.count = 0
+        self.errors = 0
+        self.error_codes: Dict[str, int] = {}
+        self.duration_ms = LogHistogram()
+
+    def record(self, duration_ms: float, error_code: Optional[str]) -> None:
+        self.count += 1
+        self.duration_ms.record(duration_ms)
+        if error_code is not None:
+            self.errors += 1
+            self.error_codes[error_code] = self.error_codes.get(error_code, 0) + 1
+
+    def to_record(self, ended_ms: int) -> WorkflowEventRecord:
+        config = self.config
+        rollup = {
+            "windowStartMs": self.started_ms,
+            "windowEndMs": ended_ms,
+            "count": self.count,
+            "errors": self.errors,
+            "errorRate": round(self.errors / self.count, 6) if self.count else 0.0,
+            "errorCodes": self.error_codes,
+            "durationMs": self.duration_ms.summary(),
+            "histogram": self.duration_ms.to_dict(),
+        }
+        # A rollup spans many traces, so it gets a trace of its own.
+        return WorkflowEventRecord(
+            config.userId,
+            config.projectId,
+            generate_trace_id(),
+            generate_span_id(),
+            None,
+            config.componentName,
+            config.operationName,
+            ended_ms,
+            ROLLUP_EVENT_TYPE,
+            data={"logMessage": f"rollup {config.operationName}: {self.count} calls, {self.errors} errors"},
+            customAttributes={"rollup": rollup},
+        )
+
+
+class OperationRollups:
+    _instance: Optional["OperationRollups"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, interval: float = 60.0, timer: Optional[Union["EventLoopThread", "ThreadTimer"]] = None):
+        self.interval = interval
+        self._timer = timer or get_timer()
+        self._lock = threading.Lock()
+        self._rollups: Dict[RollupKey, _Rollup] = {}
+        # Validated configs are kept for the next window; building one is the only non-trivial cost.
+        # Keys that go a whole window without calls are dropped, so this does not grow with every user seen.
+        self._configs: Dict[RollupKey, WorkflowMonitoringConfig] = {}
+        self._scheduled = False
+
+    @classmethod
+    def get(cls) -> "OperationRollups":
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(get_settings().aggregate_interval)
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def initialized(cls) -> bool:
+        return cls._instance is not None
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The parent flushes its own windows; the child starts counting from zero.
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    @staticmethod
+    def enabled_for(operation_name: Optional[str]) -> bool:
+        operations = get_settings().aggregate_operations
+        return bool(operations) and (AGGREGATE_ALL in operations or operation_name in operations)
+
+    def record(self, trace_data: dict, operation_name: str, duration_ms: float, error_code: Optional[str] = None, log_enabled: bool = False) -> None:
+        key: RollupKey = (
+            operation_name,
+            trace_data.get("userId"),
+            trace_data.get("projectId"),
+            trace_data.get("post_url"),
+            trace_data.get("x-api-key"),
+        )
+        with self._lock:
+            rollup = self._rollups.get(key)
+            if rollup is None:
+                config = self._configs.get(key)
+                if config is None:
+                    config = ConfigFactory.create_from_trace_data(trace_data, operation_name, log_enabled, sample=False)
+                    if config is None:
+                        return
+                    self._configs[key] = config
+                rollup = self._rollups[key] = _Rollup(config)
+            rollup.record(duration_ms, error_code)
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self._timer.call_later(self.interval, self._flush_on_timer)
+
+    def flush(self) -> int:
+        with self._lock:
+            rollups, self._rollups = self._rollups, {}
+            self._configs = {key: rollup.config for key, rollup in rollups.items()}
+        if not rollups:
+            return 0
+        ended_ms = current_timestamp()
+        exporter = get_batch_exporter()
+        for rollup in rollups.values():
+            exporter.export(rollup.config, rollup.to_record(ended_ms))
+        return len(rollups)
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing operation rollups: {e}")
+        with self._lock:
+            if not self._rollups:
+                # Idle: stop the timer until the next call records something.
+                self._scheduled = False
+                return
+        self._timer.call_later(self.interval, self._flush_on_timer)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=OperationRollups._reset_after_fork)
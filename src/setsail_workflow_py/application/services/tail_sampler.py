@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.shared.event_loss import TAIL_EVICTED, TAIL_TRACE_FULL, EventLoss
+from setsail_workflow_py.shared.settings import get_settings
+
+if TYPE_CHECKING:
+    from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+    from setsail_workflow_py.infrastructure.monitoring.thread_timer import ThreadTimer
+
+ExportItem = Tuple[WorkflowMonitoringConfig, WorkflowEventRecord]
+Forward = Callable[[WorkflowMonitoringConfig, WorkflowEventRecord], None]
+
+
+class _TraceBuffer:
+    __slots__ = ("items", "bytes", "starts", "last_seen")
+
+    def __init__(self, now: float) -> None:
+        self.items: List[ExportItem] = []
+        self.bytes = 0
+        self.starts: Dict[str, int] = {}
+        self.last_seen = now
+
+
+class TailSampler:
+    _instance: Optional["TailSampler"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+            self,
+            forward: Forward,
+            latency_threshold_ms: int = 5000,
+            max_traces: int = 1000,
+            decision_wait: float = 30.0,
+            clock: Callable[[], float] = time.monotonic,
+            max_trace_events: int = 512,
+            max_trace_bytes: int = 1024 * 1024,
+            max_bytes: int = 32 * 1024 * 1024,
+            timer: Optional[Union["EventLoopThread", "ThreadTimer"]] = None,
+    ):
+        self._forward = forward
+        self.latency_threshold_ms = latency_threshold_ms
+        self.max_traces = max_traces
+        self.decision_wait = decision_wait
+        self.max_trace_events = max_trace_events
+        self.max_trace_bytes = max_trace_bytes
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._clock = clock
+        if timer is None:
+            from setsail_workflow_py.infrastructure.exporters.event_exporter import get_timer
+            timer = get_timer()
+        self._timer = timer
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self._buffers: "OrderedDict[str, _TraceBuffer]" = OrderedDict()
+        # Traces already kept: their later spans skip the buffer.
+        self._kept: "OrderedDict[str, None]" = OrderedDict()
+        self.kept_traces = 0
+        self.dropped_traces = 0
+
+    @classmethod
+    def get(cls) -> "TailSampler":
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from setsail_workflow_py.infrastructure.exporters.event_exporter import get_batch_exporter
+                    settings = get_settings()
+                    cls._instance = cls(
+                        lambda config, record: get_batch_exporter().export(config, record),
+                        settings.tail_latency_ms,
+                        settings.tail_max_traces,
+                        settings.tail_decision_wait,
+                        max_trace_events=settings.tail_max_trace_events,
+                        max_trace_bytes=settings.tail_max_trace_bytes,
+                        max_bytes=settings.buffer_max_bytes,
+                    )
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    @property
+    def buffered_traces(self) -> int:
+        return len(self._buffers)
+
+    def offer(self, config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> None:
+        trace_id = record.traceId
+        release: List[ExportItem] = []
+        schedule = False
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            if trace_id in self._kept:
+                self._kept.move_to_end(trace_id)
+                release.append((config, record))
+            else:
+                buffer = self._buffers.get(trace_id)
+                if buffer is None:
+                    buffer = self._buffers[trace_id] = _TraceBuffer(now)
+                    if len(self._buffers) > self.max_traces:
+                        self._drop(next(iter(self._buffers)), TAIL_EVICTED)
+                    schedule = not self._scheduled
+                    self._scheduled = True
+                else:
+                    self._buffers.move_to_end(trace_id)
+                    buffer.last_seen = now
+                size = record.estimated_size()
+                if len(buffer.items) >= self.max_trace_events or buffer.bytes + size > self.max_trace_bytes:
+                    # The decision below still sees the event; only its payload is not held.
+                    EventLoss.record(TAIL_TRACE_FULL)
+                else:
+                    buffer.items.append((config, record))
+                    buffer.bytes += size
+                    self._bytes += size
+                    # Held to the same byte limit as the export buffer, least recently active traces first.
+                    while self._bytes > self.max_bytes and next(iter(self._buffers)) != trace_id:
+                        self._drop(next(iter(self._buffers)), TAIL_EVICTED)
+
+                if record.eventType == "STEP_START":
+                    buffer.starts[record.spanId] = record.timestamp
+                elif record.eventType == "STEP_END" and self._is_interesting(buffer, record):
+                    del self._buffers[trace_id]
+                    self._bytes -= buffer.bytes
+                    self._kept[trace_id] = None
+                    if len(self._kept) > self.max_traces:
+                        self._kept.popitem(last=False)
+                    self.kept_traces += 1
+                    release = buffer.items
+
+        if schedule:
+            self._timer.call_later(self.decision_wait, self._expire_on_timer)
+        for item_config, item_record in release:
+            self._forward(item_config, item_record)
+
+    def expire(self) -> None:
+        with self._lock:
+            self._expire(self._clock())
+
+    def _is_interesting(self, buffer: _TraceBuffer, record: WorkflowEventRecord) -> bool:
+        if record.status == "FAILURE":
+            return True
+        started = buffer.starts.pop(record.spanId, None)
+        return started is not None and record.timestamp - started >= self.latency_threshold_ms
+
+    def _expire(self, now: float) -> None:
+        # Buffers are ordered by last activity, so only the head needs checking.
+        while self._buffers:
+            trace_id, buffer = next(iter(self._buffers.items()))
+            if now - buffer.last_seen < self.decision_wait:
+                return
+            self._drop(trace_id)
+
+    def _drop(self, trace_id: str, reason: Optional[str] = None) -> None:
+        buffer = self._buffers.pop(trace_id)
+        self._bytes -= buffer.bytes
+        self.dropped_traces += 1
+        if reason is not None:
+            # Evicted before a decision could be made, as opposed to expiring undecided.
+            EventLoss.record(reason, len(buffer.items))
+        if buffer.items and buffer.items[0][0].log_enabled:
+            logger.debug(f"Tail sampling dropped trace {trace_id} with {len(buffer.items)} events")
+
+    def _expire_on_timer(self) -> None:
+        # Without this timer an idle process would hold undecided traces until the next offer().
+        try:
+            self.expire()
+        except Exception as e:
+            logger.error(f"Error expiring tail sampling buffers: {e}")
+        with self._lock:
+            if not self._buffers:
+                self._scheduled = False
+                return
+        self._timer.call_later(self.decision_wait, self._expire_on_timer)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=TailSampler._reset_after_fork)
@@ -0,0 +1,15 @@
+from setsail_workflow_py.shared.settings import get_settings
+
+
+def find_trace_data(kwargs: dict) -> dict:
+    state = kwargs.get("state")
+    if isinstance(state, dict) and state.get("workflow_trace_data"):
+        return state["workflow_trace_data"]
+    return kwargs.get("workflow_trace_data") or {}
+
+
+def is_disabled(trace_data: dict) -> bool:
+    # Cheap pre-check so disabled and untraced calls skip name resolution, config building and event emission.
+    if not get_settings().active or not isinstance(trace_data, dict) or not trace_data.get("traceId"):
+        return True
+    return trace_data.get("enable", True) is False
@@ -1,121 +1,265 @@
-import traceback
-import inspect
-from typing import Callable, Any, Awaitable, Union
-from setsail_workflow_py.domain.events.value_object.workflow_event import WorkflowEvent, WorkflowEventPayload, WorkflowPayload
+from typing import AsyncGenerator, Any, Optional
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
 from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
 from setsail_workflow_py.domain.services.config_factory import ConfigFactory
-from setsail_workflow_py.infrastructure.http.post_client import PostClient
+from setsail_workflow_py.domain.services.payload_serializer import LazyPayload
+from setsail_workflow_py.infrastructure.exporters.event_exporter import get_batch_exporter, uses_thread_exporter
 from setsail_workflow_py.application.services.async_gen_wrapper import MonitoredAsyncGenerator
+from setsail_workflow_py.application.services.call_plan import CallPlan
+from setsail_workflow_py.application.services.error_reporter import ErrorReporter
+from setsail_workflow_py.application.services.event_emitter import EventEmitter
+# Registers the at-exit flush as soon as events can be produced.
+from setsail_workflow_py.application.services import monitoring_control  # noqa: F401
+from setsail_workflow_py.application.services.operation_rollups import OperationRollups
+from setsail_workflow_py.application.services.tail_sampler import TailSampler
+from setsail_workflow_py.shared.clock import get_clock
+from setsail_workflow_py.shared.self_metrics import DECORATOR_OVERHEAD_US, EVENTS_EMITTED, SelfMetrics
+from setsail_workflow_py.shared.settings import get_settings
+from setsail_workflow_py.shared.span_context import SpanContext
 from setsail_workflow_py.shared.utils import current_timestamp
 from loguru import logger
 
 class WorkflowMonitoringService:
 
     @staticmethod
-    async def monitor_execution(func: Callable[..., Union[Any, Awaitable[Any]]], args: tuple, kwargs: dict, operation_name: str, log_enabled: bool) -> Union[Any, Awaitable[Any]]:
-        trace_data = kwargs.get("state", {}).get("workflow_trace_data", {}) or kwargs.get("workflow_trace_data", {})
-        config: WorkflowMonitoringConfig = ConfigFactory.create_from_trace_data(trace_data, operation_name, log_enabled)
+    async def monitor_call(plan: CallPlan, args: tuple, kwargs: dict, trace_data: dict, operation_name: str) -> Any:
+        entered_ns = get_clock().monotonic_ns()
+        func = plan.func
+        config: WorkflowMonitoringConfig = ConfigFactory.create_from_trace_data(trace_data, operation_name, plan.log_enabled)
+        if not config:
+            _warn_unconfigured(plan)
+            return await func(*args, **kwargs) if plan.is_async else func(*args, **kwargs)
 
-        is_async_gen = inspect.isasyncgenfunction(func)
-        print(f"is_async_gen: {is_async_gen}")
+        # Left active after the step returns, so the next step in this context chains onto it.
+        SpanContext.activate(config.traceId, config.spanId)
 
-        if not config:
-            if log_enabled:
-                logger.warning("Workflow monitoring config is not available. Skipping monitoring.")
+        await WorkflowMonitoringService.send_start_event(config, plan.input_of(kwargs))
+        status = "SUCCESS"
+        error_details = None
+        result = None
 
-            if is_async_gen:
-                async_gen = func(*args, **kwargs)
-                return MonitoredAsyncGenerator(async_gen, config, on_close=None)
+        clock = get_clock()
+        started_ns = clock.monotonic_ns()
+        try:
+            result = await func(*args, **kwargs) if plan.is_async else func(*args, **kwargs)
+        except Exception as ex:
+            status = "FAILURE"
+            error_details = _error_details(ex, operation_name, plan.log_enabled)
+            raise ex  # Re-raise the exception to propagate it,  because this decorator should not handle it.
+        finally:
+            duration_ns = clock.monotonic_ns() - started_ns
+            await WorkflowMonitoringService.send_end_event(config, plan.output_of(result), status, error_details, duration_ns=duration_ns)
+            WorkflowMonitoringService.record_overhead(entered_ns, duration_ns)
 
-            return await func(*args, **kwargs) if inspect.iscoroutinefunction(func) else func(*args, **kwargs)
+        return result
 
-        if kwargs.get("state", {}).get("workflow_trace_data", {}):
-            kwargs["state"]["workflow_trace_data"]["prevSpanId"] = config.spanId
+    @staticmethod
+    def monitor_call_sync(plan: CallPlan, args: tuple, kwargs: dict, trace_data: dict, operation_name: str) -> Any:
+        entered_ns = get_clock().monotonic_ns()
+        func = plan.func
+        config: WorkflowMonitoringConfig = ConfigFactory.create_from_trace_data(trace_data, operation_name, plan.log_enabled)
+        if not config:
+            _warn_unconfigured(plan)
+            return func(*args, **kwargs)
 
-        if kwargs.get("workflow_trace_data", {}):
-            kwargs["workflow_trace_data"]["prevSpanId"] = config.spanId
+        # Left active after the step returns, so the next step in this context chains onto it.
+        SpanContext.activate(config.traceId, config.spanId)
 
-        await WorkflowMonitoringService.send_start_event(config, kwargs)
+        # The step runs on the caller's thread; only the event emission is handed off.
+        WorkflowMonitoringService.emit_start_event(config, plan.input_of(kwargs))
         status = "SUCCESS"
         error_details = None
         result = None
 
-        if is_async_gen:
-            async_gen = func(*args, **kwargs)
-            return MonitoredAsyncGenerator(async_gen, config, on_close=WorkflowMonitoringService.send_end_event)
-
+        clock = get_clock()
+        started_ns = clock.monotonic_ns()
         try:
-            result = await func(*args, **kwargs) if inspect.iscoroutinefunction(func) else func(*args, **kwargs)
+            result = func(*args, **kwargs)
         except Exception as ex:
             status = "FAILURE"
-            error_details = {
-                "message": str(ex),
-                "stack": traceback.format_exc(),
-                "errorCode": type(ex).__name__
-            }
-            if log_enabled:
-                logger.error(f"Error in {operation_name}: {error_details['message']}")
-                logger.debug(f"Stack trace: {error_details['stack']}")
-
+            error_details = _error_details(ex, operation_name, plan.log_enabled)
             raise ex  # Re-raise the exception to propagate it,  because this decorator should not handle it.
         finally:
-            await WorkflowMonitoringService.send_end_event(config, result, status, error_details)
+            # Measured here: with the asyncio exporter the event itself is built later, on the monitoring loop.
+            duration_ns = clock.monotonic_ns() - started_ns
+            WorkflowMonitoringService.emit_end_event(config, plan.output_of(result), status, error_details, duration_ns)
+            WorkflowMonitoringService.record_overhead(entered_ns, duration_ns)
 
         return result
 
+    @staticmethod
+    async def monitor_stream(plan: CallPlan, args: tuple, kwargs: dict, trace_data: dict, operation_name: str) -> AsyncGenerator:
+        config: WorkflowMonitoringConfig = ConfigFactory.create_from_trace_data(trace_data, operation_name, plan.log_enabled)
+        if not config:
+            _warn_unconfigured(plan)
+            return plan.func(*args, **kwargs)
+
+        SpanContext.activate(config.traceId, config.spanId)
+
+        await WorkflowMonitoringService.send_start_event(config, plan.input_of(kwargs))
+        on_close = WorkflowMonitoringService.send_end_event if plan.capture_output else _send_end_without_output
+        return MonitoredAsyncGenerator(plan.func(*args, **kwargs), config, on_close=on_close)
+
+    @staticmethod
+    def record_overhead(entered_ns: int, duration_ns: int) -> None:
+        # Time spent around the step (config, events, capture), excluding the step itself.
+        overhead_ns = get_clock().monotonic_ns() - entered_ns - duration_ns
+        SelfMetrics.observe(DECORATOR_OVERHEAD_US, overhead_ns / 1000)
+
+    @staticmethod
+    def should_aggregate(plan: CallPlan, operation_name: Optional[str]) -> bool:
+        return plan.aggregate or OperationRollups.enabled_for(operation_name)
+
+    @staticmethod
+    async def aggregate_call(plan: CallPlan, args: tuple, kwargs: dict, trace_data: dict, operation_name: str) -> Any:
+        # Rollup mode: no per-call events, only duration and outcome folded into a per-operation histogram.
+        func = plan.func
+        started = get_clock().monotonic_ns()
+        error_code = None
+        try:
+            return await func(*args, **kwargs) if plan.is_async else func(*args, **kwargs)
+        except Exception as ex:
+            error_code = type(ex).__name__
+            raise
+        finally:
+            _record_rollup(plan, trace_data, operation_name, started, error_code)
+
+    @staticmethod
+    def aggregate_call_sync(plan: CallPlan, args: tuple, kwargs: dict, trace_data: dict, operation_name: str) -> Any:
+        started = get_clock().monotonic_ns()
+        error_code = None
+        try:
+            return plan.func(*args, **kwargs)
+        except Exception as ex:
+            error_code = type(ex).__name__
+            raise
+        finally:
+            _record_rollup(plan, trace_data, operation_name, started, error_code)
+
+    @staticmethod
+    async def aggregate_stream(plan: CallPlan, args: tuple, kwargs: dict, trace_data: dict, operation_name: str):
+        started = get_clock().monotonic_ns()
+        error_code = None
+        try:
+            async for item in plan.func(*args, **kwargs):
+                yield item
+        except Exception as ex:
+            error_code = type(ex).__name__
+            raise
+        finally:
+            _record_rollup(plan, trace_data, operation_name, started, error_code)
+
     @staticmethod
     async def send_start_event(config: WorkflowMonitoringConfig, kwargs):
-        if config.log_enabled:
-            logger.info(f"Sending start event for {config.operationName}, traceId: {config.traceId}, spanId: {config.spanId}")
-        event = WorkflowEvent(
-            traceId=config.traceId,
-            spanId=config.spanId,
-            parentSpanId=config.prevSpanId,
-            componentName=config.componentName,
-            operationName=config.operationName,
-            timestamp=current_timestamp(),
-            eventType="STEP_START",
-            # data=WorkflowEventPayload(input={"kwargs": str(kwargs)}),
-            data=WorkflowEventPayload(
-                input={
-                    "Me just": "testing"
-                }
-            )
-        )
-
-        payload = WorkflowPayload(
-            userId=config.userId,
-            projectId=config.projectId,
-            event=event
-        )
-
-        await PostClient.post_event(config, payload)
+        _export_start(config, kwargs)
 
     @staticmethod
-    async def send_end_event(config: WorkflowMonitoringConfig, result, status, error_details):
-        if config.log_enabled:
-            logger.info(f"Sending end event for {config.operationName}, traceId: {config.traceId}, spanId: {config.spanId}")
-        event = WorkflowEvent(
-            traceId=config.traceId,
-            spanId=config.spanId,
-            parentSpanId=config.prevSpanId,
-            componentName=config.componentName,
-            operationName=config.operationName,
-            timestamp=current_timestamp(),
-            eventType="STEP_END",
-            status=status,
-            # data=WorkflowEventPayload(output=result, errorDetails=error_details),
-            data=WorkflowEventPayload(
-                output={
-                    "Me just": "testing"
-                }
-            )
-        )
-
-        payload = WorkflowPayload(
-            userId=config.userId,
-            projectId=config.projectId,
-            event=event
-        )
-
-        await PostClient.post_event(config, payload)
+    async def send_end_event(config: WorkflowMonitoringConfig, result, status, error_details, stream_metrics: Optional[dict] = None, duration_ns: Optional[int] = None):
+        _export_end(config, result, status, error_details, stream_metrics, duration_ns)
+
+    @staticmethod
+    def emit_start_event(config: WorkflowMonitoringConfig, kwargs) -> None:
+        # For sync callers: the record is built here, on the caller's thread, while the step's state is what it was.
+        _emit(config, _start_record(config, kwargs))
+
+    @staticmethod
+    def emit_end_event(config: WorkflowMonitoringConfig, result, status, error_details, duration_ns: Optional[int] = None) -> None:
+        _emit(config, _end_record(config, result, status, error_details, None, duration_ns))
+
+
+async def _send_end_without_output(config: WorkflowMonitoringConfig, result, status, error_details, **kwargs) -> None:
+    await WorkflowMonitoringService.send_end_event(config, None, status, error_details, **kwargs)
+
+
+def _warn_unconfigured(plan: CallPlan) -> None:
+    if plan.log_enabled:
+        logger.warning("Workflow monitoring config is not available. Skipping monitoring.")
+
+
+def _error_details(ex: Exception, operation_name: str, log_enabled: bool) -> dict:
+    error_details = ErrorReporter.get().describe(ex)
+    if log_enabled:
+        logger.error(f"Error in {operation_name}: {error_details['message']} ({error_details['fingerprint']} x{error_details['occurrences']})")
+        if "stack" in error_details:
+            logger.debug(f"Stack trace: {error_details['stack']}")
+    return error_details
+
+
+def _export_start(config: WorkflowMonitoringConfig, kwargs) -> None:
+    _export(config, _start_record(config, kwargs))
+
+
+def _export_end(config: WorkflowMonitoringConfig, result, status, error_details, stream_metrics: Optional[dict], duration_ns: Optional[int]) -> None:
+    _export(config, _end_record(config, result, status, error_details, stream_metrics, duration_ns))
+
+
+def _emit(config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> None:
+    # The thread exporter takes the event directly, so no event loop is involved.
+    if uses_thread_exporter():
+        _export(config, record)
+    else:
+        EventEmitter.emit(_export_on_loop(config, record), config.log_enabled)
+
+
+async def _export_on_loop(config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> None:
+    _export(config, record)
+
+
+def _start_record(config: WorkflowMonitoringConfig, kwargs) -> WorkflowEventRecord:
+    if config.log_enabled:
+        logger.info(f"Sending start event for {config.operationName}, traceId: {config.traceId}, spanId: {config.spanId}")
+    return WorkflowEventRecord.from_config(
+        config,
+        "STEP_START",
+        current_timestamp(),
+        data={"input": _capture(kwargs)},
+    )
+
+
+def _end_record(config: WorkflowMonitoringConfig, result, status, error_details, stream_metrics: Optional[dict], duration_ns: Optional[int]) -> WorkflowEventRecord:
+    if config.log_enabled:
+        logger.info(f"Sending end event for {config.operationName}, traceId: {config.traceId}, spanId: {config.spanId}")
+    return WorkflowEventRecord.from_config(
+        config,
+        "STEP_END",
+        current_timestamp(),
+        status=status,
+        data={"output": _capture(result), "errorDetails": error_details or None},
+        custom_attributes=_end_attributes(duration_ns, stream_metrics),
+    )
+
+
+def _record_rollup(plan: CallPlan, trace_data: dict, operation_name: str, started_ns: int, error_code: Optional[str]) -> None:
+    if not trace_data.get("traceId"):
+        return
+    duration_ms = (get_clock().monotonic_ns() - started_ns) / 1_000_000
+    OperationRollups.get().record(trace_data, operation_name, duration_ms, error_code, plan.log_enabled)
+
+
+def _end_attributes(duration_ns: Optional[int], stream_metrics: Optional[dict]) -> Optional[dict]:
+    attributes = {}
+    if duration_ns is not None:
+        attributes["durationNs"] = duration_ns
+    if stream_metrics:
+        attributes["stream"] = stream_metrics
+    return attributes or None
+
+
+def _export(config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> None:
+    SelfMetrics.incr(EVENTS_EMITTED)
+    if config.sampled:
+        get_batch_exporter().export(config, record)
+    else:
+        # Not head-sampled: held back until the trace turns out to fail or run slow.
+        TailSampler.get().offer(config, record)
+
+
+def _capture(value: Any) -> Optional[LazyPayload]:
+    policy = get_settings().capture
+    if not policy.enabled or value is None:
+        return None
+    payload = LazyPayload(value, policy)
+    if not policy.lazy:
+        # Snapshot now, within the capture budget: steps mutate shared state after they return.
+        payload.resolve()
+    return payload
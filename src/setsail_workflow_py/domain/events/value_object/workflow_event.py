@@ -9,6 +9,9 @@ class ErrorDetails(BaseModel):
     message: str
     stack: Optional[str] = None
     errorCode: Optional[str] = None
+    # The stack is only sent with the first occurrence of a fingerprint per window.
+    fingerprint: Optional[str] = None
+    occurrences: Optional[int] = None
 
 class WorkflowEventPayload(BaseModel):
     input: Optional[Any] = None
@@ -0,0 +1,130 @@
+from typing import Any, Dict, Optional
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.domain.models.capture_policy import CapturePolicy
+from setsail_workflow_py.domain.services.payload_serializer import LazyPayload, PayloadSerializer
+
+# Identity fields, event type, timestamps and JSON punctuation of one serialised event.
+_RECORD_OVERHEAD = 384
+_DEFAULT_POLICY = CapturePolicy()
+
+
+class WorkflowEventRecord:
+    # Hot-path counterpart of WorkflowPayload: identity fields come from an already validated
+    # WorkflowMonitoringConfig, so building a record does no validation at all.
+    __slots__ = (
+        "userId", "projectId", "traceId", "spanId", "parentSpanId", "componentName",
+        "operationName", "timestamp", "eventType", "status", "data", "customAttributes",
+    )
+
+    def __init__(
+            self,
+            userId: str,
+            projectId: str,
+            traceId: str,
+            spanId: str,
+            parentSpanId: Optional[str],
+            componentName: str,
+            operationName: str,
+            timestamp: int,
+            eventType: str,
+            status: Optional[str] = None,
+            data: Optional[Dict[str, Any]] = None,
+            customAttributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.userId = userId
+        self.projectId = projectId
+        self.traceId = traceId
+        self.spanId = spanId
+        self.parentSpanId = parentSpanId
+        self.componentName = componentName
+        self.operationName = operationName
+        self.timestamp = timestamp
+        self.eventType = eventType
+        self.status = status
+        self.data = data
+        self.customAttributes = customAttributes
+
+    @classmethod
+    def from_config(
+            cls,
+            config: WorkflowMonitoringConfig,
+            event_type: str,
+            timestamp: int,
+            status: Optional[str] = None,
+            data: Optional[Dict[str, Any]] = None,
+            custom_attributes: Optional[Dict[str, Any]] = None,
+    ) -> "WorkflowEventRecord":
+        return cls(
+            config.userId,
+            config.projectId,
+            config.traceId,
+            config.spanId,
+            config.prevSpanId,
+            config.componentName,
+            config.operationName,
+            timestamp,
+            event_type,
+            status,
+            data,
+            custom_attributes,
+        )
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "WorkflowEventRecord":
+        # Inverse of to_dict(), for events that were serialised by another process.
+        event = payload["event"]
+        return cls(
+            payload["userId"],
+            payload["projectId"],
+            event["traceId"],
+            event["spanId"],
+            event.get("parentSpanId"),
+            event["componentName"],
+            event["operationName"],
+            event["timestamp"],
+            event["eventType"],
+            event.get("status"),
+            event.get("data"),
+            event.get("customAttributes"),
+        )
+
+    @property
+    def has_lazy_payload(self) -> bool:
+        return bool(self.data) and any(isinstance(v, LazyPayload) for v in self.data.values())
+
+    def estimated_size(self) -> int:
+        size = _RECORD_OVERHEAD
+        for value in (self.data or {}).values():
+            if isinstance(value, LazyPayload):
+                size += value.estimated_size()
+            elif value is not None:
+                size += PayloadSerializer.estimate_size(value, _DEFAULT_POLICY)
+        if self.customAttributes:
+            size += PayloadSerializer.estimate_size(self.customAttributes, _DEFAULT_POLICY)
+        return size
+
+    def materialize(self) -> None:
+        if self.data:
+            self.data = {k: v.resolve() if isinstance(v, LazyPayload) else v for k, v in self.data.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Same shape as WorkflowPayload.model_dump(mode="json", exclude_none=True).
+        event: Dict[str, Any] = {
+            "traceId": self.traceId,
+            "spanId": self.spanId,
+            "componentName": self.componentName,
+            "operationName": self.operationName,
+            "timestamp": self.timestamp,
+            "eventType": self.eventType,
+            "data": {
+                k: v.resolve() if isinstance(v, LazyPayload) else v
+                for k, v in (self.data or {}).items() if v is not None
+            },
+        }
+        if self.parentSpanId is not None:
+            event["parentSpanId"] = self.parentSpanId
+        if self.status is not None:
+            event["status"] = self.status
+        if self.customAttributes is not None:
+            event["customAttributes"] = self.customAttributes
+        return {"userId": self.userId, "projectId": self.projectId, "event": event}
@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional
+
+DEFAULT_EXCLUDE_KEYS = frozenset({
+    "workflow_trace_data",
+    "x-api-key",
+    "api_key",
+    "apikey",
+    "authorization",
+    "password",
+    "secret",
+    "token",
+    "access_token",
+    "refresh_token",
+})
+
+
+@dataclass(frozen=True)
+class CapturePolicy:
+    enabled: bool = True
+    max_depth: int = 6
+    max_items: int = 50
+    max_string_length: int = 2048
+    max_bytes: int = 64 * 1024
+    # Lower-case key names. include_keys filters the top level only; exclude_keys apply at every level.
+    include_keys: Optional[FrozenSet[str]] = None
+    exclude_keys: FrozenSet[str] = field(default=DEFAULT_EXCLUDE_KEYS)
+    truncation_marker: str = "...[truncated]"
+    redaction_marker: str = "[redacted]"
+    # Serialise in the exporter instead of when the step runs. Only the top level is copied, so
+    # nested values mutated by later steps show up in events that were already recorded.
+    lazy: bool = False
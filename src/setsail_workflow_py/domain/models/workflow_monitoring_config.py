@@ -13,3 +13,4 @@ class WorkflowMonitoringConfig(BaseModel):
     componentName: str = Field(min_length=1, max_length=64)
     operationName: str = Field(min_length=1, max_length=64)
     log_enabled: bool = Field(default=False)
+    sampled: bool = Field(default=True)
@@ -1,47 +1,85 @@
 # src/domain/services/config_factory.py
-import os
+from functools import lru_cache
 from typing import Optional
 from pydantic import HttpUrl
 from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.domain.services.trace_sampler import TraceSampler
+from setsail_workflow_py.shared.settings import get_settings
+from setsail_workflow_py.shared.span_context import SpanContext
 from setsail_workflow_py.shared.utils import generate_span_id
 from loguru import logger
 
+SPAN_ID_LENGTH = 16
+MAX_NAME_LENGTH = 64
+TRACE_CONFIG_CACHE_SIZE = 1024
+
+
 class ConfigFactory:
 
     @staticmethod
-    def create_from_trace_data(trace_data: dict, operation_name: str, log_enabled: bool = False) -> Optional[WorkflowMonitoringConfig]:
-        env = os.getenv("ENV", "local")
+    def create_from_trace_data(trace_data: dict, operation_name: str, log_enabled: bool = False, sample: bool = True) -> Optional[WorkflowMonitoringConfig]:
+        settings = get_settings()
+        if not settings.active or not trace_data or not trace_data.get("traceId"):
+            return None
+
+        # Decided before anything is validated, captured or serialised: a dropped trace costs one hash.
+        # sample=False is for events that summarise many traces (rollups), which no trace id stands for.
+        sampled = not sample or TraceSampler.head_sampled(str(trace_data["traceId"]), settings.sample_rate)
+        if not sampled and not settings.tail_sampling:
+            return None
+
         try:
-            if env == "local":
-                raw_post_url = os.getenv("WORKFLOW_MONITORING_URL", trace_data.get("post_url", "http://localhost:8000"))
-            elif env == "dev":
-                raw_post_url = os.getenv("WORKFLOW_MONITORING_URL", trace_data.get("post_url", "UNKNOWN"))
-            elif env == "prod":
-                raw_post_url = os.getenv("WORKFLOW_MONITORING_URL", trace_data.get("post_url", "UNKNOWN"))
-            else:
-                return None
+            default_post_url = "http://localhost:8000" if settings.env == "local" else "UNKNOWN"
+            raw_post_url = _env_or(settings.monitoring_url, trace_data.get("post_url", default_post_url))
 
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": os.getenv("WORKFLOW_MONITORING_API_KEY", trace_data.get("x-api-key", "UNKNOWN"))
-            }
+            api_key = _env_or(settings.api_key, trace_data.get("x-api-key", "UNKNOWN"))
 
-            if not trace_data.get("traceId") or raw_post_url == "UNKNOWN" or headers.get("x-api-key") == "UNKNOWN":
+            if raw_post_url == "UNKNOWN" or api_key == "UNKNOWN":
                 return None
 
-            return WorkflowMonitoringConfig(
-                post_url=HttpUrl(raw_post_url),
-                headers=headers,
-                spanId=generate_span_id(),
-                traceId=trace_data["traceId"],
-                prevSpanId=trace_data.get("prevSpanId"),
-                userId=trace_data.get("userId", os.getenv("WORKFLOW_USER_ID", "UNKNOWN")),
-                projectId=trace_data.get("projectId", os.getenv("WORKFLOW_PROJECT_ID", "UNKNOWN")),
-                componentName=operation_name,
-                operationName=operation_name,
-                log_enabled=trace_data.get("log_enabled", log_enabled),
+            base = _validated_trace_config(
+                raw_post_url,
+                api_key,
+                trace_data["traceId"],
+                trace_data.get("userId", _env_or(settings.user_id, "UNKNOWN")),
+                trace_data.get("projectId", _env_or(settings.project_id, "UNKNOWN")),
+                trace_data.get("log_enabled", log_enabled),
             )
+
+            prev_span_id = SpanContext.parent_span_id(trace_data)
+            if prev_span_id is not None and (not isinstance(prev_span_id, str) or len(prev_span_id) != SPAN_ID_LENGTH):
+                raise ValueError(f"prevSpanId must be a {SPAN_ID_LENGTH}-character string, got {prev_span_id!r}")
+            if not isinstance(operation_name, str) or not 1 <= len(operation_name) <= MAX_NAME_LENGTH:
+                raise ValueError(f"operationName must be a 1-{MAX_NAME_LENGTH} character string, got {operation_name!r}")
+
+            # Identity fields were validated once for this trace; per-step fields are checked above.
+            return base.model_copy(update={
+                "spanId": generate_span_id(),
+                "prevSpanId": prev_span_id,
+                "componentName": operation_name,
+                "operationName": operation_name,
+                "sampled": sampled,
+            })
         except Exception as e:
             if log_enabled:
                 logger.error(f"Error creating WorkflowMonitoringConfig: {e}")
             return None
+
+
+@lru_cache(maxsize=TRACE_CONFIG_CACHE_SIZE)
+def _validated_trace_config(post_url: str, api_key: str, trace_id: str, user_id: str, project_id: str, log_enabled: bool) -> WorkflowMonitoringConfig:
+    return WorkflowMonitoringConfig(
+        post_url=HttpUrl(post_url),
+        headers={"Content-Type": "application/json", "x-api-key": api_key},
+        spanId="0" * SPAN_ID_LENGTH,
+        traceId=trace_id,
+        userId=user_id,
+        projectId=project_id,
+        componentName="_",
+        operationName="_",
+        log_enabled=log_enabled,
+    )
+
+
+def _env_or(env_value: Optional[str], default: str) -> str:
+    return default if env_value is None else env_value
@@ -0,0 +1,28 @@
+import hashlib
+import os
+from types import TracebackType
+from typing import List, Optional
+
+FINGERPRINT_BYTES = 8
+
+
+class ErrorFingerprint:
+
+    @staticmethod
+    def of(ex: BaseException) -> str:
+        # Built from the exception type and where it was raised, never from the message, which
+        # usually carries ids or payload fragments that differ between otherwise identical failures.
+        parts = [f"{type(ex).__module__}.{type(ex).__qualname__}"]
+        parts.extend(ErrorFingerprint.frames(ex.__traceback__))
+        digest = hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=FINGERPRINT_BYTES)
+        return digest.hexdigest()
+
+    @staticmethod
+    def frames(tb: Optional[TracebackType]) -> List[str]:
+        # Only the file name is kept, so installs under different prefixes fingerprint alike.
+        frames = []
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{tb.tb_lineno}")
+            tb = tb.tb_next
+        return frames
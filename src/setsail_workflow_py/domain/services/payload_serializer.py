@@ -0,0 +1,174 @@
+import dataclasses
+import datetime
+import enum
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from setsail_workflow_py.domain.models.capture_policy import CapturePolicy
+
+_SCALARS = (bool, int, float, type(None))
+# Charged for a value whose size is not worth working out (objects, containers past max_depth).
+_NESTED_ESTIMATE = 64
+
+
+class _Budget:
+    __slots__ = ("remaining",)
+
+    def __init__(self, remaining: int):
+        self.remaining = remaining
+
+
+class PayloadSerializer:
+
+    @staticmethod
+    def sanitize(value: Any, policy: CapturePolicy) -> Any:
+        budget = _Budget(policy.max_bytes)
+        if isinstance(value, dict) and policy.include_keys is not None:
+            value = {k: v for k, v in value.items() if str(k).lower() in policy.include_keys}
+        return PayloadSerializer._walk(value, policy, 0, budget)
+
+    @staticmethod
+    def estimate_size(value: Any, policy: CapturePolicy) -> int:
+        # A guess at the serialised size, used to bound buffers before the payload is serialised.
+        # Nested containers are walked like sanitize() walks them, until the capture budget is spent.
+        budget = _Budget(policy.max_bytes)
+        PayloadSerializer._estimate(value, policy, 0, budget)
+        return policy.max_bytes - max(budget.remaining, 0)
+
+    @staticmethod
+    def _estimate(value: Any, policy: CapturePolicy, depth: int, budget: _Budget) -> None:
+        if isinstance(value, str):
+            budget.remaining -= min(len(value), policy.max_string_length) + 2
+            return
+        if isinstance(value, _SCALARS):
+            budget.remaining -= 8
+            return
+        if depth >= policy.max_depth:
+            budget.remaining -= _NESTED_ESTIMATE
+            return
+        if not isinstance(value, (dict, list, tuple, set, frozenset)):
+            fields = PayloadSerializer._object_fields(value)
+            if fields is None:
+                budget.remaining -= _NESTED_ESTIMATE
+                return
+            value = fields
+        budget.remaining -= 2
+        if isinstance(value, dict):
+            for key, item in islice(value.items(), policy.max_items):
+                if budget.remaining <= 0:
+                    return
+                budget.remaining -= len(key) + 4 if type(key) is str else 12
+                PayloadSerializer._estimate(item, policy, depth + 1, budget)
+        else:
+            for item in islice(value, policy.max_items):
+                if budget.remaining <= 0:
+                    return
+                budget.remaining -= 1
+                PayloadSerializer._estimate(item, policy, depth + 1, budget)
+
+    @staticmethod
+    def _walk(value: Any, policy: CapturePolicy, depth: int, budget: _Budget) -> Any:
+        if budget.remaining <= 0:
+            return policy.truncation_marker
+
+        if isinstance(value, _SCALARS):
+            budget.remaining -= 8
+            return value
+
+        if isinstance(value, str):
+            return PayloadSerializer._truncate_str(value, policy, budget)
+
+        if isinstance(value, bytes):
+            return PayloadSerializer._truncate_str(f"<{len(value)} bytes>", policy, budget)
+
+        if isinstance(value, enum.Enum):
+            return PayloadSerializer._walk(value.value, policy, depth, budget)
+
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return PayloadSerializer._truncate_str(value.isoformat(), policy, budget)
+
+        if depth >= policy.max_depth:
+            marker = f"<{type(value).__name__}> {policy.truncation_marker}"
+            budget.remaining -= len(marker)
+            return marker
+
+        if isinstance(value, dict):
+            return PayloadSerializer._walk_mapping(value, policy, depth, budget)
+
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return PayloadSerializer._walk_sequence(value, policy, depth, budget)
+
+        fields = PayloadSerializer._object_fields(value)
+        if fields is not None:
+            return PayloadSerializer._walk_mapping(fields, policy, depth, budget)
+
+        return PayloadSerializer._truncate_str(repr(value), policy, budget)
+
+    @staticmethod
+    def _walk_mapping(value: Dict[Any, Any], policy: CapturePolicy, depth: int, budget: _Budget) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for index, (key, item) in enumerate(value.items()):
+            if index >= policy.max_items:
+                result[policy.truncation_marker] = f"{len(value) - index} more keys"
+                break
+            if budget.remaining <= 0:
+                result[policy.truncation_marker] = f"{len(value) - index} more keys"
+                break
+            key = key if isinstance(key, str) else str(key)
+            budget.remaining -= len(key) + 4
+            if key.lower() in policy.exclude_keys:
+                result[key] = policy.redaction_marker
+                continue
+            result[key] = PayloadSerializer._walk(item, policy, depth + 1, budget)
+        return result
+
+    @staticmethod
+    def _walk_sequence(value: Any, policy: CapturePolicy, depth: int, budget: _Budget) -> List[Any]:
+        result: List[Any] = []
+        size = len(value)
+        for index, item in enumerate(value):
+            if index >= policy.max_items or budget.remaining <= 0:
+                result.append(f"{policy.truncation_marker} {size - index} more items")
+                break
+            result.append(PayloadSerializer._walk(item, policy, depth + 1, budget))
+        return result
+
+    @staticmethod
+    def _truncate_str(value: str, policy: CapturePolicy, budget: _Budget) -> str:
+        limit = min(policy.max_string_length, max(budget.remaining, 0))
+        if len(value) > limit:
+            value = f"{value[:limit]}{policy.truncation_marker} ({len(value) - limit} chars)"
+        budget.remaining -= len(value) + 2
+        return value
+
+    @staticmethod
+    def _object_fields(value: Any) -> Optional[Dict[str, Any]]:
+        # Walk model/dataclass fields in place instead of model_dump()/asdict(), which copy the whole tree.
+        if hasattr(type(value), "model_fields") and hasattr(value, "__dict__"):
+            return {k: v for k, v in value.__dict__.items() if not k.startswith("_")}
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+        return None
+
+
+class LazyPayload:
+    # Captured value, bounded on resolve(): when the step runs by default, in the exporter if capture is lazy.
+    __slots__ = ("value", "policy", "_resolved", "_done")
+
+    def __init__(self, value: Any, policy: CapturePolicy):
+        # Shallow-copy the top level so keys added or replaced by later steps do not leak into this event.
+        if isinstance(value, dict):
+            value = dict(value)
+        self.value = value
+        self.policy = policy
+        self._resolved: Any = None
+        self._done = False
+
+    def resolve(self) -> Any:
+        if not self._done:
+            self._resolved = PayloadSerializer.sanitize(self.value, self.policy)
+            self._done = True
+            self.value = None
+        return self._resolved
+
+    def estimated_size(self) -> int:
+        return PayloadSerializer.estimate_size(self._resolved if self._done else self.value, self.policy)
@@ -0,0 +1,27 @@
+import hashlib
+
+# The rightmost 56 bits of a trace id are random both for W3C trace ids and for uuid4().hex;
+# the bits above them carry the uuid version/variant and are not uniformly distributed.
+_RANDOM_HEX_DIGITS = 14
+_MAX_BUCKET = 1 << (_RANDOM_HEX_DIGITS * 4)
+
+
+class TraceSampler:
+
+    @staticmethod
+    def head_sampled(trace_id: str, rate: float) -> bool:
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        return TraceSampler.trace_bucket(trace_id) < int(rate * _MAX_BUCKET)
+
+    @staticmethod
+    def trace_bucket(trace_id: str) -> int:
+        # Derived from the trace id alone, so every service sampling at the same rate
+        # keeps or drops the same traces without coordinating.
+        try:
+            return int(trace_id[-_RANDOM_HEX_DIGITS:], 16)
+        except ValueError:
+            digest = hashlib.blake2b(trace_id.encode("utf-8"), digest_size=8).digest()
+            return int.from_bytes(digest, "big") % _MAX_BUCKET
@@ -0,0 +1,94 @@
+import errno
+import os
+import socket
+import threading
+from typing import List, Optional
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.collector.collector_frame import CollectorFrame
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, ExportItem
+
+# Errors meaning the collector is not there (not started yet, restarting, socket removed).
+_UNREACHABLE = {errno.ENOENT, errno.ECONNREFUSED, errno.ENOTCONN, errno.EDESTADDRREQ}
+
+
+class CollectorClient(EventExporter):
+    _instance: Optional["CollectorClient"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path: str) -> "CollectorClient":
+        instance = cls._instance
+        if instance is None or instance.path != path:
+            with cls._instance_lock:
+                if cls._instance is None or cls._instance.path != path:
+                    cls._instance = cls(path)
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # Each worker gets its own socket; datagrams from both processes would otherwise interleave on one fd.
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    def send(self, config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> bool:
+        frame = CollectorFrame.encode(config, record)
+        try:
+            self._socket().send(frame)
+            return True
+        except BlockingIOError:
+            # The collector's receive queue is full; never wait for it.
+            return False
+        except OSError as e:
+            if e.errno in _UNREACHABLE:
+                self.close()
+            elif config.log_enabled:
+                logger.warning(f"Cannot send event frame of {len(frame)} bytes to collector {self.path}: {e}")
+            return False
+
+    async def send_events(self, batch: List[ExportItem]) -> List[bool]:
+        results = [self.send(config, record) for config, record in batch]
+        failed = [index for index, ok in enumerate(results) if not ok]
+        if failed:
+            # Collector unreachable, backlogged or the frame too large: deliver these directly instead.
+            from setsail_workflow_py.infrastructure.http.post_client import PostClient
+            posted = await PostClient.post_events([batch[index] for index in failed])
+            for index, ok in zip(failed, posted):
+                results[index] = ok
+        return results
+
+    async def export(self, batch: List[ExportItem]) -> List[bool]:
+        return await self.send_events(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+
+    def _socket(self) -> socket.socket:
+        sock = self._sock
+        if sock is None:
+            with self._lock:
+                if self._sock is None:
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                    sock.setblocking(False)
+                    try:
+                        sock.connect(self.path)
+                    except OSError:
+                        sock.close()
+                        raise
+                    self._sock = sock
+                sock = self._sock
+        return sock
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=CollectorClient._reset_after_fork)
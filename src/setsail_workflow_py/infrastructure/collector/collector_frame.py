@@ -0,0 +1,31 @@
+from typing import Tuple
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.shared.json_codec import dumps, loads
+
+
+class CollectorFrame:
+    # One datagram per event: the upstream endpoint and credentials plus the event body, with short keys.
+
+    @staticmethod
+    def encode(config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> bytes:
+        return dumps({"u": str(config.post_url), "h": config.headers, "l": config.log_enabled, "e": record.to_dict()})
+
+    @staticmethod
+    def decode(frame: bytes) -> Tuple[WorkflowMonitoringConfig, WorkflowEventRecord]:
+        message = loads(frame)
+        record = WorkflowEventRecord.from_dict(message["e"])
+        # The sending worker already validated the config; the collector only needs it for delivery.
+        config = WorkflowMonitoringConfig.model_construct(
+            post_url=message["u"],
+            headers=message["h"],
+            traceId=record.traceId,
+            spanId=record.spanId,
+            prevSpanId=record.parentSpanId,
+            userId=record.userId,
+            projectId=record.projectId,
+            componentName=record.componentName,
+            operationName=record.operationName,
+            log_enabled=message.get("l", False),
+        )
+        return config, record
@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import stat
+from typing import Callable, Optional
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.collector.collector_frame import CollectorFrame
+
+Export = Callable[[WorkflowMonitoringConfig, WorkflowEventRecord], None]
+
+DEFAULT_SOCKET_PATH = "/tmp/setsail-workflow-collector.sock"
+RECEIVE_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+class _CollectorProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "CollectorServer"):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.server.receive(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning(f"Collector socket error: {exc}")
+
+
+class CollectorServer:
+    def __init__(self, path: str, export: Export):
+        self.path = path
+        self._export = export
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self.received = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        _remove_stale_socket(self.path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_BYTES)
+        except OSError:
+            pass
+        sock.bind(self.path)
+        # Frames carry API keys; only processes of the same user may send them.
+        os.chmod(self.path, 0o600)
+        sock.setblocking(False)
+        self._stopped = asyncio.Event()
+        self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _CollectorProtocol(self), sock=sock
+        )
+        logger.info(f"Workflow event collector listening on {self.path}")
+
+    async def serve_forever(self) -> None:
+        if self._transport is None:
+            await self.start()
+        await self._stopped.wait()  # type: ignore[union-attr]
+
+    def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+            _remove_stale_socket(self.path)
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def receive(self, frame: bytes) -> None:
+        try:
+            config, record = CollectorFrame.decode(frame)
+        except Exception as e:
+            self.rejected += 1
+            logger.warning(f"Collector dropped an undecodable frame of {len(frame)} bytes: {e}")
+            return
+        self.received += 1
+        self._export(config, record)
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _serve(path: str) -> None:
+    from setsail_workflow_py.infrastructure.exporters.batch_event_exporter import BatchEventExporter
+    from setsail_workflow_py.infrastructure.http.post_client import PostClient
+    from setsail_workflow_py.shared.settings import get_settings
+
+    settings = get_settings()
+    # Always posts upstream, even if this process inherited WORKFLOW_MONITORING_COLLECTOR_SOCKET.
+    exporter = BatchEventExporter(PostClient.post_events, settings.batch_size, settings.batch_delay)
+    server = CollectorServer(path, exporter.export)
+    await server.start()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, server.stop)
+    try:
+        await server.serve_forever()
+    finally:
+        server.stop()
+        logger.info(f"Collector stopping after {server.received} events, flushing upstream")
+        await loop.run_in_executor(None, exporter.shutdown, 10.0)
+
+
+def main(argv: Optional[list] = None) -> None:
+    from setsail_workflow_py.shared.settings import get_settings
+
+    parser = argparse.ArgumentParser(description="Local collector that batches workflow events from worker processes and forwards them upstream.")
+    parser.add_argument("--socket", default=get_settings().collector_socket or DEFAULT_SOCKET_PATH, help="UNIX datagram socket path to listen on")
+    args = parser.parse_args(argv)
+    asyncio.run(_serve(args.socket))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Callable, List, Optional, Union
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.event_buffer import EventBuffer
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, ExportItem, create_exporter
+from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+from setsail_workflow_py.shared.event_loss import EXPORT_ERROR, SHUTDOWN, EventLoss
+from setsail_workflow_py.shared.off_loop import run_off_loop
+from setsail_workflow_py.shared.self_metrics import EVENTS_FAILED, SelfMetrics
+from setsail_workflow_py.shared.settings import get_settings
+
+BatchSink = Callable[[List[ExportItem]], Awaitable[Any]]
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_SCHEDULE_DELAY = 0.2
+
+
+class BatchEventExporter:
+    _instance: Optional["BatchEventExporter"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+            self,
+            sink: Union[EventExporter, BatchSink],
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            schedule_delay: float = DEFAULT_SCHEDULE_DELAY,
+            loop_thread: Optional[EventLoopThread] = None,
+            buffer: Optional[EventBuffer] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self._exporter = sink if isinstance(sink, EventExporter) else None
+        self._sink: BatchSink = sink.export if isinstance(sink, EventExporter) else sink
+        self._max_batch_size = max_batch_size
+        self._schedule_delay = schedule_delay
+        self._loop_thread = loop_thread or EventLoopThread.get()
+        self._queue = buffer if buffer is not None else EventBuffer()
+        self._start_lock = threading.Lock()
+        self._worker: Optional[concurrent.futures.Future] = None
+        # asyncio primitives bind to the loop on first use, which is always the monitoring loop.
+        self._wakeup = asyncio.Event()
+        self._export_lock = asyncio.Lock()
+        self._shutdown = False
+
+    @classmethod
+    def get(cls) -> "BatchEventExporter":
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    settings = get_settings()
+                    cls._instance = cls(
+                        create_exporter(settings), settings.batch_size, settings.batch_delay, buffer=EventBuffer.from_settings(settings)
+                    )
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def install(cls, exporter: Optional[EventExporter], timeout: Optional[float] = 5.0) -> bool:
+        # Swaps the process-wide exporter; None goes back to the one configured by the environment.
+        settings = get_settings()
+        with cls._instance_lock:
+            previous = cls._instance
+            cls._instance = None if exporter is None else cls(
+                exporter, settings.batch_size, settings.batch_delay, buffer=EventBuffer.from_settings(settings)
+            )
+        return previous is None or previous.shutdown(timeout)
+
+    @classmethod
+    def initialized(cls) -> bool:
+        return cls._instance is not None
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # Events queued by the parent are the parent's to ship; the child starts empty.
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._queue.bytes
+
+    def export(self, config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> None:
+        if self._shutdown:
+            EventLoss.record(SHUTDOWN)
+            if config.log_enabled:
+                logger.warning(f"Exporter is shut down, dropping event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}")
+            return
+
+        # Blocking on the monitoring loop itself would stop the worker that makes room.
+        if not self._queue.put((config, record), block=not self._loop_thread.in_loop_thread()):
+            return
+        if self._worker is None:
+            self._start()
+        elif len(self._queue) % self._max_batch_size == 0:
+            # Wake the worker once per full batch; waking on every append past the threshold
+            # costs a cross-thread wakeup per event whenever the backend falls behind.
+            self._loop_thread.call_soon(self._wakeup.set)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        if self._worker is None:
+            return not self._queue
+        if self._loop_thread.in_loop_thread():
+            raise RuntimeError("flush() cannot be called from the monitoring loop thread")
+        future = self._loop_thread.submit(self._export_pending())
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            return False
+        return not self._queue
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> bool:
+        if self._shutdown:
+            return not self._queue
+        self._shutdown = True
+        if self._worker is not None:
+            self._loop_thread.call_soon(self._wakeup.set)
+            try:
+                self._worker.result(timeout)
+            except concurrent.futures.TimeoutError:
+                return False
+            except Exception as e:
+                logger.debug(f"Exporter worker stopped with error: {e}")
+        if self._exporter is not None:
+            self._exporter.close()
+        return not self._queue
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._worker is not None:
+                return
+            self._worker = self._loop_thread.submit(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._schedule_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._export_pending()
+            if self._shutdown and not self._queue:
+                return
+
+    async def _export_pending(self) -> None:
+        async with self._export_lock:
+            while self._queue:
+                batch = self._queue.take(self._max_batch_size)
+                try:
+                    if any(record.has_lazy_payload for _, record in batch):
+                        await _materialize_off_loop(batch)
+                    SelfMetrics.record_batch(len(batch), await self._sink(batch))
+                except Exception as e:
+                    SelfMetrics.incr(EVENTS_FAILED, len(batch))
+                    EventLoss.record(EXPORT_ERROR, len(batch))
+                    logger.error(f"Error exporting batch of {len(batch)} events: {e}")
+
+
+def _materialize(batch: List[ExportItem]) -> None:
+    for _, record in batch:
+        record.materialize()
+
+
+async def _materialize_off_loop(batch: List[ExportItem]) -> None:
+    # Bounding/serialising captured inputs and outputs can be slow for large states;
+    # keep it off the loop that does the network I/O.
+    await run_off_loop(_materialize, batch)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=BatchEventExporter._reset_after_fork)
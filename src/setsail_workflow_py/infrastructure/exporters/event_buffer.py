@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+from setsail_workflow_py.infrastructure.exporters.event_exporter import ExportItem
+from setsail_workflow_py.shared.event_loss import BLOCK_TIMEOUT, BYTES_FULL, DISPLACED, OVERSIZED, QUEUE_FULL, EventLoss
+from setsail_workflow_py.shared.settings import MonitoringSettings
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+DEFAULT_MAX_EVENTS = 10_000
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_BLOCK_TIMEOUT = 0.05
+
+
+class EventBuffer:
+    # Bounded queue between the decorators and an exporter. When the backend falls behind,
+    # events are shed according to the overflow policy instead of growing the heap.
+
+    def __init__(
+            self,
+            max_events: int = DEFAULT_MAX_EVENTS,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            policy: str = DROP_NEWEST,
+            block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+    ):
+        if max_events < 1 or max_bytes < 1:
+            raise ValueError(f"Event buffer needs max_events >= 1 and max_bytes >= 1, got {max_events} and {max_bytes}")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of: {', '.join(OVERFLOW_POLICIES)}")
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._items: Deque[Tuple[ExportItem, int]] = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+
+    @classmethod
+    def from_settings(cls, settings: MonitoringSettings) -> "EventBuffer":
+        return cls(settings.buffer_max_events, settings.buffer_max_bytes, settings.overflow_policy, settings.block_timeout)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def put(self, item: ExportItem, block: bool = True) -> bool:
+        # block=False is for callers that would otherwise wait on themselves (the exporter's own thread).
+        size = item[1].estimated_size()
+        if size > self.max_bytes:
+            EventLoss.record(OVERSIZED)
+            return False
+        with self._lock:
+            reason = self._overflow(size)
+            if reason is not None and self.policy == BLOCK and block:
+                deadline = time.monotonic() + self.block_timeout
+                while reason is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        reason = BLOCK_TIMEOUT
+                        break
+                    self._space.wait(remaining)
+                    reason = self._overflow(size)
+            if reason is not None and self.policy == DROP_OLDEST:
+                displaced = 0
+                while self._items and self._overflow(size) is not None:
+                    _, dropped_size = self._items.popleft()
+                    self._bytes -= dropped_size
+                    displaced += 1
+                EventLoss.record(DISPLACED, displaced)
+                reason = None
+            if reason is not None:
+                EventLoss.record(reason)
+                return False
+            self._items.append((item, size))
+            self._bytes += size
+        return True
+
+    def take(self, limit: int) -> List[ExportItem]:
+        batch: List[ExportItem] = []
+        with self._lock:
+            while self._items and len(batch) < limit:
+                item, size = self._items.popleft()
+                self._bytes -= size
+                batch.append(item)
+            if batch:
+                self._space.notify_all()
+        return batch
+
+    def _overflow(self, size: int) -> Optional[str]:
+        if len(self._items) >= self.max_events:
+            return QUEUE_FULL
+        if self._bytes + size > self.max_bytes:
+            return BYTES_FULL
+        return None
@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, List, Tuple, Union
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.shared.settings import MonitoringSettings, get_settings
+
+if TYPE_CHECKING:
+    from setsail_workflow_py.infrastructure.exporters.batch_event_exporter import BatchEventExporter
+    from setsail_workflow_py.infrastructure.exporters.threaded_batch_exporter import ThreadedBatchExporter
+    from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+    from setsail_workflow_py.infrastructure.monitoring.thread_timer import ThreadTimer
+
+ExportItem = Tuple[WorkflowMonitoringConfig, WorkflowEventRecord]
+
+HTTP_EXPORTER = "http"
+COLLECTOR_EXPORTER = "collector"
+FILE_EXPORTER = "file"
+STDOUT_EXPORTER = "stdout"
+MEMORY_EXPORTER = "memory"
+THREAD_EXPORTER = "thread"
+
+
+class EventExporter(ABC):
+    # Receives batches from BatchEventExporter on the monitoring loop, with lazy payloads already resolved.
+
+    @abstractmethod
+    async def export(self, batch: List[ExportItem]) -> List[bool]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+def create_exporter(settings: MonitoringSettings) -> EventExporter:
+    name = settings.exporter or (COLLECTOR_EXPORTER if settings.collector_socket else HTTP_EXPORTER)
+    if name in (HTTP_EXPORTER, THREAD_EXPORTER):
+        from setsail_workflow_py.infrastructure.exporters.http_event_exporter import HttpEventExporter
+        return HttpEventExporter()
+    if name == COLLECTOR_EXPORTER:
+        if not settings.collector_socket:
+            raise ValueError("WORKFLOW_MONITORING_EXPORTER=collector needs WORKFLOW_MONITORING_COLLECTOR_SOCKET")
+        from setsail_workflow_py.infrastructure.collector.collector_client import CollectorClient
+        return CollectorClient.get(settings.collector_socket)
+    if name == FILE_EXPORTER:
+        from setsail_workflow_py.infrastructure.exporters.file_event_exporter import FileEventExporter
+        return FileEventExporter(settings.file_dir, settings.file_max_bytes, settings.file_backups)
+    if name == STDOUT_EXPORTER:
+        from setsail_workflow_py.infrastructure.exporters.stream_event_exporter import StreamEventExporter
+        return StreamEventExporter()
+    if name == MEMORY_EXPORTER:
+        from setsail_workflow_py.infrastructure.exporters.memory_event_exporter import InMemoryEventExporter
+        return InMemoryEventExporter()
+    raise ValueError(f"Unknown exporter {name!r}, expected one of: http, thread, collector, file, stdout, memory")
+
+
+def get_batch_exporter() -> Union["BatchEventExporter", "ThreadedBatchExporter"]:
+    # The thread exporter ships events without ever starting the asyncio monitoring loop.
+    if get_settings().exporter == THREAD_EXPORTER:
+        from setsail_workflow_py.infrastructure.exporters.threaded_batch_exporter import ThreadedBatchExporter
+        return ThreadedBatchExporter.get()
+    from setsail_workflow_py.infrastructure.exporters.batch_event_exporter import BatchEventExporter
+    return BatchEventExporter.get()
+
+
+def uses_thread_exporter() -> bool:
+    return get_settings().exporter == THREAD_EXPORTER
+
+
+def get_timer() -> Union["EventLoopThread", "ThreadTimer"]:
+    # Rollup flushes and tail-sampling expiry run next to the exporter, so thread mode never starts asyncio either.
+    if uses_thread_exporter():
+        from setsail_workflow_py.infrastructure.monitoring.thread_timer import ThreadTimer
+        return ThreadTimer()
+    from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+    return EventLoopThread.get()
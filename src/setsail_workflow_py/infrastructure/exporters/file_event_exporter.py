@@ -0,0 +1,105 @@
+import glob
+import os
+import threading
+import time
+from typing import List
+from loguru import logger
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, ExportItem
+from setsail_workflow_py.shared.json_codec import dumps
+from setsail_workflow_py.shared.off_loop import run_off_loop
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_BACKUPS = 10
+
+ACTIVE_SUFFIX = ".ndjson"
+
+
+class FileEventExporter(EventExporter):
+    # Appends one JSON event per line to events-<pid>.ndjson; a full file is renamed to
+    # events-<pid>-<ms>.ndjson for a log shipper to pick up. Each process writes its own file,
+    # so lines from several workers never interleave.
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, backups: int = DEFAULT_BACKUPS):
+        if max_bytes < 1 or backups < 0:
+            raise ValueError(f"File exporter needs max_bytes >= 1 and backups >= 0, got {max_bytes} and {backups}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._file = None
+        self._pid = 0
+        self._size = 0
+        self._rotated_ms = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"events-{os.getpid()}{ACTIVE_SUFFIX}")
+
+    async def export(self, batch: List[ExportItem]) -> List[bool]:
+        # Serialising, writing, rotating and pruning are blocking; keep them off the monitoring loop.
+        return await run_off_loop(self.write_batch, batch)
+
+    def write_batch(self, batch: List[ExportItem]) -> List[bool]:
+        lines = [dumps(record.to_dict()) + b"\n" for _, record in batch]
+        with self._lock:
+            try:
+                for line in lines:
+                    if self._file is not None and self._size and self._size + len(line) > self.max_bytes:
+                        self._rotate()
+                    self._write(line)
+                self._file.flush()  # type: ignore[union-attr]
+            except OSError as e:
+                logger.error(f"Error writing events to {self.directory}: {e}")
+                return [False] * len(batch)
+        return [True] * len(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _write(self, line: bytes) -> None:
+        if self._file is None or self._pid != os.getpid():
+            # After a fork the inherited handle still points at the parent's file.
+            self._file = None
+            self._open()
+        self._file.write(line)  # type: ignore[union-attr]
+        self._size += len(line)
+
+    def _open(self) -> None:
+        self._pid = os.getpid()
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _close(self) -> None:
+        file, self._file = self._file, None
+        if file is not None and self._pid == os.getpid():
+            file.close()
+
+    def _rotate(self) -> None:
+        self._close()
+        path = self.path
+        stem = path[:-len(ACTIVE_SUFFIX)]
+        # Names must sort in rotation order even when several rotations fall in one millisecond.
+        rotated_ms = max(time.time_ns() // 1_000_000, self._rotated_ms + 1)
+        self._rotated_ms = rotated_ms
+        os.replace(path, f"{stem}-{rotated_ms}{ACTIVE_SUFFIX}")
+        self._prune()
+
+    def _prune(self) -> None:
+        rotated = sorted(
+            glob.glob(os.path.join(self.directory, f"events-{os.getpid()}-*{ACTIVE_SUFFIX}")),
+            key=_rotation_time,
+        )
+        for path in rotated[:max(0, len(rotated) - self.backups)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Cannot remove rotated event file {path}: {e}")
+
+
+def _rotation_time(path: str) -> int:
+    try:
+        return int(os.path.basename(path)[:-len(ACTIVE_SUFFIX)].rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return 0
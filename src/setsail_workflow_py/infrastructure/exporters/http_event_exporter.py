@@ -0,0 +1,9 @@
+from typing import List
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, ExportItem
+from setsail_workflow_py.infrastructure.http.post_client import PostClient
+
+
+class HttpEventExporter(EventExporter):
+
+    async def export(self, batch: List[ExportItem]) -> List[bool]:
+        return await PostClient.post_events(batch)
@@ -0,0 +1,29 @@
+import threading
+from typing import Any, Dict, List
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, ExportItem
+
+
+class InMemoryEventExporter(EventExporter):
+    # Keeps every exported event; meant for tests and local debugging.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: List[ExportItem] = []
+
+    async def export(self, batch: List[ExportItem]) -> List[bool]:
+        with self._lock:
+            self._items.extend(batch)
+        return [True] * len(batch)
+
+    @property
+    def records(self) -> List[WorkflowEventRecord]:
+        with self._lock:
+            return [record for _, record in self._items]
+
+    def events(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self.records]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items = []
@@ -0,0 +1,21 @@
+import sys
+import threading
+from typing import BinaryIO, List, Optional
+from setsail_workflow_py.infrastructure.exporters.event_exporter import EventExporter, ExportItem
+from setsail_workflow_py.shared.json_codec import dumps
+
+
+class StreamEventExporter(EventExporter):
+    # One JSON event per line; defaults to the process's stdout.
+
+    def __init__(self, stream: Optional[BinaryIO] = None):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    async def export(self, batch: List[ExportItem]) -> List[bool]:
+        data = b"".join(dumps(record.to_dict()) + b"\n" for _, record in batch)
+        stream = self._stream or sys.stdout.buffer
+        with self._lock:
+            stream.write(data)
+            stream.flush()
+        return [True] * len(batch)
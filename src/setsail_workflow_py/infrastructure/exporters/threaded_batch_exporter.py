@@ -0,0 +1,153 @@
+import os
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.event_buffer import EventBuffer
+from setsail_workflow_py.infrastructure.exporters.event_exporter import ExportItem
+from setsail_workflow_py.shared.event_loss import EXPORT_ERROR, SHUTDOWN, EventLoss
+from setsail_workflow_py.shared.self_metrics import EVENTS_FAILED, SelfMetrics
+from setsail_workflow_py.shared.settings import get_settings
+
+SyncBatchSink = Callable[[List[ExportItem]], List[bool]]
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_SCHEDULE_DELAY = 0.2
+
+
+class ThreadedBatchExporter:
+    # BatchEventExporter without asyncio: a daemon thread drains the queue into a blocking sink.
+    # For synchronous applications (Celery, batch jobs) that should never start an event loop.
+    _instance: Optional["ThreadedBatchExporter"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+            self,
+            sink: SyncBatchSink,
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            schedule_delay: float = DEFAULT_SCHEDULE_DELAY,
+            on_close: Optional[Callable[[], None]] = None,
+            buffer: Optional[EventBuffer] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self._sink = sink
+        self._max_batch_size = max_batch_size
+        self._schedule_delay = schedule_delay
+        self._on_close = on_close
+        self._queue = buffer if buffer is not None else EventBuffer()
+        self._flush_waiters: Deque[threading.Event] = deque()
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown = False
+
+    @classmethod
+    def get(cls) -> "ThreadedBatchExporter":
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from setsail_workflow_py.infrastructure.http.sync_post_client import SyncPostClient
+                    settings = get_settings()
+                    client = SyncPostClient()
+                    cls._instance = cls(
+                        client.post_events, settings.batch_size, settings.batch_delay, client.close, EventBuffer.from_settings(settings)
+                    )
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def initialized(cls) -> bool:
+        return cls._instance is not None
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The exporter thread does not survive fork(); the child starts empty with a thread of its own.
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._queue.bytes
+
+    def export(self, config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> None:
+        if self._shutdown:
+            EventLoss.record(SHUTDOWN)
+            if config.log_enabled:
+                logger.warning(f"Exporter is shut down, dropping event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}")
+            return
+
+        if not self._queue.put((config, record), block=threading.current_thread() is not self._thread):
+            return
+        if self._thread is None:
+            self._start()
+        elif len(self._queue) % self._max_batch_size == 0:
+            self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        if self._thread is None:
+            return not self._queue
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("flush() cannot be called from the exporter thread")
+        done = threading.Event()
+        self._flush_waiters.append(done)
+        self._wakeup.set()
+        return done.wait(timeout) and not self._queue
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> bool:
+        if self._shutdown:
+            return not self._queue
+        self._shutdown = True
+        thread = self._thread
+        if thread is not None:
+            self._wakeup.set()
+            thread.join(timeout)
+            if thread.is_alive():
+                return False
+        if self._on_close is not None:
+            self._on_close()
+        return not self._queue
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            thread = threading.Thread(target=self._run, name="setsail-workflow-exporter", daemon=True)
+            thread.start()
+            self._thread = thread
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self._schedule_delay)
+            self._wakeup.clear()
+            waiters = []
+            while self._flush_waiters:
+                waiters.append(self._flush_waiters.popleft())
+            self._export_pending()
+            for waiter in waiters:
+                waiter.set()
+            if self._shutdown and not self._queue:
+                return
+
+    def _export_pending(self) -> None:
+        while self._queue:
+            batch = self._queue.take(self._max_batch_size)
+            try:
+                for _, record in batch:
+                    record.materialize()
+                SelfMetrics.record_batch(len(batch), self._sink(batch))
+            except Exception as e:
+                SelfMetrics.incr(EVENTS_FAILED, len(batch))
+                EventLoss.record(EXPORT_ERROR, len(batch))
+                logger.error(f"Error exporting batch of {len(batch)} events: {e}")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ThreadedBatchExporter._reset_after_fork)
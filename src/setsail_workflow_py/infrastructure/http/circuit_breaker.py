@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from loguru import logger
+from yarl import URL
+
+EndpointKey = Tuple[str, str, Optional[int]]
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    _lock = threading.Lock()
+    _breakers: Dict[EndpointKey, "CircuitBreaker"] = {}
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be >= 1, got {failure_threshold}")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        # Shared by the monitoring loop thread and the thread exporter.
+        self._state_lock = threading.Lock()
+
+    @classmethod
+    def for_url(cls, url: str, failure_threshold: int, reset_timeout: float) -> "CircuitBreaker":
+        parsed = URL(url)
+        key: EndpointKey = (parsed.scheme, parsed.host or "", parsed.port)
+        breaker = cls._breakers.get(key)
+        if breaker is None:
+            with cls._lock:
+                breaker = cls._breakers.get(key)
+                if breaker is None:
+                    breaker = cls(f"{parsed.scheme}://{parsed.host}:{parsed.port}", failure_threshold, reset_timeout)
+                    cls._breakers[key] = breaker
+        return breaker
+
+    @classmethod
+    def reset_all(cls) -> None:
+        with cls._lock:
+            cls._breakers = {}
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # Endpoint health is re-learned per process.
+        cls._lock = threading.Lock()
+        cls._breakers = {}
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        with self._state_lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == OPEN:
+                return False
+            # Half-open: let exactly one probe through; everything else keeps failing fast until it returns.
+            if self._probe_in_flight:
+                return False
+            self._state = HALF_OPEN
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._state_lock:
+            if self._state != CLOSED:
+                logger.info(f"Monitoring endpoint {self.name} recovered, closing circuit")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._state_lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(f"Monitoring endpoint {self.name} failed {self._failures} times, opening circuit for {self.reset_timeout}s")
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        # The request was abandoned (cancelled at shutdown) without telling anything about the endpoint.
+        # Without this a cancelled probe would keep the circuit open for the rest of the process.
+        with self._state_lock:
+            self._probe_in_flight = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=CircuitBreaker._reset_after_fork)
@@ -0,0 +1,118 @@
+import hashlib
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+from setsail_workflow_py.infrastructure.exporters.event_exporter import ExportItem
+from setsail_workflow_py.infrastructure.spool.event_spool import EventSpool, SpoolEntry
+from setsail_workflow_py.shared.json_codec import dumps
+from setsail_workflow_py.shared.settings import MonitoringSettings
+
+# Shared by the asyncio PostClient and the thread-based SyncPostClient.
+
+BULK_TRANSPORT = "bulk"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+# Answers meaning "this endpoint does not take bulk bodies" rather than "this event is bad".
+BULK_UNSUPPORTED_STATUSES = {404, 405, 406, 415, 501}
+
+GroupKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Never written to the spool; replayed events get them back from memory or from the settings.
+CREDENTIAL_HEADERS = {"x-api-key", "authorization"}
+MAX_SPOOLED_CREDENTIALS = 1024
+_spooled_credentials: Dict[str, Dict[str, str]] = {}
+
+
+def is_retryable(status: Optional[int]) -> bool:
+    # None means the request never got a response (connection refused, timeout, DNS).
+    return status is None or status == 429 or status >= 500
+
+
+def backoff(attempt: int, settings: MonitoringSettings) -> float:
+    # Full jitter: spreads retries from many workers instead of synchronising them on the backend.
+    return random.uniform(0, min(settings.retry_backoff_max, settings.retry_backoff * (2 ** attempt)))
+
+
+def group_by_endpoint(batch: List[ExportItem]) -> List[List[int]]:
+    # One bulk request per endpoint and credentials; a batch normally has a single group.
+    groups: Dict[GroupKey, List[int]] = {}
+    for index, (config, _) in enumerate(batch):
+        groups.setdefault((str(config.post_url), tuple(sorted(config.headers.items()))), []).append(index)
+    return list(groups.values())
+
+
+def bulk_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    bulk = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+    bulk["Content-Type"] = NDJSON_CONTENT_TYPE
+    bulk["Content-Encoding"] = "gzip"
+    return bulk
+
+
+def ndjson_chunks(batch: List[ExportItem], indexes: List[int], max_bytes: int) -> List[Tuple[List[int], bytes]]:
+    return _ndjson_chunks(((index, batch[index][1].to_dict()) for index in indexes), max_bytes)
+
+
+def spooled_ndjson_chunks(entries: List[SpoolEntry], indexes: List[int], max_bytes: int) -> List[Tuple[List[int], bytes]]:
+    return _ndjson_chunks(((index, entries[index]["body"]) for index in indexes), max_bytes)
+
+
+def group_spooled(entries: List[SpoolEntry], settings: MonitoringSettings) -> List[Tuple[str, Dict[str, str], List[int]]]:
+    # Replay counterpart of group_by_endpoint, keyed on the headers the entries are sent with.
+    groups: Dict[GroupKey, Tuple[str, Dict[str, str], List[int]]] = {}
+    for index, entry in enumerate(entries):
+        headers = replay_headers(entry, settings)
+        groups.setdefault((entry["url"], tuple(sorted(headers.items()))), (entry["url"], headers, []))[2].append(index)
+    return list(groups.values())
+
+
+def spool_events(items: List[ExportItem]) -> None:
+    # Blocking file I/O: the asyncio client calls this through an executor.
+    event_spool = EventSpool.get()
+    if event_spool is None:
+        return
+    written = event_spool.append([_spool_entry(config.headers, str(config.post_url), record.to_dict()) for config, record in items])
+    config, record = items[0]
+    if written and config.log_enabled:
+        logger.info(f"Spooled {written} events for replay, traceId: {config.traceId}, spanId: {record.spanId}")
+
+
+def replay_headers(entry: SpoolEntry, settings: MonitoringSettings) -> Dict[str, str]:
+    headers = dict(entry["headers"])
+    credentials = _spooled_credentials.get(entry.get("keyId", ""))
+    if credentials is not None:
+        headers.update(credentials)
+    elif settings.api_key and not any(k.lower() in CREDENTIAL_HEADERS for k in headers):
+        # Spooled by an earlier process: only the configured key can be restored.
+        headers["x-api-key"] = settings.api_key
+    return headers
+
+
+def _ndjson_chunks(bodies: Iterable[Tuple[int, Dict[str, Any]]], max_bytes: int) -> List[Tuple[List[int], bytes]]:
+    # An event larger than max_bytes still goes out, alone in its own chunk.
+    chunks: List[Tuple[List[int], bytes]] = []
+    chunk: List[int] = []
+    lines: List[bytes] = []
+    size = 0
+    for index, body in bodies:
+        line = dumps(body) + b"\n"
+        if chunk and size + len(line) > max_bytes:
+            chunks.append((chunk, b"".join(lines)))
+            chunk, lines, size = [], [], 0
+        chunk.append(index)
+        lines.append(line)
+        size += len(line)
+    if chunk:
+        chunks.append((chunk, b"".join(lines)))
+    return chunks
+
+
+def _spool_entry(headers: Dict[str, str], url: str, body: dict) -> SpoolEntry:
+    plain = {k: v for k, v in headers.items() if k.lower() not in CREDENTIAL_HEADERS}
+    entry: SpoolEntry = {"url": url, "headers": plain, "body": body}
+    if len(plain) != len(headers):
+        credentials = {k: v for k, v in headers.items() if k.lower() in CREDENTIAL_HEADERS}
+        key_id = hashlib.blake2b(dumps(sorted(credentials.items())), digest_size=8).hexdigest()
+        if key_id not in _spooled_credentials and len(_spooled_credentials) >= MAX_SPOOLED_CREDENTIALS:
+            _spooled_credentials.clear()
+        _spooled_credentials[key_id] = credentials
+        entry["keyId"] = key_id
+    return entry
@@ -1,34 +1,230 @@
-import aiohttp
+import asyncio
+import gzip
+from typing import Dict, List, Optional, Set
 from loguru import logger
-from setsail_workflow_py.domain.events.value_object.workflow_event import WorkflowPayload
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
 from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.event_exporter import ExportItem
+from setsail_workflow_py.infrastructure.http.circuit_breaker import CircuitBreaker, CircuitOpenError
+from setsail_workflow_py.infrastructure.http.delivery import (
+    BULK_TRANSPORT, BULK_UNSUPPORTED_STATUSES, backoff, bulk_headers, group_by_endpoint, group_spooled, is_retryable, ndjson_chunks, replay_headers,
+    spool_events, spooled_ndjson_chunks,
+)
+from setsail_workflow_py.infrastructure.http.session_pool import SessionPool
+from setsail_workflow_py.infrastructure.spool.event_spool import EventSpool, SpoolEntry
+from setsail_workflow_py.shared.clock import get_clock
+from setsail_workflow_py.shared.json_codec import dumps
+from setsail_workflow_py.shared.off_loop import run_off_loop
+from setsail_workflow_py.shared.self_metrics import POST_LATENCY_MS, SelfMetrics
+from setsail_workflow_py.shared.settings import get_settings
 
 
 class PostClient:
+    _replay_task: Optional[asyncio.Task] = None
+    _bulk_unsupported: Set[str] = set()
 
     @staticmethod
-    async def post_event(config: WorkflowMonitoringConfig, payload: WorkflowPayload) -> None:
-        if not isinstance(config, WorkflowMonitoringConfig) or not isinstance(payload, WorkflowPayload):
+    async def post_event(config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> bool:
+        if not isinstance(config, WorkflowMonitoringConfig) or not isinstance(record, WorkflowEventRecord):
             if config.log_enabled:
                 logger.warning("Invalid config or payload. Skipping post event.")
-            return
+            return False
 
+        url = str(config.post_url)
+        status = None
         try:
-            timeout = aiohttp.ClientTimeout(total=3)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                        url=str(config.post_url),
-                        json=payload.model_dump(mode="json", exclude_none=True),
-                        headers=config.headers
-                ) as response:
-                    if response.status == 200:
-                        if config.log_enabled:
-                            logger.success(f"Posted event successfully: {payload.event.eventType}, traceId: {config.traceId}, spanId: {config.spanId}")
-                    else:
-                        if config.log_enabled:
-                            logger.error(f"Failed to post event: {payload.event.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, status: {response.status}")
+            status = await PostClient._deliver(url, config.headers, dumps(record.to_dict()))
+            if status == 200:
+                if config.log_enabled:
+                    logger.success(f"Posted event successfully: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}")
+                PostClient._replay_spool_soon()
+                return True
+            if config.log_enabled:
+                logger.error(f"Failed to post event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, status: {status}")
+        except CircuitOpenError as e:
+            if config.log_enabled:
+                logger.warning(f"Skipped posting event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, {e}")
         except Exception as e:
             if config.log_enabled:
-                logger.error(f"Error posting event: {payload.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, error: {str(e)}")
+                logger.error(f"Error posting event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, error: {str(e)}")
                 logger.debug(f"Error details: {e}")
-                logger.debug(f"Payload: {payload.model_dump(mode='json', exclude_none=True)}")
+                logger.debug(f"Payload: {record.to_dict()}")
+
+        if is_retryable(status):
+            await _spool([(config, record)])
+        return False
+
+    @staticmethod
+    async def post_events(batch: List[ExportItem]) -> List[bool]:
+        if get_settings().transport != BULK_TRANSPORT:
+            return await asyncio.gather(*(PostClient.post_event(config, record) for config, record in batch))
+
+        results = [False] * len(batch)
+        await asyncio.gather(*(PostClient._post_bulk(batch, indexes, results) for indexes in group_by_endpoint(batch)))
+        return results
+
+    @staticmethod
+    async def _post_bulk(batch: List[ExportItem], indexes: List[int], results: List[bool]) -> None:
+        settings = get_settings()
+        config = batch[indexes[0]][0]
+        url = str(config.post_url)
+        for chunk, body in ndjson_chunks(batch, indexes, settings.bulk_max_bytes):
+            if url in PostClient._bulk_unsupported:
+                await PostClient._post_singly(batch, chunk, results)
+                continue
+
+            status = None
+            try:
+                compressed = await _compress(body, settings.gzip_level)
+                status = await PostClient._deliver(url, bulk_headers(config.headers), compressed)
+            except CircuitOpenError as e:
+                if config.log_enabled:
+                    logger.warning(f"Skipped posting {len(chunk)} events in bulk, {e}")
+            except Exception as e:
+                if config.log_enabled:
+                    logger.error(f"Error posting {len(chunk)} events in bulk to {url}: {e}")
+
+            if status == 200:
+                for index in chunk:
+                    results[index] = True
+                if config.log_enabled:
+                    logger.success(f"Posted {len(chunk)} events in bulk ({len(body)} bytes, {len(compressed)} gzipped), traceId: {config.traceId}")
+                PostClient._replay_spool_soon()
+            elif is_retryable(status):
+                await _spool([batch[index] for index in chunk])
+            else:
+                if status in BULK_UNSUPPORTED_STATUSES:
+                    logger.warning(f"{url} does not accept bulk events (status {status}), falling back to single-event posts")
+                    PostClient._bulk_unsupported.add(url)
+                elif config.log_enabled:
+                    logger.error(f"Bulk post to {url} rejected with status {status}, retrying events one by one")
+                await PostClient._post_singly(batch, chunk, results)
+
+    @staticmethod
+    async def _post_singly(batch: List[ExportItem], chunk: List[int], results: List[bool]) -> None:
+        sent = await asyncio.gather(*(PostClient.post_event(*batch[index]) for index in chunk))
+        for index, ok in zip(chunk, sent):
+            results[index] = ok
+
+    @staticmethod
+    async def _deliver(url: str, headers: Dict[str, str], body: bytes) -> int:
+        settings = get_settings()
+        breaker = CircuitBreaker.for_url(url, settings.breaker_threshold, settings.breaker_reset_timeout)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                # Fail fast instead of waiting out the request timeout against a backend known to be down.
+                raise CircuitOpenError(f"circuit open for {breaker.name}")
+            try:
+                status = await PostClient._send(url, headers, body)
+            except Exception:
+                breaker.record_failure()
+                if attempt >= settings.retry_attempts:
+                    raise
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if not is_retryable(status):
+                    # Any answer other than 429/5xx means the endpoint itself is healthy.
+                    breaker.record_success()
+                    return status
+                breaker.record_failure()
+                if attempt >= settings.retry_attempts:
+                    return status
+            await asyncio.sleep(backoff(attempt, settings))
+            attempt += 1
+
+    @staticmethod
+    async def _send(url: str, headers: Dict[str, str], body: bytes) -> int:
+        session = await SessionPool.acquire(url)
+        started_ns = get_clock().monotonic_ns()
+        async with session.post(url=url, data=body, headers=headers) as response:
+            # Drain the body so the connection goes back to the pool for keep-alive reuse.
+            await response.read()
+            SelfMetrics.observe(POST_LATENCY_MS, (get_clock().monotonic_ns() - started_ns) / 1_000_000)
+            return response.status
+
+    @staticmethod
+    async def _post_spooled(entry: SpoolEntry) -> bool:
+        try:
+            status = await PostClient._deliver(entry["url"], replay_headers(entry, get_settings()), dumps(entry["body"]))
+        except Exception as e:
+            logger.debug(f"Error replaying spooled event: {e}")
+            return False
+        if status != 200 and not is_retryable(status):
+            # The backend rejected the event itself; spooling it again would not change that.
+            logger.warning(f"Dropping spooled event rejected by the backend, status: {status}")
+        return status == 200 or not is_retryable(status)
+
+    @staticmethod
+    async def _replay_batch(entries: List[SpoolEntry]) -> List[bool]:
+        settings = get_settings()
+        results = [False] * len(entries)
+        if settings.transport != BULK_TRANSPORT:
+            await PostClient._replay_singly(entries, list(range(len(entries))), results)
+            return results
+        await asyncio.gather(*(PostClient._replay_bulk(entries, url, headers, indexes, results) for url, headers, indexes in group_spooled(entries, settings)))
+        return results
+
+    @staticmethod
+    async def _replay_bulk(entries: List[SpoolEntry], url: str, headers: Dict[str, str], indexes: List[int], results: List[bool]) -> None:
+        settings = get_settings()
+        for chunk, body in spooled_ndjson_chunks(entries, indexes, settings.bulk_max_bytes):
+            if url in PostClient._bulk_unsupported:
+                await PostClient._replay_singly(entries, chunk, results)
+                continue
+            try:
+                status = await PostClient._deliver(url, bulk_headers(headers), await _compress(body, settings.gzip_level))
+            except Exception as e:
+                logger.debug(f"Error replaying {len(chunk)} spooled events in bulk: {e}")
+                return
+            if status == 200:
+                for index in chunk:
+                    results[index] = True
+            elif is_retryable(status):
+                # Still unreachable; the rest of the group stays spooled.
+                return
+            else:
+                if status in BULK_UNSUPPORTED_STATUSES:
+                    logger.warning(f"{url} does not accept bulk events (status {status}), falling back to single-event posts")
+                    PostClient._bulk_unsupported.add(url)
+                await PostClient._replay_singly(entries, chunk, results)
+
+    @staticmethod
+    async def _replay_singly(entries: List[SpoolEntry], chunk: List[int], results: List[bool]) -> None:
+        sent = await asyncio.gather(*(PostClient._post_spooled(entries[index]) for index in chunk))
+        for index, ok in zip(chunk, sent):
+            results[index] = ok
+
+    @staticmethod
+    def _replay_spool_soon() -> None:
+        # The backend just accepted an event: ship whatever was spooled while it was unreachable,
+        # including segments left by an earlier run of the process.
+        spool = EventSpool.get()
+        if spool is None or not spool.has_backlog:
+            return
+        task = PostClient._replay_task
+        if task is not None and not task.done():
+            return
+        PostClient._replay_task = asyncio.get_running_loop().create_task(PostClient._replay(spool))
+
+    @staticmethod
+    async def _replay(spool: EventSpool) -> None:
+        try:
+            replayed = await spool.replay(PostClient._replay_batch)
+        except Exception as e:
+            logger.error(f"Error replaying event spool {spool.directory}: {e}")
+            return
+        if replayed:
+            logger.info(f"Replayed {replayed} spooled events from {spool.directory}")
+
+
+async def _spool(items: List[ExportItem]) -> None:
+    # Writing and fsyncing segments must not stall the sends that are still going through.
+    await run_off_loop(spool_events, items)
+
+
+async def _compress(body: bytes, level: int) -> bytes:
+    # Compressing a megabyte takes milliseconds; keep it off the loop that does the network I/O.
+    return await run_off_loop(gzip.compress, body, level)
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import threading
+from typing import AsyncGenerator, Dict, Optional, Tuple
+import aiohttp
+from loguru import logger
+from yarl import URL
+from setsail_workflow_py.shared.settings import get_settings
+
+HostKey = Tuple[str, str, Optional[int]]
+
+DEFAULT_DNS_CACHE_TTL = 300
+
+
+class _LoopSessions:
+    def __init__(self) -> None:
+        self.sessions: Dict[HostKey, aiohttp.ClientSession] = {}
+        self.sentinel: Optional[AsyncGenerator[None, None]] = None
+
+    async def close(self) -> None:
+        sessions, self.sessions = list(self.sessions.values()), {}
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"Error closing monitoring HTTP session: {e}")
+
+
+class SessionPool:
+    _lock = threading.Lock()
+    _loops: Dict[asyncio.AbstractEventLoop, _LoopSessions] = {}
+
+    # None means "use the value from MonitoringSettings".
+    limit_per_host: Optional[int] = None
+    keepalive_timeout: Optional[float] = None
+    request_timeout: Optional[float] = None
+
+    @classmethod
+    def configure(
+            cls,
+            limit_per_host: Optional[int] = None,
+            keepalive_timeout: Optional[float] = None,
+            request_timeout: Optional[float] = None,
+    ) -> None:
+        # Applies to sessions created afterwards; existing connections keep their settings.
+        if limit_per_host is not None:
+            cls.limit_per_host = limit_per_host
+        if keepalive_timeout is not None:
+            cls.keepalive_timeout = keepalive_timeout
+        if request_timeout is not None:
+            cls.request_timeout = request_timeout
+
+    @classmethod
+    async def acquire(cls, url: str) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        entry = cls._loops.get(loop)
+        if entry is None:
+            entry = await cls._register_loop(loop)
+
+        parsed = URL(url)
+        key: HostKey = (parsed.scheme, parsed.host or "", parsed.port)
+        session = entry.sessions.get(key)
+        if session is None or session.closed:
+            settings = get_settings()
+            connector = aiohttp.TCPConnector(
+                limit_per_host=_first(cls.limit_per_host, settings.pool_limit_per_host),
+                keepalive_timeout=_first(cls.keepalive_timeout, settings.keepalive_timeout),
+                ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=_first(cls.request_timeout, settings.request_timeout)),
+            )
+            entry.sessions[key] = session
+        return session
+
+    @classmethod
+    async def close(cls) -> None:
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            entry = cls._loops.pop(loop, None)
+        if entry is not None:
+            await entry.close()
+
+    @classmethod
+    async def _register_loop(cls, loop: asyncio.AbstractEventLoop) -> _LoopSessions:
+        with cls._lock:
+            for other in [other for other in cls._loops if other.is_closed()]:
+                # Loops closed without shutdown_asyncgens() leave their transports behind; just forget them.
+                del cls._loops[other]
+            entry = cls._loops.get(loop)
+            if entry is not None:
+                return entry
+            entry = _LoopSessions()
+            cls._loops[loop] = entry
+
+        # The loop finalizes registered async generators on shutdown (asyncio.run does this),
+        # which gives us a hook to close the pooled sessions while the loop can still run them.
+        entry.sentinel = cls._close_on_loop_shutdown(loop, entry)
+        await entry.sentinel.__anext__()
+        return entry
+
+    @classmethod
+    async def _close_on_loop_shutdown(cls, loop: asyncio.AbstractEventLoop, entry: _LoopSessions) -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            with cls._lock:
+                if cls._loops.get(loop) is entry:
+                    del cls._loops[loop]
+            await entry.close()
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # Pooled sockets are shared with the parent after fork(); the child must open its own.
+        cls._lock = threading.Lock()
+        cls._loops = {}
+
+
+def _first(override, default):
+    return default if override is None else override
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SessionPool._reset_after_fork)
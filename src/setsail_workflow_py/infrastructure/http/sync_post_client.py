@@ -0,0 +1,248 @@
+import gzip
+import http.client
+import ssl
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from loguru import logger
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.event_exporter import ExportItem
+from setsail_workflow_py.infrastructure.http.circuit_breaker import CircuitBreaker, CircuitOpenError
+from setsail_workflow_py.infrastructure.http.delivery import (
+    BULK_TRANSPORT, BULK_UNSUPPORTED_STATUSES, backoff, bulk_headers, group_by_endpoint, group_spooled, is_retryable, ndjson_chunks, replay_headers,
+    spool_events, spooled_ndjson_chunks,
+)
+from setsail_workflow_py.infrastructure.spool.event_spool import EventSpool, SpoolEntry
+from setsail_workflow_py.shared.clock import get_clock
+from setsail_workflow_py.shared.json_codec import dumps
+from setsail_workflow_py.shared.self_metrics import POST_LATENCY_MS, SelfMetrics
+from setsail_workflow_py.shared.settings import get_settings
+
+HostKey = Tuple[str, str, Optional[int]]
+
+
+class _Connection:
+    __slots__ = ("http", "last_used")
+
+    def __init__(self, connection: http.client.HTTPConnection) -> None:
+        self.http = connection
+        self.last_used = time.monotonic()
+
+
+class SyncPostClient:
+    # Blocking counterpart of PostClient for the ThreadedBatchExporter: one persistent
+    # http.client connection per host, used only from the exporter's own thread.
+
+    def __init__(self) -> None:
+        self._connections: Dict[HostKey, _Connection] = {}
+        self._bulk_unsupported: Set[str] = set()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    def post_events(self, batch: List[ExportItem]) -> List[bool]:
+        if get_settings().transport != BULK_TRANSPORT:
+            return [self.post_event(config, record) for config, record in batch]
+        results = [False] * len(batch)
+        for indexes in group_by_endpoint(batch):
+            self._post_bulk(batch, indexes, results)
+        return results
+
+    def post_event(self, config: WorkflowMonitoringConfig, record: WorkflowEventRecord) -> bool:
+        url = str(config.post_url)
+        status = None
+        try:
+            status = self._deliver(url, config.headers, dumps(record.to_dict()))
+            if status == 200:
+                if config.log_enabled:
+                    logger.success(f"Posted event successfully: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}")
+                self._replay_spool()
+                return True
+            if config.log_enabled:
+                logger.error(f"Failed to post event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, status: {status}")
+        except CircuitOpenError as e:
+            if config.log_enabled:
+                logger.warning(f"Skipped posting event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, {e}")
+        except Exception as e:
+            if config.log_enabled:
+                logger.error(f"Error posting event: {record.eventType}, traceId: {config.traceId}, spanId: {config.spanId}, error: {str(e)}")
+
+        if is_retryable(status):
+            spool_events([(config, record)])
+        return False
+
+    def close(self) -> None:
+        connections, self._connections = self._connections, {}
+        for connection in connections.values():
+            connection.http.close()
+
+    def _post_bulk(self, batch: List[ExportItem], indexes: List[int], results: List[bool]) -> None:
+        settings = get_settings()
+        config = batch[indexes[0]][0]
+        url = str(config.post_url)
+        for chunk, body in ndjson_chunks(batch, indexes, settings.bulk_max_bytes):
+            if url in self._bulk_unsupported:
+                self._post_singly(batch, chunk, results)
+                continue
+
+            status = None
+            try:
+                status = self._deliver(url, bulk_headers(config.headers), gzip.compress(body, settings.gzip_level))
+            except CircuitOpenError as e:
+                if config.log_enabled:
+                    logger.warning(f"Skipped posting {len(chunk)} events in bulk, {e}")
+            except Exception as e:
+                if config.log_enabled:
+                    logger.error(f"Error posting {len(chunk)} events in bulk to {url}: {e}")
+
+            if status == 200:
+                for index in chunk:
+                    results[index] = True
+                self._replay_spool()
+            elif is_retryable(status):
+                spool_events([batch[index] for index in chunk])
+            else:
+                if status in BULK_UNSUPPORTED_STATUSES:
+                    logger.warning(f"{url} does not accept bulk events (status {status}), falling back to single-event posts")
+                    self._bulk_unsupported.add(url)
+                self._post_singly(batch, chunk, results)
+
+    def _post_singly(self, batch: List[ExportItem], chunk: List[int], results: List[bool]) -> None:
+        for index in chunk:
+            results[index] = self.post_event(*batch[index])
+
+    def _deliver(self, url: str, headers: Dict[str, str], body: bytes) -> int:
+        settings = get_settings()
+        breaker = CircuitBreaker.for_url(url, settings.breaker_threshold, settings.breaker_reset_timeout)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"circuit open for {breaker.name}")
+            try:
+                status = self._send(url, headers, body)
+            except Exception:
+                breaker.record_failure()
+                if attempt >= settings.retry_attempts:
+                    raise
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if not is_retryable(status):
+                    breaker.record_success()
+                    return status
+                breaker.record_failure()
+                if attempt >= settings.retry_attempts:
+                    return status
+            time.sleep(backoff(attempt, settings))
+            attempt += 1
+
+    def _send(self, url: str, headers: Dict[str, str], body: bytes) -> int:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        key: HostKey = (parts.scheme, parts.hostname or "", parts.port)
+        connection = self._connection(key)
+        reused = connection.http.sock is not None
+        try:
+            status = self._request(connection, path, headers, body)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            connection.http.close()
+            if not reused:
+                raise
+            # The server closed the idle keep-alive connection under us; retry once on a fresh one.
+            status = self._request(connection, path, headers, body)
+        except Exception:
+            connection.http.close()
+            raise
+        connection.last_used = time.monotonic()
+        return status
+
+    @staticmethod
+    def _request(connection: _Connection, path: str, headers: Dict[str, str], body: bytes) -> int:
+        started_ns = get_clock().monotonic_ns()
+        connection.http.request("POST", path, body=body, headers=headers)
+        response = connection.http.getresponse()
+        # Drain the body so the connection can carry the next request.
+        response.read()
+        SelfMetrics.observe(POST_LATENCY_MS, (get_clock().monotonic_ns() - started_ns) / 1_000_000)
+        if response.will_close:
+            connection.http.close()
+        return response.status
+
+    def _connection(self, key: HostKey) -> _Connection:
+        settings = get_settings()
+        connection = self._connections.get(key)
+        if connection is not None and time.monotonic() - connection.last_used > settings.keepalive_timeout:
+            connection.http.close()
+            connection = None
+        if connection is None:
+            scheme, host, port = key
+            if scheme == "https":
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+                http_connection: http.client.HTTPConnection = http.client.HTTPSConnection(
+                    host, port, timeout=settings.request_timeout, context=self._ssl_context
+                )
+            else:
+                http_connection = http.client.HTTPConnection(host, port, timeout=settings.request_timeout)
+            connection = self._connections[key] = _Connection(http_connection)
+        return connection
+
+    def _replay_spool(self) -> None:
+        spool = EventSpool.get()
+        if spool is None or not spool.has_backlog:
+            return
+        try:
+            replayed = spool.replay_sync(self._replay_batch)
+        except Exception as e:
+            logger.error(f"Error replaying event spool {spool.directory}: {e}")
+            return
+        if replayed:
+            logger.info(f"Replayed {replayed} spooled events from {spool.directory}")
+
+    def _replay_batch(self, entries: List[SpoolEntry]) -> List[bool]:
+        settings = get_settings()
+        results = [False] * len(entries)
+        if settings.transport != BULK_TRANSPORT:
+            self._replay_singly(entries, list(range(len(entries))), results)
+            return results
+        for url, headers, indexes in group_spooled(entries, settings):
+            self._replay_bulk(entries, url, headers, indexes, results)
+        return results
+
+    def _replay_bulk(self, entries: List[SpoolEntry], url: str, headers: Dict[str, str], indexes: List[int], results: List[bool]) -> None:
+        settings = get_settings()
+        for chunk, body in spooled_ndjson_chunks(entries, indexes, settings.bulk_max_bytes):
+            if url in self._bulk_unsupported:
+                self._replay_singly(entries, chunk, results)
+                continue
+            try:
+                status = self._deliver(url, bulk_headers(headers), gzip.compress(body, settings.gzip_level))
+            except Exception as e:
+                logger.debug(f"Error replaying {len(chunk)} spooled events in bulk: {e}")
+                return
+            if status == 200:
+                for index in chunk:
+                    results[index] = True
+            elif is_retryable(status):
+                return
+            else:
+                if status in BULK_UNSUPPORTED_STATUSES:
+                    logger.warning(f"{url} does not accept bulk events (status {status}), falling back to single-event posts")
+                    self._bulk_unsupported.add(url)
+                self._replay_singly(entries, chunk, results)
+
+    def _replay_singly(self, entries: List[SpoolEntry], chunk: List[int], results: List[bool]) -> None:
+        for index in chunk:
+            results[index] = self._post_spooled(entries[index])
+
+    def _post_spooled(self, entry: SpoolEntry) -> bool:
+        try:
+            status = self._deliver(entry["url"], replay_headers(entry, get_settings()), dumps(entry["body"]))
+        except Exception as e:
+            logger.debug(f"Error replaying spooled event: {e}")
+            return False
+        if status != 200 and not is_retryable(status):
+            logger.warning(f"Dropping spooled event rejected by the backend, status: {status}")
+        return status == 200 or not is_retryable(status)
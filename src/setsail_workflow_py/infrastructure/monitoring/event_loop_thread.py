@@ -0,0 +1,115 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Callable, Coroutine, Optional
+from loguru import logger
+
+
+class EventLoopThread:
+    _instance: Optional["EventLoopThread"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, name: str = "setsail-workflow-monitor"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._shutdown_hooks: list = []
+
+    @classmethod
+    def get(cls) -> "EventLoopThread":
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The loop thread does not survive fork(); the child starts a fresh one on demand.
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._start()
+        return self._loop  # type: ignore[return-value]
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.get_ident() == self._thread.ident
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> None:
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        # Safe from any thread; the callback runs on the loop thread.
+        loop = self.loop
+        loop.call_soon_threadsafe(loop.call_later, delay, callback, *args)
+
+    def add_shutdown_hook(self, hook: Callable[[], Coroutine[Any, Any, Any]]) -> None:
+        self._shutdown_hooks.append(hook)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            if thread.is_alive():
+                try:
+                    asyncio.run_coroutine_threadsafe(self._run_shutdown_hooks(), loop).result(timeout)
+                except Exception as e:
+                    logger.debug(f"Monitoring loop shutdown hooks did not complete: {e}")
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout)
+            self._loop = None
+            self._thread = None
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(target=self._run, args=(loop, ready), name=self._name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._thread = thread
+            self._loop = loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    async def _run_shutdown_hooks(self) -> None:
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.debug(f"Monitoring loop shutdown hook failed: {e}")
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=EventLoopThread._reset_after_fork)
@@ -0,0 +1,124 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from setsail_workflow_py.shared.lazy_logger import logger
+from setsail_workflow_py.shared.settings import get_settings
+
+StatsProvider = Callable[[], Dict[str, Any]]
+
+PREFIX = "setsail_workflow"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_QUANTILES = (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))
+
+
+def render_prometheus(stats: Dict[str, Any]) -> str:
+    events, pending = stats["events"], stats["pending"]
+    lines: List[str] = []
+    for name, key, help_text in (
+            ("events_emitted_total", "emitted", "Events produced by monitored steps."),
+            ("events_exported_total", "exported", "Events accepted by the exporter's destination."),
+            ("events_failed_total", "failed", "Events the destination did not accept (spooled or rejected)."),
+    ):
+        _metric(lines, name, "counter", help_text, [("", events[key])])
+    _metric(
+        lines, "events_dropped_total", "counter", "Events shed by the library, by reason.",
+        [(f'{{reason="{reason}"}}', count) for reason, count in sorted(events["dropped_by_reason"].items())],
+    )
+    _metric(
+        lines, "pending_events", "gauge", "Events waiting to be exported.",
+        [('{queue="sends"}', pending["sends"]), ('{queue="buffer"}', pending["buffered"])],
+    )
+    _metric(lines, "buffer_bytes", "gauge", "Estimated size of the buffered events.", [("", pending["buffered_bytes"])])
+    _summary(lines, "post_latency_ms", "Latency of one request to the monitoring backend, in milliseconds.", stats["post_latency_ms"])
+    _summary(lines, "decorator_overhead_us", "Time spent by the decorators around a step, in microseconds.", stats["decorator_overhead_us"])
+    return "\n".join(lines) + "\n"
+
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+    for labels, value in samples:
+        lines.append(f"{PREFIX}_{name}{labels} {value}")
+
+
+def _summary(lines: List[str], name: str, help_text: str, summary: Dict[str, Optional[float]]) -> None:
+    samples = [(f'{{quantile="{quantile}"}}', summary[key]) for quantile, key in _QUANTILES if summary[key] is not None]
+    _metric(lines, name, "summary", help_text, samples)
+    count = summary["count"] or 0
+    lines.append(f"{PREFIX}_{name}_sum {(summary['mean'] or 0.0) * count}")
+    lines.append(f"{PREFIX}_{name}_count {count}")
+
+
+class MetricsServer:
+    # Serves stats() as Prometheus text on /metrics from a daemon thread.
+    _instance: Optional["MetricsServer"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, host: str, port: int, provider: StatsProvider):
+        server = self
+        self._provider = provider
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render_prometheus(server._provider()).encode("utf-8")
+                except Exception as e:
+                    logger.error(f"Error rendering monitoring metrics: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._http = ThreadingHTTPServer((host, port), Handler)
+        self._http.daemon_threads = True
+        self._thread = threading.Thread(target=self._http.serve_forever, name="setsail-workflow-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._http.server_address[1]
+
+    @classmethod
+    def start(cls, provider: StatsProvider, port: Optional[int] = None, host: Optional[str] = None) -> Optional["MetricsServer"]:
+        settings = get_settings()
+        port = settings.metrics_port if port is None else port
+        if port is None:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                try:
+                    cls._instance = cls(host or settings.metrics_host, port, provider)
+                except OSError as e:
+                    # Typically several workers of one server configured with the same port; the first one wins.
+                    logger.warning(f"Cannot serve monitoring metrics on port {port}: {e}")
+                    return None
+                logger.info(f"Serving workflow monitoring metrics on {cls._instance._http.server_address}/metrics")
+            return cls._instance
+
+    @classmethod
+    def stop(cls) -> None:
+        with cls._instance_lock:
+            instance, cls._instance = cls._instance, None
+        if instance is not None:
+            instance._http.shutdown()
+            instance._http.server_close()
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The serving thread stays with the parent; the child inherits only a listening socket it must not use.
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=MetricsServer._reset_after_fork)
@@ -0,0 +1,11 @@
+import threading
+from typing import Any, Callable
+
+
+class ThreadTimer:
+    # The EventLoopThread.call_later counterpart for the thread exporter, which never starts an event loop.
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        timer = threading.Timer(delay, callback, args)
+        timer.daemon = True
+        timer.start()
@@ -0,0 +1,356 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+from loguru import logger
+from setsail_workflow_py.shared.event_loss import OVERSIZED, SPOOL_ERROR, SPOOL_FULL, EventLoss
+from setsail_workflow_py.shared.json_codec import dumps, loads
+from setsail_workflow_py.shared.settings import get_settings
+
+# On disk a segment is a sequence of records: <u32 length><u32 crc32><length bytes of JSON>.
+# A torn or corrupt record (crash mid-write) ends the segment; everything before it is replayed.
+_HEADER = struct.Struct("<II")
+
+OPEN_SUFFIX = ".open"
+SEALED_SUFFIX = ".seg"
+CLAIMED_SUFFIX = ".replay"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_REPLAY_BATCH_SIZE = 64
+
+SpoolEntry = Dict[str, Any]
+ReplaySender = Callable[[List[SpoolEntry]], Awaitable[List[bool]]]
+SyncReplaySender = Callable[[List[SpoolEntry]], List[bool]]
+
+
+class EventSpool:
+    _instance: Optional["EventSpool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+            self,
+            directory: str,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+    ):
+        if segment_bytes < 1 or max_bytes < segment_bytes:
+            raise ValueError(f"Spool needs 1 <= segment_bytes <= max_bytes, got {segment_bytes} and {max_bytes}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_path: Optional[str] = None
+        self._file_size = 0
+        self._file_count = 0
+        # Entries per sealed segment written by this process, so shedding a segment does not re-read it.
+        self._counts: Dict[str, int] = {}
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._recover()
+        self._total_bytes = sum(size for _, size in self._segments(SEALED_SUFFIX))
+
+    @classmethod
+    def get(cls) -> Optional["EventSpool"]:
+        instance = cls._instance
+        if instance is None:
+            settings = get_settings()
+            if not settings.spool_dir:
+                return None
+            with cls._instance_lock:
+                if cls._instance is None:
+                    try:
+                        cls._instance = cls(settings.spool_dir, settings.spool_max_bytes, settings.spool_segment_bytes)
+                    except (OSError, ValueError) as e:
+                        logger.error(f"Event spool disabled, cannot open {settings.spool_dir}: {e}")
+                        return None
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def initialized(cls) -> bool:
+        return cls._instance is not None
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The parent owns its open segment; the child opens its own on first append.
+        instance = cls._instance
+        if instance is not None:
+            instance._lock = threading.Lock()
+            instance._file = None
+            instance._file_path = None
+            instance._file_size = 0
+            instance._file_count = 0
+        cls._instance_lock = threading.Lock()
+
+    @property
+    def has_backlog(self) -> bool:
+        return self._file_size > 0 or self._total_bytes > 0
+
+    def append(self, entries: List[SpoolEntry]) -> int:
+        written = 0
+        with self._lock:
+            for entry in entries:
+                data = dumps(entry)
+                record = _HEADER.pack(len(data), zlib.crc32(data)) + data
+                if len(record) > self.segment_bytes:
+                    self.dropped += 1
+                    EventLoss.record(OVERSIZED)
+                    logger.warning(f"Dropping event larger than a spool segment ({len(record)} bytes)")
+                    continue
+                try:
+                    if self._file is not None and self._file_size + len(record) > self.segment_bytes:
+                        self._seal()
+                    if self._file is None:
+                        self._open_segment()
+                    self._file.write(record)  # type: ignore[union-attr]
+                except OSError as e:
+                    self.dropped += len(entries) - written
+                    EventLoss.record(SPOOL_ERROR, len(entries) - written)
+                    logger.error(f"Error writing to event spool {self.directory}: {e}")
+                    break
+                self._file_size += len(record)
+                self._file_count += 1
+                written += 1
+            if self._file is not None:
+                try:
+                    self._file.flush()
+                except OSError as e:
+                    logger.error(f"Error flushing event spool {self.directory}: {e}")
+        return written
+
+    def seal(self) -> None:
+        with self._lock:
+            self._seal()
+
+    async def replay(self, sender: ReplaySender, batch_size: int = DEFAULT_REPLAY_BATCH_SIZE) -> int:
+        # Claiming, reading and re-spooling segments is file I/O; it runs in a worker thread so the
+        # loop keeps sending live events meanwhile.
+        loop = asyncio.get_running_loop()
+        steps = self._replay_steps(batch_size)
+        done, value = await loop.run_in_executor(None, _advance, steps, None)
+        while not done:
+            try:
+                results = await sender(value)
+            except Exception as e:
+                logger.error(f"Error replaying spooled events: {e}")
+                results = [False] * len(value)
+            done, value = await loop.run_in_executor(None, _advance, steps, results)
+        return value
+
+    def replay_sync(self, sender: SyncReplaySender, batch_size: int = DEFAULT_REPLAY_BATCH_SIZE) -> int:
+        steps = self._replay_steps(batch_size)
+        try:
+            batch = next(steps)
+            while True:
+                try:
+                    results = sender(batch)
+                except Exception as e:
+                    logger.error(f"Error replaying spooled events: {e}")
+                    results = [False] * len(batch)
+                batch = steps.send(results)
+        except StopIteration as done:
+            return done.value
+
+    def _replay_steps(self, batch_size: int) -> Generator[List[SpoolEntry], List[bool], int]:
+        # Yields each batch to send and receives its results, so asyncio and thread-based senders share it.
+        self.seal()
+        replayed = 0
+        for path, _ in self._segments(SEALED_SUFFIX):
+            claimed = self._claim(path)
+            if claimed is None:
+                continue
+            count = self._counts.pop(path, None)
+            failed: List[SpoolEntry] = []
+            batch_sent = False
+            stop = False
+            for batch in _batched(_read_segment(claimed), batch_size):
+                results = yield batch
+                if not any(results) and not batch_sent:
+                    # The backend is still unreachable; leave the segment for the next attempt.
+                    stop = True
+                    break
+                batch_sent = True
+                replayed += sum(1 for ok in results if ok)
+                failed.extend(entry for entry, ok in zip(batch, results) if not ok)
+            if stop:
+                self._release(claimed, path)
+                if count is not None:
+                    self._counts[path] = count
+                break
+            if failed:
+                self.append(failed)
+            self._remove(claimed)
+        with self._lock:
+            self._total_bytes = sum(size for _, size in self._segments(SEALED_SUFFIX))
+        return replayed
+
+    def _open_segment(self) -> None:
+        name = f"{time.time_ns():020d}-{os.getpid()}{OPEN_SUFFIX}"
+        path = os.path.join(self.directory, name)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        self._file = os.fdopen(fd, "ab")
+        self._file_path = path
+        self._file_size = 0
+
+    def _seal(self) -> None:
+        file, path = self._file, self._file_path
+        if file is None or path is None:
+            return
+        self._file = None
+        self._file_path = None
+        size, self._file_size = self._file_size, 0
+        count, self._file_count = self._file_count, 0
+        sealed = path[:-len(OPEN_SUFFIX)] + SEALED_SUFFIX
+        try:
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+            # The rename is atomic: a segment is either still open or complete and durable.
+            os.replace(path, sealed)
+        except OSError as e:
+            logger.error(f"Error sealing spool segment {path}: {e}")
+            return
+        self._counts[sealed] = count
+        self._total_bytes += size
+        self._enforce_limit()
+
+    def _enforce_limit(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        for path, size in self._segments(SEALED_SUFFIX):
+            if self._total_bytes <= self.max_bytes:
+                break
+            dropped = self._counts.pop(path, None)
+            if dropped is None:
+                # Left by an earlier process: counted once, only when it is shed.
+                dropped = sum(1 for _ in _read_segment(path))
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.dropped += dropped
+            EventLoss.record(SPOOL_FULL, dropped)
+            logger.warning(f"Event spool is over {self.max_bytes} bytes, dropped {dropped} oldest events")
+
+    def _claim(self, path: str) -> Optional[str]:
+        # Several processes may share the directory; the rename decides which one replays a segment.
+        claimed = f"{path}.{os.getpid()}{CLAIMED_SUFFIX}"
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            return None
+        return claimed
+
+    def _release(self, claimed: str, path: str) -> None:
+        try:
+            os.rename(claimed, path)
+        except OSError as e:
+            logger.error(f"Error releasing spool segment {claimed}: {e}")
+
+    def _remove(self, claimed: str) -> None:
+        try:
+            size = os.path.getsize(claimed)
+            os.remove(claimed)
+        except OSError as e:
+            logger.error(f"Error removing replayed spool segment {claimed}: {e}")
+            return
+        self._total_bytes = max(0, self._total_bytes - size)
+
+    def _recover(self) -> None:
+        # Segments left open or mid-replay by a process that is gone (crash, kill -9) become
+        # ordinary sealed segments; the reader tolerates their torn tail.
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(OPEN_SUFFIX):
+                owner = _pid_of(name.split("-", 1)[-1][:-len(OPEN_SUFFIX)])
+                if not _alive(owner):
+                    os.replace(path, path[:-len(OPEN_SUFFIX)] + SEALED_SUFFIX)
+            elif name.endswith(CLAIMED_SUFFIX):
+                original, _, owner = name[:-len(CLAIMED_SUFFIX)].rpartition(".")
+                if not _alive(_pid_of(owner)):
+                    os.replace(path, os.path.join(self.directory, original))
+
+    def _segments(self, suffix: str) -> List[Tuple[str, int]]:
+        segments = []
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith(suffix))
+        except OSError:
+            return segments
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                segments.append((path, os.path.getsize(path)))
+            except OSError:
+                continue
+        return segments
+
+
+def _read_segment(path: str) -> Iterator[SpoolEntry]:
+    try:
+        with open(path, "rb") as file:
+            while True:
+                header = file.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, crc = _HEADER.unpack(header)
+                data = file.read(length)
+                if len(data) < length or zlib.crc32(data) != crc:
+                    logger.warning(f"Spool segment {path} ends with a torn record, skipping the rest")
+                    return
+                try:
+                    yield loads(data)
+                except ValueError:
+                    logger.warning(f"Skipping undecodable record in spool segment {path}")
+    except OSError as e:
+        logger.error(f"Error reading spool segment {path}: {e}")
+
+
+def _advance(steps: Generator[List[SpoolEntry], List[bool], int], results: Optional[List[bool]]) -> Tuple[bool, Any]:
+    # StopIteration cannot cross a Future, so the end of the generator is returned as a flag.
+    try:
+        return False, next(steps) if results is None else steps.send(results)
+    except StopIteration as done:
+        return True, done.value
+
+
+def _batched(entries: Iterator[SpoolEntry], size: int) -> Iterator[List[SpoolEntry]]:
+    batch: List[SpoolEntry] = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _pid_of(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _alive(pid: Optional[int]) -> bool:
+    if pid is None:
+        return False
+    if pid == os.getpid():
+        # Recovery runs before this process opens a segment, so the file is from an earlier process.
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=EventSpool._reset_after_fork)
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Optional
+
+NS_PER_MS = 1_000_000
+# How often the wall-clock anchor is refreshed, so long-running processes follow NTP slewing.
+DEFAULT_REANCHOR_NS = 60 * 1_000_000_000
+# A re-anchor that moves the projection back by more than this is a system clock step, not drift.
+BACKWARD_STEP_NS = 1_000_000_000
+
+
+class Clock:
+    # Timestamps are projected from one (wall, perf_counter) anchor: they have perf_counter resolution,
+    # absorb small drift corrections without going backwards, follow real system clock steps at the next
+    # re-anchor instead of freezing until the clock catches up, and durations come straight from perf_counter.
+
+    def __init__(self, reanchor_ns: int = DEFAULT_REANCHOR_NS):
+        self.reanchor_ns = reanchor_ns
+        self._lock = threading.Lock()
+        self._last_wall_ns = 0
+        self._anchor()
+
+    def monotonic_ns(self) -> int:
+        return time.perf_counter_ns()
+
+    def wall_ns(self) -> int:
+        now = time.perf_counter_ns()
+        if now - self._anchor_perf_ns >= self.reanchor_ns:
+            with self._lock:
+                if now - self._anchor_perf_ns >= self.reanchor_ns:
+                    self._anchor()
+                    now = self._anchor_perf_ns
+                    # Drift: carry on from the last timestamp rather than stepping back.
+                    behind = self._last_wall_ns - self._anchor_wall_ns
+                    if 0 < behind <= BACKWARD_STEP_NS:
+                        self._anchor_wall_ns += behind
+        wall = self._anchor_wall_ns + (now - self._anchor_perf_ns)
+        last = self._last_wall_ns
+        # Threads racing a re-anchor may still see a slightly older projection; hold the last value.
+        if last - BACKWARD_STEP_NS <= wall < last:
+            return last
+        self._last_wall_ns = wall
+        return wall
+
+    def wall_ms(self) -> int:
+        return self.wall_ns() // NS_PER_MS
+
+    def _anchor(self) -> None:
+        self._anchor_wall_ns = time.time_ns()
+        self._anchor_perf_ns = time.perf_counter_ns()
+
+
+_clock: Optional[Clock] = None
+
+
+def get_clock() -> Clock:
+    global _clock
+    clock = _clock
+    if clock is None:
+        clock = _clock = Clock()
+    return clock
+
+
+def set_clock(clock: Optional[Clock]) -> None:
+    # Pass None to go back to the default clock.
+    global _clock
+    _clock = clock
@@ -0,0 +1,58 @@
+import os
+import threading
+from typing import Dict
+from setsail_workflow_py.shared.lazy_logger import logger
+
+QUEUE_FULL = "queue_full"
+BYTES_FULL = "bytes_full"
+DISPLACED = "displaced"
+BLOCK_TIMEOUT = "block_timeout"
+OVERSIZED = "oversized"
+SHUTDOWN = "shutdown"
+EXPORT_ERROR = "export_error"
+EMITTER_FULL = "emitter_full"
+SPOOL_FULL = "spool_full"
+SPOOL_ERROR = "spool_error"
+TAIL_TRACE_FULL = "tail_trace_full"
+TAIL_EVICTED = "tail_evicted"
+
+
+class EventLoss:
+    # Process-wide count of events shed by the library, by reason.
+    _lock = threading.Lock()
+    _dropped: Dict[str, int] = {}
+
+    @classmethod
+    def record(cls, reason: str, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with cls._lock:
+            before = cls._dropped.get(reason, 0)
+            total = cls._dropped[reason] = before + count
+        # Warn on the 1st, 10th, 100th... loss per reason, so an outage does not flood the log as well.
+        if len(str(before)) != len(str(total)) or before == 0:
+            logger.warning(f"Workflow monitoring dropped {total} events so far ({reason})")
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, int]:
+        with cls._lock:
+            return dict(cls._dropped)
+
+    @classmethod
+    def total(cls) -> int:
+        with cls._lock:
+            return sum(cls._dropped.values())
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._dropped = {}
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        cls._lock = threading.Lock()
+        cls._dropped = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=EventLoss._reset_after_fork)
@@ -0,0 +1,95 @@
+import math
+from typing import Dict, Iterable, Optional
+
+DEFAULT_GROWTH = 1.1
+DEFAULT_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class LogHistogram:
+    # Log-bucketed histogram: memory is bounded by the value range, not the sample count, relative
+    # error is about (growth - 1) / 2, and two histograms with the same growth merge by adding counts.
+    __slots__ = ("growth", "_log_growth", "buckets", "count", "total", "min", "max", "zero_count")
+
+    def __init__(self, growth: float = DEFAULT_GROWTH):
+        if growth <= 1.0:
+            raise ValueError(f"growth must be > 1, got {growth}")
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.zero_count = 0
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.floor(math.log(value) / self._log_growth)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "LogHistogram") -> None:
+        if other.growth != self.growth:
+            raise ValueError("cannot merge histograms with different growth factors")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = self.zero_count
+        if seen >= rank and self.zero_count:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to the observed range.
+                value = self.growth ** (index + 0.5)
+                return min(max(value, self.min), self.max)  # type: ignore[type-var]
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES, digits: int = 3) -> Dict[str, Optional[float]]:
+        result: Dict[str, Optional[float]] = {
+            "count": self.count,
+            "min": _round(self.min, digits),
+            "max": _round(self.max, digits),
+            "mean": _round(self.mean, digits),
+        }
+        for q in percentiles:
+            result[f"p{q * 100:g}"] = _round(self.percentile(q), digits)
+        return result
+
+    def to_dict(self) -> Dict[str, object]:
+        # Lossless form used when histograms are shipped to be merged elsewhere.
+        return {
+            "growth": self.growth,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "zeroCount": self.zero_count,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    return None if value is None else round(value, digits)
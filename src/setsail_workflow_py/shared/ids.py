@@ -0,0 +1,46 @@
+import os
+import threading
+
+TRACE_ID_BYTES = 16
+SPAN_ID_BYTES = 8
+DEFAULT_POOL_BYTES = 4096
+
+
+class EntropyPool:
+    # One os.urandom() call serves hundreds of ids; uuid4() pays a syscall and a UUID object per id.
+
+    def __init__(self, size: int = DEFAULT_POOL_BYTES):
+        self.size = size
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._offset = 0
+
+    def take(self, n: int) -> bytes:
+        with self._lock:
+            offset = self._offset
+            if offset + n > len(self._buffer):
+                self._buffer = os.urandom(max(self.size, n))
+                offset = 0
+            self._offset = offset + n
+            return self._buffer[offset:offset + n]
+
+    def reset(self) -> None:
+        # After fork() the child must not hand out the bytes the parent is also handing out.
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._offset = 0
+
+
+_pool = EntropyPool()
+
+
+def new_trace_id() -> str:
+    return _pool.take(TRACE_ID_BYTES).hex()
+
+
+def new_span_id() -> str:
+    return _pool.take(SPAN_ID_BYTES).hex()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_pool.reset)
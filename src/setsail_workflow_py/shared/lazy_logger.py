@@ -0,0 +1,13 @@
+from typing import Any
+
+
+class _LazyLogger:
+    # Stands in for loguru's logger in modules on the import path; loguru is only imported on first use.
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        from loguru import logger as _logger
+        return getattr(_logger, name)
+
+
+logger = _LazyLogger()
@@ -0,0 +1,13 @@
+import asyncio
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+async def run_off_loop(func: Callable[..., T], *args: Any) -> T:
+    # Blocking work goes to the default executor, so the loop keeps doing network I/O.
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    except RuntimeError:
+        # Executors refuse new work once interpreter shutdown has begun; finish inline.
+        return func(*args)
@@ -0,0 +1,74 @@
+import os
+import threading
+from typing import Any, Dict
+from setsail_workflow_py.shared.histogram import LogHistogram
+
+EVENTS_EMITTED = "events_emitted"
+EVENTS_EXPORTED = "events_exported"
+EVENTS_FAILED = "events_failed"
+BATCHES_EXPORTED = "batches_exported"
+
+POST_LATENCY_MS = "post_latency_ms"
+DECORATOR_OVERHEAD_US = "decorator_overhead_us"
+
+
+class SelfMetrics:
+    # What the library itself is doing: process-wide counters and latency histograms.
+    _lock = threading.Lock()
+    _counters: Dict[str, int] = {}
+    _histograms: Dict[str, LogHistogram] = {}
+
+    @classmethod
+    def incr(cls, name: str, count: int = 1) -> None:
+        with cls._lock:
+            cls._counters[name] = cls._counters.get(name, 0) + count
+
+    @classmethod
+    def record_batch(cls, size: int, results: Any) -> None:
+        # Sinks report per-event outcomes as a list of bools; anything else counts as delivered.
+        exported = sum(1 for ok in results if ok) if isinstance(results, list) else size
+        with cls._lock:
+            counters = cls._counters
+            counters[BATCHES_EXPORTED] = counters.get(BATCHES_EXPORTED, 0) + 1
+            counters[EVENTS_EXPORTED] = counters.get(EVENTS_EXPORTED, 0) + exported
+            counters[EVENTS_FAILED] = counters.get(EVENTS_FAILED, 0) + size - exported
+
+    @classmethod
+    def observe(cls, name: str, value: float) -> None:
+        with cls._lock:
+            histogram = cls._histograms.get(name)
+            if histogram is None:
+                histogram = cls._histograms[name] = LogHistogram()
+            histogram.record(value)
+
+    @classmethod
+    def counters(cls) -> Dict[str, int]:
+        with cls._lock:
+            return dict(cls._counters)
+
+    @classmethod
+    def histograms(cls) -> Dict[str, LogHistogram]:
+        # Copies, so callers can read percentiles without holding the lock.
+        with cls._lock:
+            copies = {}
+            for name, histogram in cls._histograms.items():
+                copy = LogHistogram(histogram.growth)
+                copy.merge(histogram)
+                copies[name] = copy
+            return copies
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._counters = {}
+            cls._histograms = {}
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        cls._lock = threading.Lock()
+        cls._counters = {}
+        cls._histograms = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SelfMetrics._reset_after_fork)
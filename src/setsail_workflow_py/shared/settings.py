@@ -0,0 +1,184 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import FrozenSet, Mapping, Optional
+from setsail_workflow_py.domain.models.capture_policy import DEFAULT_EXCLUDE_KEYS, CapturePolicy
+
+SUPPORTED_ENVS = ("local", "dev", "prod")
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    value = environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() not in _FALSE_VALUES
+
+
+def _env_int(environ: Mapping[str, str], name: str, default: int) -> int:
+    try:
+        return int(environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_float(environ: Mapping[str, str], name: str, default: float) -> float:
+    try:
+        return float(environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_port(environ: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(environ[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _env_keys(environ: Mapping[str, str], name: str) -> Optional[FrozenSet[str]]:
+    value = environ.get(name)
+    if not value:
+        return None
+    return frozenset(key.strip().lower() for key in value.split(",") if key.strip())
+
+
+def _env_names(environ: Mapping[str, str], name: str) -> FrozenSet[str]:
+    # Unlike capture keys, operation names are matched case-sensitively.
+    value = environ.get(name) or ""
+    return frozenset(item.strip() for item in value.split(",") if item.strip())
+
+
+def _capture_policy_from_env(environ: Mapping[str, str]) -> CapturePolicy:
+    defaults = CapturePolicy()
+    include_keys = _env_keys(environ, "WORKFLOW_MONITORING_CAPTURE_INCLUDE_KEYS")
+    return CapturePolicy(
+        enabled=_env_bool(environ, "WORKFLOW_MONITORING_CAPTURE", defaults.enabled),
+        max_depth=_env_int(environ, "WORKFLOW_MONITORING_CAPTURE_MAX_DEPTH", defaults.max_depth),
+        max_items=_env_int(environ, "WORKFLOW_MONITORING_CAPTURE_MAX_ITEMS", defaults.max_items),
+        max_string_length=_env_int(environ, "WORKFLOW_MONITORING_CAPTURE_MAX_STRING_LENGTH", defaults.max_string_length),
+        max_bytes=_env_int(environ, "WORKFLOW_MONITORING_CAPTURE_MAX_BYTES", defaults.max_bytes),
+        include_keys=include_keys,
+        exclude_keys=DEFAULT_EXCLUDE_KEYS | (_env_keys(environ, "WORKFLOW_MONITORING_CAPTURE_EXCLUDE_KEYS") or frozenset()),
+        lazy=_env_bool(environ, "WORKFLOW_MONITORING_CAPTURE_LAZY", defaults.lazy),
+    )
+
+
+@dataclass(frozen=True)
+class MonitoringSettings:
+    env: str = "local"
+    enabled: bool = True
+    monitoring_url: Optional[str] = None
+    api_key: Optional[str] = None
+    user_id: Optional[str] = None
+    project_id: Optional[str] = None
+    batch_size: int = 64
+    batch_delay: float = 0.2
+    buffer_max_events: int = 10_000
+    buffer_max_bytes: int = 32 * 1024 * 1024
+    overflow_policy: str = "drop_newest"
+    block_timeout: float = 0.05
+    pool_limit_per_host: int = 16
+    keepalive_timeout: float = 30.0
+    request_timeout: float = 3.0
+    capture: CapturePolicy = field(default_factory=CapturePolicy)
+    exporter: Optional[str] = None
+    file_dir: str = "workflow-events"
+    file_max_bytes: int = 64 * 1024 * 1024
+    file_backups: int = 10
+    transport: str = "single"
+    collector_socket: Optional[str] = None
+    bulk_max_bytes: int = 1024 * 1024
+    gzip_level: int = 6
+    retry_attempts: int = 2
+    retry_backoff: float = 0.2
+    retry_backoff_max: float = 2.0
+    breaker_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    aggregate_operations: FrozenSet[str] = frozenset()
+    aggregate_interval: float = 60.0
+    sample_rate: float = 1.0
+    tail_sampling: bool = False
+    tail_latency_ms: int = 5000
+    tail_max_traces: int = 1000
+    tail_decision_wait: float = 30.0
+    tail_max_trace_events: int = 512
+    tail_max_trace_bytes: int = 1024 * 1024
+    spool_dir: Optional[str] = None
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+    spool_max_bytes: int = 64 * 1024 * 1024
+    spool_segment_bytes: int = 4 * 1024 * 1024
+    error_stack_window: float = 60.0
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self.env in SUPPORTED_ENVS
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "MonitoringSettings":
+        environ = os.environ if environ is None else environ
+        return cls(
+            env=environ.get("ENV", "local"),
+            enabled=_env_bool(environ, "WORKFLOW_MONITORING_ENABLED", True),
+            monitoring_url=environ.get("WORKFLOW_MONITORING_URL"),
+            api_key=environ.get("WORKFLOW_MONITORING_API_KEY"),
+            user_id=environ.get("WORKFLOW_USER_ID"),
+            project_id=environ.get("WORKFLOW_PROJECT_ID"),
+            batch_size=_env_int(environ, "WORKFLOW_MONITORING_BATCH_SIZE", cls.batch_size),
+            batch_delay=_env_float(environ, "WORKFLOW_MONITORING_BATCH_DELAY", cls.batch_delay),
+            buffer_max_events=_env_int(environ, "WORKFLOW_MONITORING_BUFFER_MAX_EVENTS", cls.buffer_max_events),
+            buffer_max_bytes=_env_int(environ, "WORKFLOW_MONITORING_BUFFER_MAX_BYTES", cls.buffer_max_bytes),
+            overflow_policy=environ.get("WORKFLOW_MONITORING_OVERFLOW_POLICY", cls.overflow_policy).strip().lower(),
+            block_timeout=_env_float(environ, "WORKFLOW_MONITORING_BLOCK_TIMEOUT", cls.block_timeout),
+            pool_limit_per_host=_env_int(environ, "WORKFLOW_MONITORING_POOL_LIMIT_PER_HOST", cls.pool_limit_per_host),
+            keepalive_timeout=_env_float(environ, "WORKFLOW_MONITORING_KEEPALIVE_TIMEOUT", cls.keepalive_timeout),
+            request_timeout=_env_float(environ, "WORKFLOW_MONITORING_TIMEOUT", cls.request_timeout),
+            capture=_capture_policy_from_env(environ),
+            exporter=(environ.get("WORKFLOW_MONITORING_EXPORTER") or "").strip().lower() or None,
+            file_dir=environ.get("WORKFLOW_MONITORING_FILE_DIR") or cls.file_dir,
+            file_max_bytes=_env_int(environ, "WORKFLOW_MONITORING_FILE_MAX_BYTES", cls.file_max_bytes),
+            file_backups=_env_int(environ, "WORKFLOW_MONITORING_FILE_BACKUPS", cls.file_backups),
+            transport=environ.get("WORKFLOW_MONITORING_TRANSPORT", cls.transport).strip().lower(),
+            collector_socket=environ.get("WORKFLOW_MONITORING_COLLECTOR_SOCKET") or None,
+            bulk_max_bytes=_env_int(environ, "WORKFLOW_MONITORING_BULK_MAX_BYTES", cls.bulk_max_bytes),
+            gzip_level=_env_int(environ, "WORKFLOW_MONITORING_GZIP_LEVEL", cls.gzip_level),
+            retry_attempts=_env_int(environ, "WORKFLOW_MONITORING_RETRY_ATTEMPTS", cls.retry_attempts),
+            retry_backoff=_env_float(environ, "WORKFLOW_MONITORING_RETRY_BACKOFF", cls.retry_backoff),
+            retry_backoff_max=_env_float(environ, "WORKFLOW_MONITORING_RETRY_BACKOFF_MAX", cls.retry_backoff_max),
+            breaker_threshold=_env_int(environ, "WORKFLOW_MONITORING_BREAKER_THRESHOLD", cls.breaker_threshold),
+            breaker_reset_timeout=_env_float(environ, "WORKFLOW_MONITORING_BREAKER_RESET_TIMEOUT", cls.breaker_reset_timeout),
+            aggregate_operations=_env_names(environ, "WORKFLOW_MONITORING_AGGREGATE"),
+            aggregate_interval=_env_float(environ, "WORKFLOW_MONITORING_AGGREGATE_INTERVAL", cls.aggregate_interval),
+            sample_rate=_env_float(environ, "WORKFLOW_MONITORING_SAMPLE_RATE", cls.sample_rate),
+            tail_sampling=_env_bool(environ, "WORKFLOW_MONITORING_TAIL_SAMPLING", cls.tail_sampling),
+            tail_latency_ms=_env_int(environ, "WORKFLOW_MONITORING_TAIL_LATENCY_MS", cls.tail_latency_ms),
+            tail_max_traces=_env_int(environ, "WORKFLOW_MONITORING_TAIL_MAX_TRACES", cls.tail_max_traces),
+            tail_decision_wait=_env_float(environ, "WORKFLOW_MONITORING_TAIL_DECISION_WAIT", cls.tail_decision_wait),
+            tail_max_trace_events=_env_int(environ, "WORKFLOW_MONITORING_TAIL_MAX_TRACE_EVENTS", cls.tail_max_trace_events),
+            tail_max_trace_bytes=_env_int(environ, "WORKFLOW_MONITORING_TAIL_MAX_TRACE_BYTES", cls.tail_max_trace_bytes),
+            metrics_port=_env_port(environ, "WORKFLOW_MONITORING_METRICS_PORT"),
+            metrics_host=environ.get("WORKFLOW_MONITORING_METRICS_HOST") or cls.metrics_host,
+            spool_dir=environ.get("WORKFLOW_MONITORING_SPOOL_DIR") or None,
+            spool_max_bytes=_env_int(environ, "WORKFLOW_MONITORING_SPOOL_MAX_BYTES", cls.spool_max_bytes),
+            spool_segment_bytes=_env_int(environ, "WORKFLOW_MONITORING_SPOOL_SEGMENT_BYTES", cls.spool_segment_bytes),
+            error_stack_window=_env_float(environ, "WORKFLOW_MONITORING_ERROR_STACK_WINDOW", cls.error_stack_window),
+        )
+
+
+_settings: Optional[MonitoringSettings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> MonitoringSettings:
+    settings = _settings
+    if settings is None:
+        settings = reload_settings()
+    return settings
+
+
+def reload_settings(environ: Optional[Mapping[str, str]] = None) -> MonitoringSettings:
+    global _settings
+    with _settings_lock:
+        _settings = MonitoringSettings.from_env(environ)
+        return _settings
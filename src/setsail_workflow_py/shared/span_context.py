@@ -0,0 +1,52 @@
+import contextvars
+import functools
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+SpanRef = Tuple[str, str]
+T = TypeVar("T")
+
+# (traceId, spanId) of the step the current task or thread is running. asyncio copies the context
+# into every task it creates (gather, create_task, TaskGroup) and asyncio.to_thread copies it into
+# worker threads, so concurrent children each see their own parent instead of racing on a shared dict.
+# loop.run_in_executor and Executor.submit do not copy it; use with_span_context / submit for those.
+_current_span: ContextVar[Optional[SpanRef]] = ContextVar("setsail_workflow_current_span", default=None)
+
+
+class SpanContext:
+
+    @staticmethod
+    def current() -> Optional[SpanRef]:
+        return _current_span.get()
+
+    @staticmethod
+    def parent_span_id(trace_data: dict) -> Optional[str]:
+        current = _current_span.get()
+        if current is not None and current[0] == trace_data.get("traceId"):
+            return current[1]
+        # No step of this trace has run in this context yet: workflow_trace_data seeds the root.
+        return trace_data.get("prevSpanId")
+
+    @staticmethod
+    def activate(trace_id: str, span_id: str) -> Token:
+        return _current_span.set((trace_id, span_id))
+
+
+def with_span_context(func: Callable[..., T]) -> Callable[..., T]:
+    # For loop.run_in_executor(None, with_span_context(step), ...): runs in the caller's span context.
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def run(*args: Any, **kwargs: Any) -> T:
+        # A copy per call, so one wrapper can run on several threads at once.
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
+
+
+def submit(executor: "Executor", func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    # Executor.submit that carries the caller's span context into the worker thread.
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
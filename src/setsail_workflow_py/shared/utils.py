@@ -1,39 +1,75 @@
-import uuid
-import time
-import inspect
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Optional
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, Optional, Tuple
+from setsail_workflow_py.shared.clock import get_clock
+from setsail_workflow_py.shared.ids import new_span_id, new_trace_id
 
 
 def generate_trace_id() -> str:
-    return uuid.uuid4().hex
+    return new_trace_id()
 
 
 def generate_span_id() -> str:
-    return uuid.uuid4().hex[:16]
+    return new_span_id()
 
 
 def current_timestamp() -> int:
-    return int(time.time() * 1000)
+    return get_clock().wall_ms()
 
 
 EXCLUDE_CLASSES = {"ProactorEventLoop", "Handle", "BaseEventLoop", "Runner"}
+CLASS_NAME_CACHE_SIZE = 4096
 
+# (function code object, receiver type) -> resolved class name; the stack is only walked on a miss.
+_class_name_cache: Dict[Tuple[Optional[CodeType], Optional[type]], str] = {}
 
-def get_class_name(func: Callable) -> Optional[str]:
+
+def get_class_name(func: Callable, args: tuple = ()) -> Optional[str]:
     if hasattr(func, '__self__') and func.__self__ is not None:
         class_name = type(func.__self__).__name__
         if class_name not in EXCLUDE_CLASSES:
             return class_name
 
-    project_root = Path.cwd().resolve()
-    stack = inspect.stack()
+    key = (getattr(func, "__code__", None), type(args[0]) if args else None)
+    try:
+        return _class_name_cache[key]
+    except KeyError:
+        pass
+
+    caller = sys._getframe(1)
+    class_name, instance, frame = _resolve_class_name_from_stack(caller)
+    # Only a name taken from the call's own receiver follows from the key; callers' frames change between calls.
+    if class_name is not None and frame is caller and args and instance is args[0]:
+        if len(_class_name_cache) >= CLASS_NAME_CACHE_SIZE:
+            _class_name_cache.clear()
+        _class_name_cache[key] = class_name
+    return class_name
+
+
+def clear_class_name_cache() -> None:
+    _class_name_cache.clear()
+    _is_project_file.cache_clear()
+
 
-    for frame_info in stack:
-        frame = frame_info.frame
-        filename = Path(frame.f_code.co_filename).resolve()
+@lru_cache(maxsize=None)
+def _project_root() -> Path:
+    return Path.cwd().resolve()
 
-        if project_root in filename.parents:
+
+@lru_cache(maxsize=1024)
+def _is_project_file(filename: str) -> bool:
+    try:
+        return _project_root() in Path(filename).resolve().parents
+    except (OSError, ValueError):
+        return False
+
+
+def _resolve_class_name_from_stack(frame: Optional[FrameType]) -> Tuple[Optional[str], Any, Optional[FrameType]]:
+    # Returns the name with the object and frame it was read from.
+    while frame is not None:
+        if _is_project_file(frame.f_code.co_filename):
             locals_snapshot = frame.f_locals
             instance = locals_snapshot.get('self')
 
@@ -45,11 +81,13 @@ def get_class_name(func: Callable) -> Optional[str]:
             # for llm-graph
             processor = locals_snapshot.get('processor')
             if processor and hasattr(processor, '__class__'):
-                return processor.__class__.__name__
+                return processor.__class__.__name__, processor, frame
 
             if instance:
                 class_name = type(instance).__name__
                 if class_name not in EXCLUDE_CLASSES:
-                    return class_name
+                    return class_name, instance, frame
+
+        frame = frame.f_back
 
-    return None
+    return None, None, None
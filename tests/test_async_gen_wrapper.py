@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from setsail_workflow_py.application.services.async_gen_wrapper import MonitoredAsyncGenerator
+from setsail_workflow_py.shared.clock import Clock, set_clock
+from setsail_workflow_py.shared.histogram import LogHistogram
+
+
+async def token_stream(n: int, delay: float = 0.0):
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        yield f"tok{i}"
+
+
+@pytest.mark.asyncio
+async def test_stream_metrics_are_reported_on_close():
+    on_close = AsyncMock()
+    items = [item async for item in MonitoredAsyncGenerator(token_stream(5, delay=0.01), None, on_close=on_close)]
+
+    assert items == ["tok0", "tok1", "tok2", "tok3", "tok4"]
+    on_close.assert_awaited_once()
+    assert on_close.call_args[0][1:] == ("tok4", "SUCCESS", None)
+    metrics = on_close.call_args.kwargs["stream_metrics"]
+    assert metrics["itemCount"] == 5
+    assert metrics["totalBytes"] == 20
+    assert metrics["timeToFirstItemMs"] >= 5
+    assert metrics["interItemLatencyMs"]["count"] == 4
+    assert metrics["completed"] is True
+
+
+@pytest.mark.asyncio
+async def test_early_close_still_reports_once():
+    on_close = AsyncMock()
+    gen = MonitoredAsyncGenerator(token_stream(5), None, on_close=on_close)
+    async for _ in gen:
+        break
+    await gen.aclose()
+    await gen.aclose()
+
+    on_close.assert_awaited_once()
+    assert on_close.call_args.kwargs["stream_metrics"]["completed"] is False
+    assert on_close.call_args.kwargs["stream_metrics"]["itemCount"] == 1
+
+
+def test_histogram_percentiles_and_merge():
+    first, second = LogHistogram(), LogHistogram()
+    for value in range(1, 51):
+        first.record(value)
+    for value in range(51, 101):
+        second.record(value)
+    first.merge(second)
+
+    assert first.count == 100
+    assert first.min == 1 and first.max == 100
+    assert first.percentile(0.5) == pytest.approx(50, rel=0.1)
+    assert first.percentile(0.99) == pytest.approx(99, rel=0.1)
+    assert len(first.buckets) < 60
+
+
+class SteppingClock(Clock):
+    def __init__(self, step_ns: int):
+        super().__init__()
+        self.step_ns = step_ns
+        self.now_ns = 0
+
+    def monotonic_ns(self) -> int:
+        self.now_ns += self.step_ns
+        return self.now_ns
+
+
+@pytest.mark.asyncio
+async def test_stream_durations_follow_the_configured_clock():
+    set_clock(SteppingClock(step_ns=2_000_000))
+    try:
+        on_close = AsyncMock()
+        items = [item async for item in MonitoredAsyncGenerator(token_stream(3), None, on_close=on_close)]
+    finally:
+        set_clock(None)
+
+    assert len(items) == 3
+    metrics = on_close.call_args.kwargs["stream_metrics"]
+    assert metrics["timeToFirstItemMs"] == 2.0
+    assert metrics["streamDurationMs"] == 6.0
+    assert metrics["interItemLatencyMs"]["count"] == 2
+    assert on_close.call_args.kwargs["duration_ns"] == 8_000_000
@@ -0,0 +1,66 @@
+import asyncio
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.batch_event_exporter import BatchEventExporter
+
+from pydantic import HttpUrl
+
+
+config = WorkflowMonitoringConfig(
+    post_url=HttpUrl("https://dev.setsailapi.com/workflow/v1/event"),
+    headers={"Content-Type": "application/json"},
+    spanId="3f7decc34dc8d03a",
+    traceId="592225192fb1ac17022e80c85fb8a749",
+    prevSpanId="3f7decc34dc8d03a",
+    userId="202505125600020250512145500563QSLVDGS96F",
+    projectId="mtr-kiosk-pquzibd",
+    componentName="async_test",
+    operationName="async_test",
+    log_enabled=True
+)
+
+payload = WorkflowEventRecord.from_config(config, "STEP_START", 0)
+
+
+class RecordingSink:
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+
+    async def __call__(self, batch):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.batches.append(list(batch))
+
+
+def test_export_is_batched_by_size():
+    sink = RecordingSink()
+    exporter = BatchEventExporter(sink, max_batch_size=4, schedule_delay=60)
+    for _ in range(10):
+        exporter.export(config, payload)
+
+    assert exporter.flush(timeout=5)
+    assert sum(len(batch) for batch in sink.batches) == 10
+    assert max(len(batch) for batch in sink.batches) <= 4
+    exporter.shutdown()
+
+
+def test_export_does_not_wait_for_sink():
+    sink = RecordingSink(delay=0.5)
+    exporter = BatchEventExporter(sink, max_batch_size=1, schedule_delay=0.01)
+    exporter.export(config, payload)
+
+    assert sink.batches == []
+    assert exporter.shutdown(timeout=5)
+    assert len(sink.batches) == 1
+
+
+def test_export_after_shutdown_is_dropped():
+    sink = RecordingSink()
+    exporter = BatchEventExporter(sink, schedule_delay=0.01)
+    exporter.export(config, payload)
+    assert exporter.shutdown(timeout=5)
+
+    exporter.export(config, payload)
+    assert exporter.pending == 0
+    assert sum(len(batch) for batch in sink.batches) == 1
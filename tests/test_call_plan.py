@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from setsail_workflow_py import workflow_lifecycle
+from setsail_workflow_py.application.services.call_plan import CallPlan, KIND_ASYNC, KIND_ASYNC_GEN, KIND_SYNC
+from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
+
+TRACE = {"enable": True, "traceId": "592225192fb1ac17022e80c85fb8a749"}
+
+
+def test_kind_is_resolved_at_decoration_time():
+    def step(workflow_trace_data: dict):
+        return 1
+
+    async def async_step(workflow_trace_data: dict):
+        return 1
+
+    async def stream(workflow_trace_data: dict):
+        yield 1
+
+    assert CallPlan(step).kind == KIND_SYNC
+    assert CallPlan(async_step).kind == KIND_ASYNC
+    assert CallPlan(stream).kind == KIND_ASYNC_GEN
+
+
+def test_trace_data_lookup_follows_the_signature():
+    def keyword_step(workflow_trace_data: dict):
+        return 1
+
+    def state_step(state: dict):
+        return 1
+
+    def open_step(**kwargs):
+        return 1
+
+    state = {"state": {"workflow_trace_data": TRACE}, "workflow_trace_data": {"traceId": "other"}}
+    assert CallPlan(keyword_step).find_trace_data({"workflow_trace_data": TRACE}) is TRACE
+    assert CallPlan(state_step).find_trace_data(state) is TRACE
+    assert CallPlan(open_step).find_trace_data(state) is TRACE
+    assert CallPlan(keyword_step).find_trace_data({}) == {}
+
+
+@patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
+@patch.object(WorkflowMonitoringService, "send_end_event", new_callable=AsyncMock)
+@patch.object(WorkflowMonitoringService, "send_start_event", new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_capture_can_be_turned_off_per_step(mock_start, mock_end, mock_create):
+    mock_create.return_value.log_enabled = False
+
+    @workflow_lifecycle(capture_input=False, capture_output=False)
+    async def secret_step(x: int, workflow_trace_data: dict) -> int:
+        return x * 2
+
+    assert await secret_step(21, workflow_trace_data=TRACE) == 42
+    assert mock_start.call_args[0][1] is None
+    assert mock_end.call_args[0][1] is None
+    assert mock_end.call_args[0][2] == "SUCCESS"
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from setsail_workflow_py.infrastructure.http.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from setsail_workflow_py.infrastructure.http.post_client import PostClient
+from setsail_workflow_py.shared.settings import reload_settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+@pytest.fixture
+def fast_retries():
+    CircuitBreaker.reset_all()
+    reload_settings({
+        "WORKFLOW_MONITORING_RETRY_ATTEMPTS": "2",
+        "WORKFLOW_MONITORING_RETRY_BACKOFF": "0",
+        "WORKFLOW_MONITORING_BREAKER_THRESHOLD": "4",
+    })
+    yield
+    CircuitBreaker.reset_all()
+    reload_settings()
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried(monkeypatch, fast_retries):
+    statuses = [503, 503, 200]
+    calls = []
+
+    async def _send(url, headers, body):
+        calls.append(url)
+        return statuses[len(calls) - 1]
+
+    monkeypatch.setattr(PostClient, "_send", staticmethod(_send))
+    assert await PostClient._deliver("http://localhost:1/event", {}, b"{}") == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(monkeypatch, fast_retries):
+    calls = []
+
+    async def _send(url, headers, body):
+        calls.append(url)
+        return 400
+
+    monkeypatch.setattr(PostClient, "_send", staticmethod(_send))
+    assert await PostClient._deliver("http://localhost:2/event", {}, b"{}") == 400
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(monkeypatch, fast_retries):
+    calls = []
+
+    async def _send(url, headers, body):
+        calls.append(url)
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(PostClient, "_send", staticmethod(_send))
+    with pytest.raises(ConnectionError):
+        await PostClient._deliver("http://localhost:3/event", {}, b"{}")
+    with pytest.raises(CircuitOpenError):
+        await PostClient._deliver("http://localhost:3/event", {}, b"{}")
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_lets_the_next_probe_through(monkeypatch, fast_retries):
+    url = "http://localhost:4/event"
+    breaker = CircuitBreaker.for_url(url, failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN
+
+    async def _send(url, headers, body):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(PostClient, "_send", staticmethod(_send))
+    with pytest.raises(asyncio.CancelledError):
+        await PostClient._deliver(url, {}, b"{}")
+    assert breaker.allow()
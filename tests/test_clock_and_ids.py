@@ -0,0 +1,66 @@
+import os
+import re
+import time
+from setsail_workflow_py.shared.clock import Clock
+from setsail_workflow_py.shared.ids import EntropyPool, new_span_id, new_trace_id
+
+
+def test_ids_are_hex_of_the_expected_length_and_unique():
+    trace_ids = {new_trace_id() for _ in range(5000)}
+    span_ids = {new_span_id() for _ in range(5000)}
+    assert len(trace_ids) == 5000 and len(span_ids) == 5000
+    assert all(re.fullmatch(r"[0-9a-f]{32}", trace_id) for trace_id in trace_ids)
+    assert all(re.fullmatch(r"[0-9a-f]{16}", span_id) for span_id in span_ids)
+
+
+def test_entropy_pool_refills_in_batches():
+    pool = EntropyPool(size=64)
+    chunks = [pool.take(8) for _ in range(20)]
+    assert len(set(chunks)) == 20
+    assert pool.take(100) and len(pool.take(100)) == 100
+
+
+def test_forked_child_does_not_reuse_the_parents_entropy():
+    new_span_id()  # make sure the parent has buffered bytes
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, new_span_id().encode())
+        os._exit(0)
+    os.close(write_fd)
+    child_id = os.read(read_fd, 16).decode()
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert child_id != new_span_id()
+
+
+def test_wall_clock_does_not_go_back_on_drift_corrections(monkeypatch):
+    clock = Clock(reanchor_ns=0)
+    first = clock.wall_ns()
+    real_time_ns = time.time_ns
+    monkeypatch.setattr(time, "time_ns", lambda: real_time_ns() - 50_000_000)
+    second = clock.wall_ns()
+    assert second >= first
+    clock.reanchor_ns = 60 * 1_000_000_000
+    assert clock.wall_ns() > second
+
+
+def test_wall_clock_follows_a_backward_system_clock_step(monkeypatch):
+    clock = Clock(reanchor_ns=0)
+    first = clock.wall_ns()
+    real_time_ns = time.time_ns
+    monkeypatch.setattr(time, "time_ns", lambda: real_time_ns() - 3_600_000_000_000)
+    stepped = clock.wall_ns()
+    assert first - stepped > 3_500_000_000_000
+    assert abs(stepped - time.time_ns()) < 50_000_000
+    later = clock.wall_ns()
+    assert later > stepped
+    assert later < first
+
+
+def test_wall_clock_has_sub_millisecond_resolution():
+    clock = Clock()
+    assert abs(clock.wall_ms() - int(time.time() * 1000)) < 50
+    samples = {clock.wall_ns() for _ in range(100)}
+    assert len(samples) > 1
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+import pytest
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.collector.collector_client import CollectorClient
+from setsail_workflow_py.infrastructure.collector.collector_server import CollectorServer
+from setsail_workflow_py.infrastructure.http.post_client import PostClient
+
+from pydantic import HttpUrl
+
+
+config = WorkflowMonitoringConfig(
+    post_url=HttpUrl("https://dev.setsailapi.com/workflow/v1/event"),
+    headers={"Content-Type": "application/json", "x-api-key": "key"},
+    spanId="3f7decc34dc8d03a",
+    traceId="592225192fb1ac17022e80c85fb8a749",
+    prevSpanId="3f7decc34dc8d03a",
+    userId="202505125600020250512145500563QSLVDGS96F",
+    projectId="mtr-kiosk-pquzibd",
+    componentName="collector_test",
+    operationName="collector_test",
+)
+
+
+def _record(i: int) -> WorkflowEventRecord:
+    return WorkflowEventRecord.from_config(config, "STEP_END", i, status="SUCCESS", data={"output": {"i": i}})
+
+
+def test_worker_frames_reach_the_collector(tmp_path):
+    path = str(tmp_path / "collector.sock")
+    received = []
+    loop = asyncio.new_event_loop()
+    server = CollectorServer(path, lambda c, r: received.append((c, r)))
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_until_complete, args=(server.serve_forever(),))
+    thread.start()
+    try:
+        client = CollectorClient(path)
+        assert asyncio.run(client.send_events([(config, _record(i)) for i in range(5)])) == [True] * 5
+        deadline = time.monotonic() + 5
+        while len(received) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client.close()
+    finally:
+        loop.call_soon_threadsafe(server.stop)
+        thread.join(5)
+        loop.close()
+
+    assert [record.timestamp for _, record in received] == list(range(5))
+    forwarded_config, forwarded_record = received[0]
+    assert str(forwarded_config.post_url) == str(config.post_url)
+    assert forwarded_config.headers == config.headers
+    assert forwarded_record.to_dict() == _record(0).to_dict()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_collector_falls_back_to_direct_posts(tmp_path, monkeypatch):
+    posted = []
+
+    async def post_events(batch):
+        posted.extend(batch)
+        return [True] * len(batch)
+
+    monkeypatch.setattr(PostClient, "post_events", staticmethod(post_events))
+    client = CollectorClient(str(tmp_path / "missing.sock"))
+    assert await client.send_events([(config, _record(i)) for i in range(3)]) == [True] * 3
+    assert len(posted) == 3
@@ -0,0 +1,63 @@
+from setsail_workflow_py.application.services.error_reporter import ErrorReporter
+from setsail_workflow_py.domain.services.error_fingerprint import ErrorFingerprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _call_provider(request_id: str):
+    raise ConnectionError(f"provider unavailable for request {request_id}")
+
+
+def _call_other_provider():
+    raise ConnectionError("provider unavailable")
+
+
+def _failure(call, *args) -> Exception:
+    try:
+        call(*args)
+    except Exception as ex:
+        return ex
+    raise AssertionError("expected a failure")
+
+
+def test_fingerprint_ignores_the_message_but_not_the_origin():
+    first = ErrorFingerprint.of(_failure(_call_provider, "a"))
+    assert ErrorFingerprint.of(_failure(_call_provider, "b")) == first
+    assert ErrorFingerprint.of(_failure(_call_other_provider)) != first
+    assert ErrorFingerprint.of(_failure(lambda: int("x"))) != first
+
+
+def test_stack_is_sent_once_per_fingerprint_and_window():
+    clock = FakeClock()
+    reporter = ErrorReporter(window=60.0, clock=clock)
+
+    first = reporter.describe(_failure(_call_provider, "a"))
+    assert first["occurrences"] == 1
+    assert "_call_provider" in first["stack"]
+    assert first["message"] == "provider unavailable for request a"
+    assert first["errorCode"] == "ConnectionError"
+
+    clock.now = 30.0
+    repeated = [reporter.describe(_failure(_call_provider, str(i))) for i in range(3)]
+    assert [details["occurrences"] for details in repeated] == [2, 3, 4]
+    assert all("stack" not in details and details["fingerprint"] == first["fingerprint"] for details in repeated)
+    assert "stack" in reporter.describe(_failure(_call_other_provider))
+
+    clock.now = 61.0
+    renewed = reporter.describe(_failure(_call_provider, "c"))
+    assert renewed["occurrences"] == 1
+    assert "stack" in renewed
+
+
+def test_zero_window_always_sends_the_stack():
+    reporter = ErrorReporter(window=0)
+    for _ in range(3):
+        details = reporter.describe(_failure(_call_other_provider))
+        assert details["occurrences"] == 1
+        assert "stack" in details
@@ -0,0 +1,88 @@
+import threading
+import time
+import pytest
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.capture_policy import CapturePolicy
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.domain.services.payload_serializer import LazyPayload
+from setsail_workflow_py.infrastructure.exporters.event_buffer import BLOCK, DROP_OLDEST, EventBuffer
+from setsail_workflow_py.shared.event_loss import BLOCK_TIMEOUT, BYTES_FULL, DISPLACED, OVERSIZED, QUEUE_FULL, EventLoss
+
+from pydantic import HttpUrl
+
+
+config = WorkflowMonitoringConfig(
+    post_url=HttpUrl("https://dev.setsailapi.com/workflow/v1/event"),
+    headers={"Content-Type": "application/json", "x-api-key": "key"},
+    spanId="3f7decc34dc8d03a",
+    traceId="592225192fb1ac17022e80c85fb8a749",
+    userId="202505125600020250512145500563QSLVDGS96F",
+    projectId="mtr-kiosk-pquzibd",
+    componentName="buffer_test",
+    operationName="buffer_test",
+)
+
+
+def _item(i: int, payload=None):
+    data = None if payload is None else {"input": LazyPayload(payload, CapturePolicy())}
+    return config, WorkflowEventRecord.from_config(config, "STEP_START", i, data=data)
+
+
+@pytest.fixture(autouse=True)
+def loss():
+    EventLoss.reset()
+    yield
+    EventLoss.reset()
+
+
+def test_drop_newest_sheds_arrivals_once_the_count_limit_is_reached():
+    buffer = EventBuffer(max_events=3)
+    assert [buffer.put(_item(i)) for i in range(5)] == [True, True, True, False, False]
+    assert [record.timestamp for _, record in buffer.take(10)] == [0, 1, 2]
+    assert EventLoss.snapshot() == {QUEUE_FULL: 2}
+
+
+def test_drop_oldest_keeps_the_newest_events_within_the_byte_limit():
+    big = {"prompt": "x" * 2000}
+    one_event = _item(0, big)[1].estimated_size()
+    buffer = EventBuffer(max_bytes=one_event * 2, policy=DROP_OLDEST)
+    for i in range(5):
+        assert buffer.put(_item(i, big))
+    assert buffer.bytes <= one_event * 2
+    assert [record.timestamp for _, record in buffer.take(10)] == [3, 4]
+    assert EventLoss.snapshot() == {DISPLACED: 3}
+    assert buffer.bytes == 0
+
+
+def test_large_payloads_are_charged_by_their_capture_budget():
+    buffer = EventBuffer(max_bytes=96 * 1024)
+    assert buffer.put(_item(0, {"document": "x" * 10_000_000}))
+    assert buffer.put(_item(1, ["y" * 5000] * 1000))
+    assert buffer.bytes < 72 * 1024
+    assert not buffer.put(_item(2, ["y" * 5000] * 1000))
+    assert EventLoss.snapshot() == {BYTES_FULL: 1}
+
+
+def test_nested_payloads_are_charged_for_what_they_hold():
+    nested = {"state": {"docs": ["x" * 10_000_000]}}
+    assert _item(0, nested)[1].estimated_size() > 2048
+
+    buffer = EventBuffer(max_bytes=4096)
+    assert buffer.put(_item(0, nested))
+    assert not buffer.put(_item(1, nested))
+    assert not EventBuffer(max_bytes=1024).put(_item(2, nested))
+    assert EventLoss.snapshot() == {BYTES_FULL: 1, OVERSIZED: 1}
+
+
+def test_block_waits_for_room_then_gives_up_after_the_timeout():
+    buffer = EventBuffer(max_events=1, policy=BLOCK, block_timeout=1.0)
+    buffer.put(_item(0))
+    threading.Timer(0.05, buffer.take, args=(1,)).start()
+    started = time.monotonic()
+    assert buffer.put(_item(1))
+    assert time.monotonic() - started < 0.9
+
+    buffer.block_timeout = 0.05
+    assert not buffer.put(_item(2))
+    assert not buffer.put(_item(3), block=False)
+    assert EventLoss.snapshot() == {BLOCK_TIMEOUT: 1, QUEUE_FULL: 1}
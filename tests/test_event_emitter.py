@@ -0,0 +1,25 @@
+import asyncio
+from setsail_workflow_py.application.services.event_emitter import EventEmitter
+
+
+def test_emit_does_not_block_and_drain_waits_for_pending_sends():
+    done = []
+
+    async def slow_send():
+        await asyncio.sleep(0.2)
+        done.append(True)
+
+    EventEmitter.emit(slow_send())
+    assert done == []
+    assert EventEmitter.pending() == 1
+
+    assert EventEmitter.drain(timeout=5)
+    assert done == [True]
+    assert EventEmitter.pending() == 0
+
+
+def test_drain_respects_deadline():
+    EventEmitter.emit(asyncio.sleep(1))
+
+    assert not EventEmitter.drain(timeout=0.05)
+    assert EventEmitter.drain(timeout=5)
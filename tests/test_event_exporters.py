@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import threading
+import pytest
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.event_exporter import create_exporter
+from setsail_workflow_py.infrastructure.exporters.file_event_exporter import FileEventExporter
+from setsail_workflow_py.infrastructure.exporters.http_event_exporter import HttpEventExporter
+from setsail_workflow_py.infrastructure.exporters.memory_event_exporter import InMemoryEventExporter
+from setsail_workflow_py.infrastructure.exporters.stream_event_exporter import StreamEventExporter
+from setsail_workflow_py.shared.settings import MonitoringSettings
+
+from pydantic import HttpUrl
+
+
+config = WorkflowMonitoringConfig(
+    post_url=HttpUrl("https://dev.setsailapi.com/workflow/v1/event"),
+    headers={"Content-Type": "application/json", "x-api-key": "key"},
+    spanId="3f7decc34dc8d03a",
+    traceId="592225192fb1ac17022e80c85fb8a749",
+    prevSpanId="3f7decc34dc8d03a",
+    userId="202505125600020250512145500563QSLVDGS96F",
+    projectId="mtr-kiosk-pquzibd",
+    componentName="exporter_test",
+    operationName="exporter_test",
+)
+
+
+def _batch(count: int, start: int = 0):
+    return [
+        (config, WorkflowEventRecord.from_config(config, "STEP_END", i, status="SUCCESS", data={"output": {"i": i}}))
+        for i in range(start, start + count)
+    ]
+
+
+def _lines(path):
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_exporter_is_selected_from_settings(tmp_path):
+    assert isinstance(create_exporter(MonitoringSettings()), HttpEventExporter)
+    assert isinstance(create_exporter(MonitoringSettings(exporter="memory")), InMemoryEventExporter)
+    assert isinstance(create_exporter(MonitoringSettings(exporter="stdout")), StreamEventExporter)
+    file_exporter = create_exporter(MonitoringSettings(exporter="file", file_dir=str(tmp_path)))
+    assert isinstance(file_exporter, FileEventExporter) and file_exporter.directory == str(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_file_exporter_writes_ndjson_and_rotates(tmp_path):
+    exporter = FileEventExporter(str(tmp_path), max_bytes=1024, backups=2)
+    for start in range(0, 60, 10):
+        assert await exporter.export(_batch(10, start)) == [True] * 10
+    exporter.close()
+
+    rotated = sorted(name for name in os.listdir(tmp_path) if name != os.path.basename(exporter.path))
+    assert len(rotated) == 2
+    assert all(os.path.getsize(tmp_path / name) <= 1024 for name in rotated)
+    kept = [event for name in rotated for event in _lines(tmp_path / name)] + _lines(exporter.path)
+    indexes = [event["event"]["data"]["output"]["i"] for event in kept]
+    # Older files were pruned; what is left is the newest events, in order and without torn lines.
+    assert indexes == list(range(indexes[0], 60))
+
+
+@pytest.mark.asyncio
+async def test_file_exporter_writes_off_the_event_loop(tmp_path, monkeypatch):
+    exporter = FileEventExporter(str(tmp_path))
+    threads = []
+    write = exporter._write
+    monkeypatch.setattr(exporter, "_write", lambda line: (threads.append(threading.get_ident()), write(line)))
+    assert await exporter.export(_batch(2)) == [True] * 2
+    exporter.close()
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_stream_and_memory_exporters_keep_every_event():
+    stream = io.BytesIO()
+    assert await StreamEventExporter(stream).export(_batch(3)) == [True] * 3
+    assert [json.loads(line)["event"]["timestamp"] for line in stream.getvalue().splitlines()] == [0, 1, 2]
+
+    memory = InMemoryEventExporter()
+    await memory.export(_batch(2))
+    assert [event["event"]["timestamp"] for event in memory.events()] == [0, 1]
+    memory.clear()
+    assert memory.records == []
@@ -0,0 +1,110 @@
+import asyncio
+import os
+from pydantic import HttpUrl
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.http import delivery
+from setsail_workflow_py.infrastructure.http.delivery import replay_headers, spool_events
+from setsail_workflow_py.infrastructure.spool.event_spool import EventSpool, OPEN_SUFFIX, SEALED_SUFFIX
+from setsail_workflow_py.shared.settings import MonitoringSettings
+
+
+def _entry(i: int) -> dict:
+    return {"url": "http://localhost:8000/event", "headers": {}, "body": {"i": i}}
+
+
+class RecordingSender:
+    def __init__(self, accept: bool = True):
+        self.accept = accept
+        self.entries = []
+
+    async def __call__(self, batch):
+        if self.accept:
+            self.entries.extend(batch)
+        return [self.accept] * len(batch)
+
+
+def _replay(spool: EventSpool, sender: RecordingSender) -> int:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(spool.replay(sender, batch_size=3))
+    finally:
+        loop.close()
+
+
+def test_spooled_events_are_replayed_in_order(tmp_path):
+    spool = EventSpool(str(tmp_path), max_bytes=1 << 20, segment_bytes=256)
+    spool.append([_entry(i) for i in range(10)])
+    assert spool.has_backlog
+
+    sender = RecordingSender()
+    assert _replay(spool, sender) == 10
+    assert [entry["body"]["i"] for entry in sender.entries] == list(range(10))
+    assert not spool.has_backlog
+    assert os.listdir(tmp_path) == []
+
+
+def test_replay_keeps_segments_while_backend_is_down(tmp_path):
+    spool = EventSpool(str(tmp_path))
+    spool.append([_entry(i) for i in range(5)])
+
+    assert _replay(spool, RecordingSender(accept=False)) == 0
+    assert spool.has_backlog
+
+    sender = RecordingSender()
+    assert _replay(spool, sender) == 5
+
+
+def test_segments_left_open_by_a_dead_process_are_recovered(tmp_path):
+    spool = EventSpool(str(tmp_path))
+    spool.append([_entry(i) for i in range(3)])
+    open_segment = next(name for name in os.listdir(tmp_path) if name.endswith(OPEN_SUFFIX))
+    # Simulate a crash: a torn record at the end of a segment owned by a pid that no longer exists.
+    with open(tmp_path / open_segment, "ab") as file:
+        file.write(b"\x40\x00\x00\x00\x00")
+    os.rename(tmp_path / open_segment, tmp_path / f"{open_segment.split('-')[0]}-999999999{OPEN_SUFFIX}")
+
+    recovered = EventSpool(str(tmp_path))
+    assert recovered.has_backlog
+    sender = RecordingSender()
+    assert _replay(recovered, sender) == 3
+
+
+def test_oldest_segments_are_dropped_past_max_bytes(tmp_path):
+    spool = EventSpool(str(tmp_path), max_bytes=512, segment_bytes=256)
+    spool.append([_entry(i) for i in range(40)])
+    spool.seal()
+
+    sealed = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path) if name.endswith(SEALED_SUFFIX))
+    assert sealed <= 512
+    assert spool.dropped > 0
+
+    sender = RecordingSender()
+    _replay(spool, sender)
+    assert sender.entries[-1]["body"]["i"] == 39
+    assert spool.dropped + len(sender.entries) == 40
+
+
+def test_credentials_are_not_written_to_the_spool(tmp_path, monkeypatch):
+    config = WorkflowMonitoringConfig(
+        post_url=HttpUrl("https://dev.setsailapi.com/workflow/v1/event"),
+        headers={"Content-Type": "application/json", "x-api-key": "secret-key"},
+        spanId="3f7decc34dc8d03a",
+        traceId="592225192fb1ac17022e80c85fb8a749",
+        userId="202505125600020250512145500563QSLVDGS96F",
+        projectId="mtr-kiosk-pquzibd",
+        componentName="spool_test",
+        operationName="spool_test",
+    )
+    spool = EventSpool(str(tmp_path))
+    monkeypatch.setattr(EventSpool, "_instance", spool)
+    spool_events([(config, WorkflowEventRecord.from_config(config, "STEP_START", 0))])
+    spool.seal()
+    assert all(b"secret-key" not in (tmp_path / name).read_bytes() for name in os.listdir(tmp_path))
+
+    sender = RecordingSender()
+    _replay(spool, sender)
+    assert replay_headers(sender.entries[0], MonitoringSettings())["x-api-key"] == "secret-key"
+
+    monkeypatch.setattr(delivery, "_spooled_credentials", {})
+    assert replay_headers(sender.entries[0], MonitoringSettings(api_key="configured"))["x-api-key"] == "configured"
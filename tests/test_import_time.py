@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+import setsail_workflow_py
+
+# Generous enough for slow CI machines; eager imports of pydantic/aiohttp alone took ~200 ms.
+IMPORT_TIME_BUDGET_US = 150_000
+DEFERRED_MODULES = ("aiohttp", "pydantic", "loguru", "concurrent.futures", "asyncio")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    src = os.path.dirname(os.path.dirname(os.path.abspath(setsail_workflow_py.__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def test_import_does_not_load_heavy_dependencies():
+    probe = f"import sys, setsail_workflow_py; print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    assert _python("-c", probe).stdout.strip() == ""
+
+
+def test_import_time_is_within_budget():
+    result = _python("-X", "importtime", "-c", "import setsail_workflow_py")
+    cumulative = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[2].strip() == "setsail_workflow_py"
+    ]
+    assert cumulative, result.stderr
+    assert cumulative[0] < IMPORT_TIME_BUDGET_US
+
+
+def test_control_functions_are_still_exported():
+    from setsail_workflow_py import drain, flush, shutdown
+
+    assert callable(drain) and callable(flush) and callable(shutdown)
+
+
+def test_untraced_calls_do_not_load_the_monitoring_stack():
+    probe = (
+        "import sys\n"
+        "from setsail_workflow_py import workflow_lifecycle\n"
+        "step = workflow_lifecycle()(lambda workflow_trace_data: 1)\n"
+        "step(workflow_trace_data={})\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    assert _python("-c", probe).stdout.strip() == ""
@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from setsail_workflow_py import workflow_entry, workflow_lifecycle
+from setsail_workflow_py.application.services import operation_rollups, workflow_monitoring_service
+from setsail_workflow_py.application.services.operation_rollups import OperationRollups
+from setsail_workflow_py.shared.settings import reload_settings
+
+
+trace_data = {
+    "enable": True,
+    "traceId": "592225192fb1ac17022e80c85fb8a749",
+    "userId": "202505125600020250512145500563QSLVDGS96F",
+    "projectId": "mtr-kiosk-pquzibd",
+    "post_url": "https://dev.setsailapi.com/workflow/v1/event",
+    "x-api-key": "test-key",
+}
+
+
+class HotNode:
+    @workflow_lifecycle(aggregate=True)
+    async def run(self, fail: bool, workflow_trace_data: dict) -> int:
+        if fail:
+            raise ValueError("boom")
+        return 1
+
+    @workflow_lifecycle()
+    def lookup(self, workflow_trace_data: dict) -> int:
+        return 2
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.items = []
+
+    def export(self, config, record):
+        self.items.append((config, record))
+
+
+@pytest.fixture
+def rollups(monkeypatch):
+    exporter = RecordingExporter()
+    monkeypatch.setattr(operation_rollups, "get_batch_exporter", lambda: exporter)
+    monkeypatch.setattr(workflow_monitoring_service, "_export", lambda config, record: exporter.export(config, record))
+    monkeypatch.setattr(OperationRollups, "_instance", OperationRollups(interval=3600))
+    yield exporter
+    reload_settings()
+
+
+def test_aggregated_calls_emit_one_summary_instead_of_step_events(rollups):
+    node = HotNode()
+
+    async def _calls():
+        for i in range(20):
+            try:
+                await node.run(i % 5 == 0, workflow_trace_data=dict(trace_data))
+            except ValueError:
+                pass
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_calls())
+    finally:
+        loop.close()
+
+    assert rollups.items == []
+    assert OperationRollups.get().flush() == 1
+    assert len(rollups.items) == 1
+
+    summary = rollups.items[0][1].to_dict()
+    rollup = summary["event"]["customAttributes"]["rollup"]
+    assert summary["event"]["operationName"] == "HotNode"
+    assert rollup["count"] == 20
+    assert rollup["errors"] == 4
+    assert rollup["errorCodes"] == {"ValueError": 4}
+    assert rollup["durationMs"]["count"] == 20
+    assert OperationRollups.get().flush() == 0
+
+
+def test_operations_can_be_aggregated_from_the_environment(rollups):
+    reload_settings({"WORKFLOW_MONITORING_AGGREGATE": "HotNode"})
+    assert HotNode().lookup(workflow_trace_data=dict(trace_data)) == 2
+    assert rollups.items == []
+    assert OperationRollups.get().flush() == 1
+
+
+def test_rollups_ignore_the_head_sample_rate(rollups):
+    reload_settings({"WORKFLOW_MONITORING_AGGREGATE": "HotNode", "WORKFLOW_MONITORING_SAMPLE_RATE": "0"})
+    for _ in range(100):
+        HotNode().lookup(workflow_trace_data=dict(trace_data))
+    assert OperationRollups.get().flush() == 1
+    assert rollups.items[0][1].customAttributes["rollup"]["count"] == 100
+
+
+def test_configs_of_idle_keys_are_dropped_after_a_window(rollups):
+    reload_settings({"WORKFLOW_MONITORING_AGGREGATE": "HotNode"})
+    rollups_instance = OperationRollups.get()
+    for user in range(3):
+        HotNode().lookup(workflow_trace_data=dict(trace_data, userId=f"{user:040d}"))
+    assert rollups_instance.flush() == 3
+    assert len(rollups_instance._configs) == 3
+
+    HotNode().lookup(workflow_trace_data=dict(trace_data))
+    assert rollups_instance.flush() == 1
+    assert rollups_instance.flush() == 0
+    assert rollups_instance._configs == {}
+
+
+class GraphNode:
+    @workflow_lifecycle(aggregate=True)
+    def run(self, state: dict) -> int:
+        return 3
+
+
+@workflow_entry("entry", aggregate=True)
+def entry(workflow_trace_data: dict) -> int:
+    return 4
+
+
+def test_rollups_find_trace_data_the_way_the_step_takes_it(rollups):
+    assert GraphNode().run(state={"workflow_trace_data": dict(trace_data)}) == 3
+    assert entry(workflow_trace_data=dict(trace_data)) == 4
+    assert OperationRollups.get().flush() == 2
+    assert sorted(record.operationName for _, record in rollups.items) == ["GraphNode", "entry"]
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+from pydantic import BaseModel
+from setsail_workflow_py.domain.models.capture_policy import CapturePolicy
+from setsail_workflow_py.domain.services.payload_serializer import LazyPayload, PayloadSerializer
+from setsail_workflow_py.application.services import workflow_monitoring_service
+from setsail_workflow_py.shared.settings import reload_settings
+
+
+class AgentState(BaseModel):
+    question: str
+    history: list
+
+
+def test_sanitize_applies_caps_and_markers():
+    policy = CapturePolicy(max_depth=2, max_items=4, max_string_length=5)
+    value = {
+        "text": "abcdefghij",
+        "items": list(range(10)),
+        "nested": {"deeper": {"deepest": 1}},
+        "api_key": "secret",
+    }
+
+    result = PayloadSerializer.sanitize(value, policy)
+
+    assert result["text"].startswith("abcde" + policy.truncation_marker)
+    assert result["items"][:4] == [0, 1, 2, 3]
+    assert result["items"][4] == f"{policy.truncation_marker} 6 more items"
+    assert result["nested"]["deeper"].startswith("<dict>")
+    assert result["api_key"] == policy.redaction_marker
+
+
+def test_sanitize_respects_byte_budget_and_include_keys():
+    policy = CapturePolicy(max_bytes=100, include_keys=frozenset({"state"}))
+    result = PayloadSerializer.sanitize({"state": ["x" * 40] * 10, "other": 1}, policy)
+
+    assert "other" not in result
+    assert len(str(result)) < 400
+    assert result["state"][-1].startswith(policy.truncation_marker)
+
+
+def test_sanitize_walks_models_without_dumping():
+    state = AgentState(question="hi", history=[1, 2])
+    with patch.object(AgentState, "model_dump") as model_dump:
+        assert PayloadSerializer.sanitize(state, CapturePolicy()) == {"question": "hi", "history": [1, 2]}
+    model_dump.assert_not_called()
+
+
+def test_lazy_payload_defers_work_until_resolved():
+    with patch.object(PayloadSerializer, "sanitize", return_value={"a": 1}) as sanitize:
+        payload = LazyPayload({"a": 1}, CapturePolicy())
+        sanitize.assert_not_called()
+        assert payload.resolve() == {"a": 1}
+        assert payload.resolve() == {"a": 1}
+    sanitize.assert_called_once()
+
+
+def test_captured_state_is_not_affected_by_later_mutation():
+    state = {"messages": ["hello"]}
+    try:
+        reload_settings({})
+        payload = workflow_monitoring_service._capture({"state": state})
+        state["messages"].append("later")
+        assert payload.resolve() == {"state": {"messages": ["hello"]}}
+
+        reload_settings({"WORKFLOW_MONITORING_CAPTURE_LAZY": "true"})
+        payload = workflow_monitoring_service._capture({"state": state})
+        state["messages"].append("aliased")
+        assert payload.resolve()["state"]["messages"][-1] == "aliased"
+    finally:
+        reload_settings()
@@ -0,0 +1,108 @@
+import asyncio
+import gzip
+import json
+import pytest
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.http.circuit_breaker import CircuitBreaker
+from setsail_workflow_py.infrastructure.http.post_client import PostClient
+from setsail_workflow_py.infrastructure.spool.event_spool import EventSpool
+from setsail_workflow_py.shared.settings import reload_settings
+
+from pydantic import HttpUrl
+
+
+def _config(port: int) -> WorkflowMonitoringConfig:
+    return WorkflowMonitoringConfig(
+        post_url=HttpUrl(f"http://localhost:{port}/event"),
+        headers={"Content-Type": "application/json", "x-api-key": "key"},
+        spanId="3f7decc34dc8d03a",
+        traceId="592225192fb1ac17022e80c85fb8a749",
+        userId="202505125600020250512145500563QSLVDGS96F",
+        projectId="mtr-kiosk-pquzibd",
+        componentName="bulk_test",
+        operationName="bulk_test",
+    )
+
+
+def _batch(port: int, n: int):
+    config = _config(port)
+    return [(config, WorkflowEventRecord.from_config(config, "STEP_START", i, data={"input": "x" * 100})) for i in range(n)]
+
+
+class RecordingSend:
+    def __init__(self, bulk_status: int = 200):
+        self.bulk_status = bulk_status
+        self.requests = []
+
+    async def __call__(self, url, headers, body):
+        self.requests.append((headers, body))
+        if headers.get("Content-Encoding") == "gzip":
+            return self.bulk_status
+        return 200
+
+
+@pytest.fixture
+def bulk_settings():
+    CircuitBreaker.reset_all()
+    reload_settings({"WORKFLOW_MONITORING_TRANSPORT": "bulk", "WORKFLOW_MONITORING_BULK_MAX_BYTES": "1000"})
+    yield
+    reload_settings()
+
+
+def _post(batch):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(PostClient.post_events(batch))
+    finally:
+        loop.close()
+
+
+def test_events_are_sent_as_gzipped_ndjson_within_the_byte_limit(monkeypatch, bulk_settings):
+    send = RecordingSend()
+    monkeypatch.setattr(PostClient, "_send", staticmethod(send))
+
+    assert _post(_batch(8101, 20)) == [True] * 20
+
+    events = []
+    for headers, body in send.requests:
+        assert headers["Content-Type"] == "application/x-ndjson"
+        assert headers["x-api-key"] == "key"
+        lines = gzip.decompress(body).splitlines()
+        assert sum(len(line) + 1 for line in lines) <= 1000
+        events.extend(json.loads(line) for line in lines)
+    assert len(send.requests) > 1
+    assert [event["event"]["timestamp"] for event in events] == list(range(20))
+
+
+def test_backend_without_bulk_support_falls_back_to_single_posts(monkeypatch, bulk_settings):
+    send = RecordingSend(bulk_status=415)
+    monkeypatch.setattr(PostClient, "_send", staticmethod(send))
+
+    assert _post(_batch(8102, 3)) == [True] * 3
+    assert _post(_batch(8102, 3)) == [True] * 3
+
+    bulk_requests = [headers for headers, _ in send.requests if headers.get("Content-Encoding") == "gzip"]
+    assert len(bulk_requests) == 1
+    assert len(send.requests) == 7
+
+
+def test_spooled_events_are_replayed_in_bulk(monkeypatch, tmp_path, bulk_settings):
+    send = RecordingSend()
+    monkeypatch.setattr(PostClient, "_send", staticmethod(send))
+    spool = EventSpool(str(tmp_path))
+    spool.append([{"url": str(config.post_url), "headers": {"Content-Type": "application/json"}, "body": record.to_dict()} for config, record in _batch(8103, 6)])
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(spool.replay(PostClient._replay_batch)) == 6
+    finally:
+        loop.close()
+
+    events = []
+    for headers, body in send.requests:
+        assert headers["Content-Type"] == "application/x-ndjson"
+        events.extend(json.loads(line) for line in gzip.decompress(body).splitlines())
+    assert len(send.requests) < 6
+    assert [event["event"]["timestamp"] for event in events] == list(range(6))
+    assert not spool.has_backlog
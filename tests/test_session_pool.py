@@ -0,0 +1,27 @@
+import asyncio
+from setsail_workflow_py.infrastructure.http.session_pool import SessionPool
+
+
+async def _acquire_twice(url_a: str, url_b: str):
+    first = await SessionPool.acquire(url_a)
+    second = await SessionPool.acquire(url_b)
+    return first, second
+
+
+def test_session_is_reused_per_loop_and_host():
+    first, second = asyncio.run(_acquire_twice("http://localhost:8000/a", "http://localhost:8000/b"))
+    assert first is second
+
+    first, second = asyncio.run(_acquire_twice("http://localhost:8000/a", "http://localhost:9000/a"))
+    assert first is not second
+
+
+def test_sessions_are_closed_when_loop_shuts_down():
+    async def _acquire():
+        return await SessionPool.acquire("http://localhost:8000/event")
+
+    session = asyncio.run(_acquire())
+    assert session.closed
+
+    other = asyncio.run(_acquire())
+    assert other is not session
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+from setsail_workflow_py import workflow_lifecycle, reload_settings
+from setsail_workflow_py.shared.settings import MonitoringSettings, get_settings
+
+
+trace_data = {
+    "enable": True,
+    "traceId": "592225192fb1ac17022e80c85fb8a749",
+    "userId": "202505125600020250512145500563QSLVDGS96F",
+    "projectId": "mtr-kiosk-pquzibd",
+}
+
+@workflow_lifecycle()
+def sync_function(x: int, workflow_trace_data: dict) -> int:
+    return x * 2
+
+
+def test_settings_are_snapshotted_until_reload():
+    reload_settings({"ENV": "dev", "WORKFLOW_MONITORING_URL": "https://example.com/log"})
+    try:
+        assert get_settings().env == "dev"
+        assert get_settings().monitoring_url == "https://example.com/log"
+    finally:
+        reload_settings()
+
+
+def test_unsupported_env_is_inactive():
+    assert not MonitoringSettings.from_env({"ENV": "staging"}).active
+    assert not MonitoringSettings.from_env({"WORKFLOW_MONITORING_ENABLED": "false"}).active
+    assert MonitoringSettings.from_env({}).active
+
+
+@patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
+@patch("setsail_workflow_py.application.decorators.workflow_lifecycle.get_class_name")
+def test_disabled_call_skips_monitoring(mock_get_class_name, mock_create_from_trace_data):
+    reload_settings({"WORKFLOW_MONITORING_ENABLED": "false"})
+    try:
+        assert sync_function(2, workflow_trace_data=trace_data) == 4
+    finally:
+        reload_settings()
+
+    assert sync_function(2, workflow_trace_data=dict(trace_data, enable=False)) == 4
+
+    mock_get_class_name.assert_not_called()
+    mock_create_from_trace_data.assert_not_called()
+
+
+@patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
+@patch("setsail_workflow_py.application.decorators.workflow_lifecycle.get_class_name")
+def test_untraced_call_skips_monitoring(mock_get_class_name, mock_create_from_trace_data):
+    assert sync_function(2, workflow_trace_data={}) == 4
+    assert sync_function(2, workflow_trace_data=dict(trace_data, traceId="")) == 4
+    assert sync_function(2, workflow_trace_data=None) == 4
+
+    mock_get_class_name.assert_not_called()
+    mock_create_from_trace_data.assert_not_called()
@@ -0,0 +1,85 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from setsail_workflow_py import flush, set_exporter, submit, with_span_context, workflow_lifecycle
+from setsail_workflow_py.infrastructure.exporters.memory_event_exporter import InMemoryEventExporter
+
+
+trace_data = {
+    "enable": True,
+    "traceId": "592225192fb1ac17022e80c85fb8a749",
+    "prevSpanId": "3f7decc34dc8d03a",
+    "userId": "202505125600020250512145500563QSLVDGS96F",
+    "projectId": "mtr-kiosk-pquzibd",
+    "post_url": "https://dev.setsailapi.com/workflow/v1/event",
+    "x-api-key": "test-key",
+}
+
+
+class Graph:
+    @workflow_lifecycle()
+    async def child(self, i: int, workflow_trace_data: dict) -> int:
+        await asyncio.sleep(0)
+        return i
+
+    @workflow_lifecycle()
+    async def fan_out(self, workflow_trace_data: dict) -> list:
+        return await asyncio.gather(*(self.child(i, workflow_trace_data=workflow_trace_data) for i in range(5)))
+
+    @workflow_lifecycle()
+    def sync_child(self, i: int, workflow_trace_data: dict) -> int:
+        return i
+
+    @workflow_lifecycle()
+    async def fan_out_to_threads(self, workflow_trace_data: dict) -> list:
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            submitted = [submit(pool, self.sync_child, i, workflow_trace_data=workflow_trace_data) for i in range(2)]
+            step = with_span_context(functools.partial(self.sync_child, workflow_trace_data=workflow_trace_data))
+            offloaded = [loop.run_in_executor(pool, step, i) for i in range(2, 4)]
+            return [future.result() for future in submitted] + list(await asyncio.gather(*offloaded))
+
+
+def _records_of(run) -> list:
+    exporter = InMemoryEventExporter()
+    set_exporter(exporter)
+    loop = asyncio.new_event_loop()
+    try:
+        # A fresh context, so spans activated by other tests in this thread do not leak in.
+        contextvars.copy_context().run(loop.run_until_complete, run())
+    finally:
+        loop.close()
+    try:
+        assert flush()
+        return exporter.records
+    finally:
+        set_exporter(None)
+
+
+def test_concurrent_children_share_their_parent_and_sequential_steps_chain():
+    data = dict(trace_data)
+
+    async def _run():
+        graph = Graph()
+        await graph.fan_out(workflow_trace_data=data)
+        await graph.child(99, workflow_trace_data=data)
+
+    records = _records_of(_run)
+
+    starts = [record for record in records if record.eventType == "STEP_START"]
+    root, children, last = starts[0], starts[1:6], starts[6]
+    assert root.parentSpanId == trace_data["prevSpanId"]
+    assert all(child.parentSpanId == root.spanId for child in children)
+    assert len({child.spanId for child in children}) == 5
+    assert last.parentSpanId == root.spanId
+    assert data["prevSpanId"] == trace_data["prevSpanId"]
+
+
+def test_executor_threads_inherit_the_parent_through_the_helpers():
+    records = _records_of(lambda: Graph().fan_out_to_threads(workflow_trace_data=dict(trace_data)))
+
+    starts = [record for record in records if record.eventType == "STEP_START"]
+    root, children = starts[0], starts[1:]
+    assert len(children) == 4
+    assert all(child.parentSpanId == root.spanId for child in children)
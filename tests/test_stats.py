@@ -0,0 +1,74 @@
+import contextvars
+import urllib.request
+from setsail_workflow_py import flush, set_exporter, start_metrics_server, stats, workflow_lifecycle
+from setsail_workflow_py.infrastructure.exporters.memory_event_exporter import InMemoryEventExporter
+from setsail_workflow_py.infrastructure.monitoring.metrics_server import MetricsServer
+from setsail_workflow_py.shared.event_loss import EventLoss
+from setsail_workflow_py.shared.self_metrics import SelfMetrics
+
+
+trace_data = {
+    "enable": True,
+    "traceId": "592225192fb1ac17022e80c85fb8a749",
+    "userId": "202505125600020250512145500563QSLVDGS96F",
+    "projectId": "mtr-kiosk-pquzibd",
+    "post_url": "https://dev.setsailapi.com/workflow/v1/event",
+    "x-api-key": "test-key",
+}
+
+
+class Job:
+    @workflow_lifecycle()
+    def run(self, x: int, workflow_trace_data: dict) -> int:
+        return x + 1
+
+
+def _run_steps(count: int) -> None:
+    exporter = InMemoryEventExporter()
+    set_exporter(exporter)
+    try:
+        for i in range(count):
+            # A fresh context per step, so the spans do not leak into other tests.
+            contextvars.copy_context().run(Job().run, i, workflow_trace_data=dict(trace_data))
+        assert flush()
+    finally:
+        set_exporter(None)
+
+
+def test_stats_count_events_and_decorator_overhead():
+    SelfMetrics.reset()
+    EventLoss.reset()
+    _run_steps(3)
+
+    current = stats()
+    assert current["events"]["emitted"] == 6
+    assert current["events"]["exported"] == 6
+    assert current["events"]["failed"] == 0
+    assert current["events"]["dropped"] == 0
+    assert current["pending"]["buffered"] == 0
+    assert current["decorator_overhead_us"]["count"] == 3
+    assert current["decorator_overhead_us"]["p50"] > 0
+    assert current["post_latency_ms"]["count"] == 0
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    SelfMetrics.reset()
+    EventLoss.reset()
+    _run_steps(2)
+    EventLoss.record("queue_full", 5)
+
+    port = start_metrics_server(port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            body = response.read().decode("utf-8")
+    finally:
+        MetricsServer.stop()
+        EventLoss.reset()
+
+    lines = body.splitlines()
+    assert "setsail_workflow_events_emitted_total 4" in lines
+    assert 'setsail_workflow_events_dropped_total{reason="queue_full"} 5' in lines
+    assert "# TYPE setsail_workflow_decorator_overhead_us summary" in lines
+    assert "setsail_workflow_decorator_overhead_us_count 2" in lines
+    assert any(line.startswith('setsail_workflow_decorator_overhead_us{quantile="0.99"} ') for line in lines)
@@ -0,0 +1,150 @@
+import contextvars
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from setsail_workflow_py import flush, workflow_lifecycle
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.infrastructure.exporters.threaded_batch_exporter import ThreadedBatchExporter
+from setsail_workflow_py.infrastructure.http.circuit_breaker import CircuitBreaker
+from setsail_workflow_py.infrastructure.http.sync_post_client import SyncPostClient
+from setsail_workflow_py.infrastructure.monitoring.event_loop_thread import EventLoopThread
+from setsail_workflow_py.shared.settings import reload_settings
+
+from pydantic import HttpUrl
+
+
+class _Backend:
+    def __init__(self):
+        self.events = []
+        self.connections = set()
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                backend.events.append(json.loads(body))
+                backend.connections.add(self.client_address)
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def backend():
+    CircuitBreaker.reset_all()
+    server = _Backend()
+    yield server
+    server.close()
+    reload_settings()
+
+
+def _config(port: int) -> WorkflowMonitoringConfig:
+    return WorkflowMonitoringConfig(
+        post_url=HttpUrl(f"http://127.0.0.1:{port}/event"),
+        headers={"Content-Type": "application/json", "x-api-key": "key"},
+        spanId="3f7decc34dc8d03a",
+        traceId="592225192fb1ac17022e80c85fb8a749",
+        userId="202505125600020250512145500563QSLVDGS96F",
+        projectId="mtr-kiosk-pquzibd",
+        componentName="thread_test",
+        operationName="thread_test",
+    )
+
+
+def test_events_share_one_keep_alive_connection(backend):
+    client = SyncPostClient()
+    exporter = ThreadedBatchExporter(client.post_events, max_batch_size=8, schedule_delay=60, on_close=client.close)
+    config = _config(backend.port)
+    for i in range(20):
+        exporter.export(config, WorkflowEventRecord.from_config(config, "STEP_START", i))
+
+    assert exporter.flush(5)
+    assert sorted(event["event"]["timestamp"] for event in backend.events) == list(range(20))
+    assert len(backend.connections) == 1
+    assert exporter.shutdown(5)
+
+
+class Job:
+    @workflow_lifecycle()
+    def run(self, x: int, workflow_trace_data: dict) -> int:
+        return x * 2
+
+
+def test_sync_steps_never_start_the_event_loop(backend, monkeypatch):
+    reload_settings({"WORKFLOW_MONITORING_EXPORTER": "thread"})
+    monkeypatch.setattr(ThreadedBatchExporter, "_instance", None)
+
+    def _no_loop():
+        raise AssertionError("the thread exporter must not use the asyncio monitoring loop")
+    monkeypatch.setattr(EventLoopThread, "get", staticmethod(_no_loop))
+
+    trace_data = {
+        "enable": True,
+        "traceId": "592225192fb1ac17022e80c85fb8a749",
+        "userId": "202505125600020250512145500563QSLVDGS96F",
+        "projectId": "mtr-kiosk-pquzibd",
+        "post_url": f"http://127.0.0.1:{backend.port}/event",
+        "x-api-key": "test-key",
+    }
+    # A fresh context, so the span activated by the step does not leak into other tests.
+    assert contextvars.copy_context().run(Job().run, 21, workflow_trace_data=trace_data) == 42
+    assert flush(5)
+    assert [event["event"]["eventType"] for event in backend.events] == ["STEP_START", "STEP_END"]
+    ThreadedBatchExporter.get().shutdown(5)
+
+
+def test_rollups_and_tail_sampling_never_start_the_event_loop(backend, monkeypatch):
+    from setsail_workflow_py import set_exporter
+    from setsail_workflow_py.application.services.operation_rollups import OperationRollups
+    from setsail_workflow_py.application.services.tail_sampler import TailSampler
+    from setsail_workflow_py.infrastructure.exporters.memory_event_exporter import InMemoryEventExporter
+
+    reload_settings({
+        "WORKFLOW_MONITORING_EXPORTER": "thread",
+        "WORKFLOW_MONITORING_AGGREGATE": "Job",
+        "WORKFLOW_MONITORING_AGGREGATE_INTERVAL": "0.05",
+        "WORKFLOW_MONITORING_SAMPLE_RATE": "0",
+        "WORKFLOW_MONITORING_TAIL_SAMPLING": "true",
+    })
+    for singleton in (ThreadedBatchExporter, OperationRollups, TailSampler):
+        monkeypatch.setattr(singleton, "_instance", None)
+
+    def _no_loop():
+        raise AssertionError("the thread exporter must not use the asyncio monitoring loop")
+    monkeypatch.setattr(EventLoopThread, "get", staticmethod(_no_loop))
+
+    trace_data = {
+        "enable": True,
+        "traceId": "592225192fb1ac17022e80c85fb8a749",
+        "userId": "202505125600020250512145500563QSLVDGS96F",
+        "projectId": "mtr-kiosk-pquzibd",
+        "post_url": f"http://127.0.0.1:{backend.port}/event",
+        "x-api-key": "test-key",
+    }
+    assert contextvars.copy_context().run(Job().run, 21, workflow_trace_data=trace_data) == 42
+    TailSampler.get()
+    deadline = time.monotonic() + 5
+    while OperationRollups.get()._scheduled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert flush(5)
+    assert [event["event"]["eventType"] for event in backend.events] == ["LOG"]
+
+    with pytest.raises(RuntimeError):
+        set_exporter(InMemoryEventExporter())
+    ThreadedBatchExporter.get().shutdown(5)
@@ -0,0 +1,133 @@
+import uuid
+from setsail_workflow_py.application.services.tail_sampler import TailSampler
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.domain.services.config_factory import ConfigFactory
+from setsail_workflow_py.domain.services.trace_sampler import TraceSampler
+from setsail_workflow_py.shared.event_loss import TAIL_EVICTED, TAIL_TRACE_FULL, EventLoss
+from setsail_workflow_py.shared.settings import reload_settings
+
+from pydantic import HttpUrl
+
+
+config = WorkflowMonitoringConfig(
+    post_url=HttpUrl("https://dev.setsailapi.com/workflow/v1/event"),
+    spanId="3f7decc34dc8d03a",
+    traceId="592225192fb1ac17022e80c85fb8a749",
+    userId="202505125600020250512145500563QSLVDGS96F",
+    projectId="mtr-kiosk-pquzibd",
+    componentName="sampling_test",
+    operationName="sampling_test",
+    sampled=False,
+)
+
+
+def _record(trace_id: str, span_id: str, event_type: str, timestamp: int, status=None) -> WorkflowEventRecord:
+    record = WorkflowEventRecord.from_config(config, event_type, timestamp, status=status)
+    record.traceId = trace_id
+    record.spanId = span_id
+    return record
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_head_sampling_is_deterministic_per_trace():
+    trace_ids = [uuid.uuid4().hex for _ in range(2000)]
+    first = [TraceSampler.head_sampled(trace_id, 0.25) for trace_id in trace_ids]
+    second = [TraceSampler.head_sampled(trace_id, 0.25) for trace_id in trace_ids]
+    assert first == second
+    assert 0.18 < sum(first) / len(first) < 0.32
+    assert all(TraceSampler.head_sampled(trace_id, 1.0) for trace_id in trace_ids[:10])
+    assert not any(TraceSampler.head_sampled(trace_id, 0.0) for trace_id in trace_ids[:10])
+
+
+def test_dropped_trace_gets_no_config_without_tail_sampling():
+    reload_settings({"WORKFLOW_MONITORING_SAMPLE_RATE": "0", "WORKFLOW_MONITORING_API_KEY": "key"})
+    try:
+        trace_data = {"traceId": config.traceId, "userId": config.userId, "projectId": config.projectId}
+        assert ConfigFactory.create_from_trace_data(trace_data, "step") is None
+
+        reload_settings({"WORKFLOW_MONITORING_SAMPLE_RATE": "0", "WORKFLOW_MONITORING_TAIL_SAMPLING": "true", "WORKFLOW_MONITORING_API_KEY": "key"})
+        tail_config = ConfigFactory.create_from_trace_data(trace_data, "step")
+        assert tail_config is not None and not tail_config.sampled
+    finally:
+        reload_settings()
+
+
+def test_tail_sampling_keeps_failed_and_slow_traces():
+    forwarded = []
+    sampler = TailSampler(lambda c, r: forwarded.append(r), latency_threshold_ms=1000, max_traces=10, decision_wait=60)
+
+    sampler.offer(config, _record("a" * 32, "1" * 16, "STEP_START", 0))
+    sampler.offer(config, _record("a" * 32, "1" * 16, "STEP_END", 10, "SUCCESS"))
+    assert forwarded == []
+
+    sampler.offer(config, _record("b" * 32, "2" * 16, "STEP_START", 0))
+    sampler.offer(config, _record("b" * 32, "2" * 16, "STEP_END", 10, "FAILURE"))
+    assert [r.traceId for r in forwarded] == ["b" * 32] * 2
+
+    sampler.offer(config, _record("c" * 32, "3" * 16, "STEP_START", 0))
+    sampler.offer(config, _record("c" * 32, "3" * 16, "STEP_END", 1500, "SUCCESS"))
+    sampler.offer(config, _record("c" * 32, "4" * 16, "STEP_START", 1600))
+    assert [r.traceId for r in forwarded][2:] == ["c" * 32] * 3
+    assert sampler.kept_traces == 2
+
+
+def test_tail_buffers_are_bounded_and_expire():
+    clock = FakeClock()
+    forwarded = []
+    sampler = TailSampler(lambda c, r: forwarded.append(r), max_traces=2, decision_wait=5, clock=clock)
+    for trace in "abc":
+        sampler.offer(config, _record(trace * 32, "1" * 16, "STEP_START", 0))
+    assert sampler.buffered_traces == 2
+    assert sampler.dropped_traces == 1
+
+    clock.now = 10
+    sampler.offer(config, _record("d" * 32, "1" * 16, "STEP_START", 0))
+    assert sampler.buffered_traces == 1
+    assert sampler.dropped_traces == 3
+    assert forwarded == []
+
+
+class ManualTimer:
+    def __init__(self):
+        self.later = []
+
+    def call_later(self, delay, callback, *args):
+        self.later.append((delay, callback))
+
+
+def test_tail_buffers_are_capped_per_trace_and_expire_on_a_timer():
+    EventLoss.reset()
+    clock = FakeClock()
+    timer = ManualTimer()
+    sampler = TailSampler(lambda c, r: None, decision_wait=5, clock=clock, max_trace_events=3, timer=timer)
+    for i in range(5):
+        sampler.offer(config, _record("a" * 32, f"{i:016d}", "STEP_START", 0))
+    assert len(sampler._buffers["a" * 32].items) == 3
+    assert EventLoss.snapshot() == {TAIL_TRACE_FULL: 2}
+
+    delay, expire = timer.later.pop()
+    assert delay == 5
+    clock.now = 10
+    expire()
+    assert sampler.buffered_traces == 0
+    assert timer.later == []
+    EventLoss.reset()
+
+
+def test_tail_buffers_share_one_byte_limit():
+    EventLoss.reset()
+    sampler = TailSampler(lambda c, r: None, max_bytes=2000, timer=ManualTimer())
+    for trace in "abcdef":
+        sampler.offer(config, _record(trace * 32, "1" * 16, "STEP_START", 0))
+    assert sampler.buffered_traces < 6
+    assert "f" * 32 in sampler._buffers
+    assert EventLoss.snapshot() == {TAIL_EVICTED: 6 - sampler.buffered_traces}
+    EventLoss.reset()
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+from setsail_workflow_py.shared import utils
+from setsail_workflow_py.shared.utils import get_class_name, clear_class_name_cache
+
+
+class Processor:
+    def run(self, *args):
+        return get_class_name(Processor.run, args)
+
+
+def test_get_class_name_resolves_once_per_receiver_type():
+    clear_class_name_cache()
+    processor = Processor()
+
+    with patch.object(utils, "_resolve_class_name_from_stack", wraps=utils._resolve_class_name_from_stack) as resolve:
+        assert processor.run(processor) == "Processor"
+        assert processor.run(processor) == "Processor"
+        assert processor.run(Processor()) == "Processor"
+
+    assert resolve.call_count == 1
+
+
+def test_get_class_name_prefers_bound_receiver():
+    assert get_class_name(Processor().run) == "Processor"
+
+
+def _step(*args):
+    return get_class_name(_step, args)
+
+
+class RetrieveProcessor:
+    pass
+
+
+class RankProcessor:
+    pass
+
+
+def _run_node(processor):
+    return _step()
+
+
+def test_get_class_name_does_not_cache_the_callers_processor():
+    clear_class_name_cache()
+    assert _run_node(RetrieveProcessor()) == "RetrieveProcessor"
+    assert _run_node(RankProcessor()) == "RankProcessor"
+
+
+class Retriever:
+    def run(self):
+        return _step("query")
+
+
+class Ranker:
+    def run(self):
+        return _step("query")
+
+
+def test_get_class_name_does_not_cache_names_from_caller_frames():
+    clear_class_name_cache()
+    assert Retriever().run() == "Retriever"
+    assert Ranker().run() == "Ranker"
+
+
+def test_get_class_name_does_not_cache_a_miss():
+    clear_class_name_cache()
+    with patch.object(utils, "_is_project_file", return_value=False):
+        assert Retriever().run() is None
+    assert Ranker().run() == "Ranker"
@@ -1,6 +1,6 @@
 import pytest
 import asyncio
-from unittest.mock import patch, AsyncMock
+from unittest.mock import ANY, patch, AsyncMock
 from setsail_workflow_py import workflow_entry
 from setsail_workflow_py.domain.services.config_factory import ConfigFactory
 from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
@@ -56,8 +56,8 @@ async def async_gen_function(n: int, workflow_trace_data: dict):
         yield i
 
 @patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_end_event", new_callable=AsyncMock)
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_start_event", new_callable=AsyncMock)
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_end_event")
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_start_event")
 def test_workflow_entry_sync(mock_send_start, mock_send_end, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
 
@@ -66,12 +66,12 @@ def test_workflow_entry_sync(mock_send_start, mock_send_end, mock_create_from_tr
     assert result == 5
 
     mock_send_start.assert_called_once_with(config, dict(workflow_trace_data=trace_data))
-    mock_send_end.assert_called_once_with(config, 5, "SUCCESS", {})
+    mock_send_end.assert_called_once_with(config, 5, "SUCCESS", {}, ANY)
 
 @pytest.mark.asyncio
 @patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_end_event", new_callable=AsyncMock)
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_start_event", new_callable=AsyncMock)
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_end_event")
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_start_event")
 def test_workflow_entry_sync_error(mock_send_start, mock_send_end, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
 
@@ -94,7 +94,7 @@ async def test_workflow_entry_async(mock_send_start, mock_send_end, mock_create_
     assert result == 5
 
     mock_send_start.assert_awaited_once_with(config, dict(workflow_trace_data=trace_data))
-    mock_send_end.assert_awaited_once_with(config, 5, "SUCCESS", {})
+    mock_send_end.assert_awaited_once_with(config, 5, "SUCCESS", {}, duration_ns=ANY)
 
 
 @pytest.mark.asyncio
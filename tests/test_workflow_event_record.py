@@ -0,0 +1,40 @@
+from setsail_workflow_py.domain.events.value_object.workflow_event import WorkflowPayload
+from setsail_workflow_py.domain.events.value_object.workflow_event_record import WorkflowEventRecord
+from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.domain.services.config_factory import ConfigFactory, _validated_trace_config
+from setsail_workflow_py.shared.json_codec import dumps, loads
+
+
+trace_data = {
+    "enable": True,
+    "traceId": "592225192fb1ac17022e80c85fb8a749",
+    "prevSpanId": "3f7decc34dc8d03a",
+    "userId": "202505125600020250512145500563QSLVDGS96F",
+    "projectId": "mtr-kiosk-pquzibd",
+    "post_url": "https://dev.setsailapi.com/workflow/v1/event",
+    "x-api-key": "test-key",
+}
+
+
+def test_record_matches_pydantic_wire_format():
+    config = ConfigFactory.create_from_trace_data(trace_data, "async_test")
+    record = WorkflowEventRecord.from_config(config, "STEP_END", 1700000000000, status="FAILURE", data={"output": {"a": 1}, "errorDetails": None})
+
+    expected = WorkflowPayload.model_validate(record.to_dict()).model_dump(mode="json", exclude_none=True)
+    assert loads(dumps(record.to_dict())) == expected
+
+
+def test_trace_identity_is_validated_once():
+    misses = _validated_trace_config.cache_info().misses
+    first = ConfigFactory.create_from_trace_data(dict(trace_data, traceId="a" * 32), "step_one")
+    second = ConfigFactory.create_from_trace_data(dict(trace_data, traceId="a" * 32), "step_two")
+
+    assert _validated_trace_config.cache_info().misses == misses + 1
+    assert isinstance(second, WorkflowMonitoringConfig)
+    assert first.spanId != second.spanId
+    assert (first.operationName, second.operationName) == ("step_one", "step_two")
+
+
+def test_invalid_step_fields_disable_monitoring():
+    assert ConfigFactory.create_from_trace_data(dict(trace_data, prevSpanId="short"), "step") is None
+    assert ConfigFactory.create_from_trace_data(trace_data, None) is None
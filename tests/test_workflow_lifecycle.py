@@ -1,9 +1,12 @@
 import pytest
 import asyncio
+import threading
 from unittest.mock import patch, AsyncMock
 from setsail_workflow_py import workflow_lifecycle
 from setsail_workflow_py.domain.services.config_factory import ConfigFactory
 from setsail_workflow_py.domain.models.workflow_monitoring_config import WorkflowMonitoringConfig
+from setsail_workflow_py.application.services import workflow_monitoring_service
+from setsail_workflow_py.application.services.event_emitter import EventEmitter
 from setsail_workflow_py.application.services.workflow_monitoring_service import WorkflowMonitoringService
 
 from pydantic import Field, HttpUrl
@@ -68,7 +71,7 @@ async def async_gen_function_with_error(n: int, workflow_trace_data: dict):
 @patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_start_event", new_callable=AsyncMock)
 async def test_async_function(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
-    result = await async_function(1, 2, trace_data)
+    result = await async_function(1, 2, workflow_trace_data=trace_data)
     assert result == 3
     mock_send_start_event.assert_called_once()
     mock_send_end_event.assert_called_once()
@@ -83,7 +86,7 @@ async def test_async_function(mock_send_start_event, mock_send_end_event, mock_c
 async def test_async_function_with_error(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
     with pytest.raises(ValueError):
-        await error_function(1, 2, trace_data)
+        await error_function(1, 2, workflow_trace_data=trace_data)
     mock_send_start_event.assert_called_once()
     mock_send_end_event.assert_called_once()
     assert isinstance(mock_send_end_event.call_args[0][0], WorkflowMonitoringConfig)
@@ -93,11 +96,11 @@ async def test_async_function_with_error(mock_send_start_event, mock_send_end_ev
 
 @pytest.mark.asyncio
 @patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_end_event", new_callable=AsyncMock)
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_start_event", new_callable=AsyncMock)
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_end_event")
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_start_event")
 async def test_sync_function(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
-    result = sync_function(1, 2, trace_data)
+    result = sync_function(1, 2, workflow_trace_data=trace_data)
     assert result == 3
     mock_send_start_event.assert_called_once()
     mock_send_end_event.assert_called_once()
@@ -107,12 +110,12 @@ async def test_sync_function(mock_send_start_event, mock_send_end_event, mock_cr
 
 @pytest.mark.asyncio
 @patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_end_event", new_callable=AsyncMock)
-@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_start_event", new_callable=AsyncMock)
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_end_event")
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_start_event")
 async def test_sync_function_with_error(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
     with pytest.raises(ValueError):
-        sync_function_with_error(1, 2, trace_data)
+        sync_function_with_error(1, 2, workflow_trace_data=trace_data)
     mock_send_start_event.assert_called_once()
     mock_send_end_event.assert_called_once()
     assert isinstance(mock_send_end_event.call_args[0][0], WorkflowMonitoringConfig)
@@ -126,7 +129,7 @@ async def test_sync_function_with_error(mock_send_start_event, mock_send_end_eve
 @patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.send_start_event", new_callable=AsyncMock)
 async def test_async_gen_function(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
-    async for item in async_gen_function(5, trace_data):
+    async for item in async_gen_function(5, workflow_trace_data=trace_data):
         assert item in range(5)
     mock_send_start_event.assert_called_once()
     mock_send_end_event.assert_called_once()
@@ -142,11 +145,49 @@ async def test_async_gen_function(mock_send_start_event, mock_send_end_event, mo
 async def test_async_gen_function_with_error(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
     mock_create_from_trace_data.return_value = config
     with pytest.raises(ValueError):
-        async for item in async_gen_function_with_error(5, trace_data):
+        async for item in async_gen_function_with_error(5, workflow_trace_data=trace_data):
             pass
     mock_send_start_event.assert_called_once()
     mock_send_end_event.assert_called_once()
     assert isinstance(mock_send_end_event.call_args[0][0], WorkflowMonitoringConfig)
     assert mock_send_end_event.call_args[0][1] == 1
     assert mock_send_end_event.call_args[0][2] == "FAILURE"
-    assert isinstance(mock_send_end_event.call_args[0][3], dict)
\ No newline at end of file
+    assert isinstance(mock_send_end_event.call_args[0][3], dict)
+
+
+@workflow_lifecycle(log_enabled=True)
+def sync_thread_function(workflow_trace_data: dict) -> int:
+    return threading.get_ident()
+
+
+@pytest.mark.asyncio
+@patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_end_event")
+@patch("setsail_workflow_py.application.services.workflow_monitoring_service.WorkflowMonitoringService.emit_start_event")
+async def test_sync_function_runs_on_caller_thread(mock_send_start_event, mock_send_end_event, mock_create_from_trace_data):
+    mock_create_from_trace_data.return_value = config
+    assert sync_thread_function(workflow_trace_data=trace_data) == threading.get_ident()
+    mock_send_start_event.assert_called_once()
+    mock_send_end_event.assert_called_once()
+
+
+@workflow_lifecycle()
+def appending_step(state: dict) -> dict:
+    state["messages"].append("mutated-by-step")
+    return state
+
+
+@patch("setsail_workflow_py.domain.services.config_factory.ConfigFactory.create_from_trace_data")
+def test_sync_step_events_are_built_on_the_caller_thread(mock_create_from_trace_data, monkeypatch):
+    mock_create_from_trace_data.return_value = config
+    exported = []
+    monkeypatch.setattr(workflow_monitoring_service, "_export", lambda c, record: exported.append(record))
+
+    state = {"messages": ["hello"], "workflow_trace_data": trace_data}
+    appending_step(state=state)
+    state["messages"].append("after-return")
+    assert EventEmitter.drain(5)
+
+    start, end = (record.to_dict()["event"]["data"] for record in exported)
+    assert start["input"]["state"]["messages"] == ["hello"]
+    assert end["output"]["messages"] == ["hello", "mutated-by-step"]